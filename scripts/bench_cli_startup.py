@@ -0,0 +1,133 @@
+"""Benchmark the import time of the `quantlib` CLI, and fail if it regresses.
+
+Runs the CLI entry point under `python -X importtime` a number of times and
+takes the median of the total import time. Exits with status 1 if that is over
+the threshold, or if any of the heavy dependencies (pandas, numpy, scipy) are
+imported just to parse arguments.
+
+    python scripts/bench_cli_startup.py --threshold-ms 75 -- costs --help
+
+Note --version also imports importlib.metadata, which on its own is slower to
+import than the rest of the CLI.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_PATH = Path(__file__).resolve().parents[1] / "src"
+
+HEAVY_MODULES = ["pandas", "numpy", "scipy"]
+
+DEFAULT_THRESHOLD_MS = 75.0
+DEFAULT_REPEATS = 10
+
+RUN_CLI = (
+    "import sys; from quantlib_st.cli.main import main; "
+    "sys.argv[0] = 'quantlib'; main()"
+)
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Parse `-X importtime` output into {module: cumulative microseconds}.
+
+    Only top level imports are kept, so the values can be summed.
+    """
+    cumulative_times = {}
+    for module, cumulative_us in _iter_importtime_lines(stderr):
+        if module.startswith(" "):
+            # nested import, already counted in its parent
+            continue
+        cumulative_times[module] = cumulative_us
+
+    return cumulative_times
+
+
+def all_imported_modules(stderr: str) -> list[str]:
+    return [module.strip() for module, _ in _iter_importtime_lines(stderr)]
+
+
+def _iter_importtime_lines(stderr: str):
+    # import time: self [us] | cumulative | imported package
+    # where the package name is indented by two spaces per level of nesting
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative_us, module = line.split("|", 2)
+        if not cumulative_us.strip().isdigit():
+            # header line
+            continue
+
+        yield module[1:], int(cumulative_us)
+
+
+def time_one_run(cli_args: list[str]) -> tuple[float, list[str]]:
+    """
+    :returns: tuple, total import time in milliseconds and list of imported modules
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", RUN_CLI, *cli_args],
+        cwd=SRC_PATH,
+        capture_output=True,
+        text=True,
+    )
+    cumulative_times = parse_importtime(completed.stderr)
+    total_ms = sum(cumulative_times.values()) / 1000.0
+
+    return total_ms, all_imported_modules(completed.stderr)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--threshold-ms",
+        type=float,
+        default=DEFAULT_THRESHOLD_MS,
+        help=f"Fail if the median import time is above this (default: {DEFAULT_THRESHOLD_MS})",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=DEFAULT_REPEATS,
+        help=f"Number of runs to take the median of (default: {DEFAULT_REPEATS})",
+    )
+    parser.add_argument(
+        "cli_args",
+        nargs="*",
+        default=["--help"],
+        help="Arguments passed to the CLI (default: --help). Put them after --",
+    )
+    args = parser.parse_args(argv)
+
+    # first run warms up the bytecode cache, and isn't counted
+    time_one_run(args.cli_args)
+    results = [time_one_run(args.cli_args) for _ in range(args.repeats)]
+
+    median_ms = statistics.median([total_ms for total_ms, _ in results])
+    imported_modules = results[-1][1]
+    heavy_imported = [
+        module_name for module_name in HEAVY_MODULES if module_name in imported_modules
+    ]
+
+    print(
+        f"quantlib {' '.join(args.cli_args)}: median import time {median_ms:.1f}ms "
+        f"over {args.repeats} runs (threshold {args.threshold_ms:.1f}ms)"
+    )
+
+    failed = False
+    if median_ms > args.threshold_ms:
+        print("FAIL: import time is over the threshold", file=sys.stderr)
+        failed = True
+    if len(heavy_imported) > 0:
+        print(f"FAIL: imported {', '.join(heavy_imported)}", file=sys.stderr)
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
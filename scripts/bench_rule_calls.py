@@ -0,0 +1,87 @@
+"""Benchmark the overhead of calling a trading rule, with and without the compiled plan.
+
+The rule used just returns its (cached) input, so what's timed is the work done
+around the rule function: resolving data methods, copying arguments, checking
+for zeros. Real rules take longer, but pay the same overhead on every call.
+
+    python scripts/bench_rule_calls.py --repeats 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+SRC_PATH = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC_PATH))
+sys.path.append(str(SRC_PATH / "quantlib_st"))
+
+DEFAULT_REPEATS = 1000
+INSTRUMENT_CODE = "US10"
+
+
+def identity_rule(vol):
+    return vol
+
+
+def time_calls(call, repeats: int) -> float:
+    """
+    :returns: microseconds per call
+    """
+    start_time = time.perf_counter()
+    for _ in range(repeats):
+        call()
+
+    return (time.perf_counter() - start_time) / repeats * 1e6
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=DEFAULT_REPEATS,
+        help=f"Number of calls to time each way (default: {DEFAULT_REPEATS})",
+    )
+    args = parser.parse_args(argv)
+
+    from quantlib_st.sysdata.sim.csv_futures_sim_test_data import (
+        CsvFuturesSimTestData,
+    )
+    from quantlib_st.systems.provided.futures_chapter15.basesystem import (
+        futures_system,
+    )
+
+    system = futures_system(
+        data=CsvFuturesSimTestData(),
+        trading_rules=dict(
+            identity=dict(
+                function=identity_rule,
+                data=["rawdata.daily_returns_volatility"],
+            )
+        ),
+    )
+    trading_rule = system.rules.trading_rules()["identity"]
+    compiled_rule = system.rules.compiled_rule_plan()["identity"]
+
+    # fill the cache, so only the overhead is timed
+    system.rawdata.daily_returns_volatility(INSTRUMENT_CODE)
+
+    uncompiled_us = time_calls(
+        lambda: trading_rule.call(system, INSTRUMENT_CODE), args.repeats
+    )
+    compiled_us = time_calls(lambda: compiled_rule.call(INSTRUMENT_CODE), args.repeats)
+
+    print(system.rules.compiled_rule_plan().as_df().to_string())
+    print(
+        f"TradingRule.call: {uncompiled_us:.1f}us per call; "
+        f"compiled: {compiled_us:.1f}us per call; over {args.repeats} calls"
+    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
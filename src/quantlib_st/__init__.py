@@ -0,0 +1,25 @@
+"""
+Subpackages are imported the first time they are used (PEP 562), so
+`import quantlib_st` doesn't pull in pandas, scipy and friends.
+"""
+
+from quantlib_st.core.lazy_imports import lazy_attributes
+
+_SUBPACKAGES = [
+    "cli",
+    "config",
+    "core",
+    "correlation",
+    "costs",
+    "data",
+    "estimators",
+    "execution",
+    "init",
+    "logging",
+    "objects",
+    "optimisation",
+    "sysdata",
+    "systems",
+]
+
+__getattr__, __dir__ = lazy_attributes(__name__, submodules=_SUBPACKAGES)
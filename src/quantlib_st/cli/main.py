@@ -1,21 +1,82 @@
 from __future__ import annotations
 
 import argparse
-import importlib.metadata
-
-from quantlib_st.cli.corr_cmd import add_corr_subcommand
-from quantlib_st.cli.costs_cmd import add_costs_subcommand
+import sys
 
 
 def get_version() -> str:
     """Get the version of quantlib-st package."""
+    # importlib.metadata is slow to import, so only do it when asked
+    import importlib.metadata
+
     try:
         return importlib.metadata.version("quantlib-st")
     except importlib.metadata.PackageNotFoundError:
         return "unknown"
 
 
+class _VersionAction(argparse.Action):
+    """Like action="version", but only looks the version up if it's asked for"""
+
+    def __init__(self, option_strings, dest=argparse.SUPPRESS, help=None):
+        super().__init__(
+            option_strings=option_strings,
+            dest=dest,
+            default=argparse.SUPPRESS,
+            nargs=0,
+            help=help,
+        )
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        parser.exit(message=f"{parser.prog} {get_version()}\n")
+
+
+# Each subcommand is registered through a function that only imports its module
+# when called. The imports are written out (rather than done with importlib) so
+# that PyInstaller can still find them.
+
+
+def _add_corr_subcommand(subparsers: argparse._SubParsersAction) -> None:
+    from quantlib_st.cli.corr_cmd import add_corr_subcommand
+
+    add_corr_subcommand(subparsers)
+
+
+def _add_costs_subcommand(subparsers: argparse._SubParsersAction) -> None:
+    from quantlib_st.cli.costs_cmd import add_costs_subcommand
+
+    add_costs_subcommand(subparsers)
+
+
+SUBCOMMANDS = {
+    "corr": _add_corr_subcommand,
+    "costs": _add_costs_subcommand,
+}
+
+
+def subcommands_to_register(argv: list[str]) -> list[str]:
+    """
+    If the first positional argument names a subcommand we only need to register
+    that one. Otherwise (no subcommand, --help, a typo) we register them all, so
+    help and error messages list every subcommand.
+
+    >>> subcommands_to_register(["costs", "--instrument", "ES"])
+    ['costs']
+    >>> subcommands_to_register(["--help"])
+    ['corr', 'costs']
+    """
+    # top level options don't take values, so the first positional is the subcommand
+    positional_args = [arg for arg in argv if not arg.startswith("-")]
+    if len(positional_args) > 0 and positional_args[0] in SUBCOMMANDS:
+        return [positional_args[0]]
+
+    return list(SUBCOMMANDS.keys())
+
+
 def main(argv: list[str] | None = None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+
     parser = argparse.ArgumentParser(
         prog="quantlib",
         description="quantlib CLI (corr is the first subcommand; more will be added).",
@@ -24,22 +85,16 @@ def main(argv: list[str] | None = None) -> int:
     parser.add_argument(
         "-v",
         "--version",
-        action="version",
-        version=f"%(prog)s {get_version()}",
+        action=_VersionAction,
+        help="show program's version number and exit",
     )
 
     subparsers = parser.add_subparsers(dest="subcommand", required=True)
 
-    add_corr_subcommand(subparsers)
-    add_costs_subcommand(subparsers)
+    for subcommand in subcommands_to_register(argv):
+        SUBCOMMANDS[subcommand](subparsers)
 
     args = parser.parse_args(argv)
 
     # Dispatch
-    if args.subcommand == "corr":
-        return args._handler(args)
-    elif args.subcommand == "costs":
-        return args._handler(args)
-
-    parser.error(f"Unknown subcommand: {args.subcommand}")
-    return 2
+    return args._handler(args)
@@ -0,0 +1,58 @@
+"""
+Lazy attribute loading for packages (PEP 562)
+
+A package __init__ that re-exports names from its modules imports all of them,
+and their dependencies (pandas, scipy...), as soon as anything in the package
+is touched. Instead:
+
+    __getattr__, __dir__ = lazy_attributes(
+        __name__,
+        dict(dataBlob="quantlib_st.sysdata.data_blob"),
+    )
+
+and the module is only imported the first time the attribute is used. Likewise
+`lazy_attributes(__name__, submodules=["systems"])` makes `package.systems` work
+without an explicit import.
+"""
+
+from __future__ import annotations
+
+import importlib
+
+
+def lazy_attributes(
+    package_name: str,
+    attribute_to_module: dict | None = None,
+    submodules: list | tuple = (),
+) -> tuple:
+    """
+    :param package_name: __name__ of the package
+    :param attribute_to_module: dict, attribute name -> full name of the module it
+        is imported from. The attribute can't have the same name as a submodule,
+        since importing the submodule would then shadow it.
+    :param submodules: names of submodules or subpackages to import on access
+    :returns: tuple, module level __getattr__ and __dir__ functions
+    """
+    package = importlib.import_module(package_name)
+    if attribute_to_module is None:
+        attribute_to_module = {}
+    submodules = frozenset(submodules)
+
+    def __getattr__(name: str):
+        if name in submodules:
+            value = importlib.import_module(f"{package_name}.{name}")
+        elif name in attribute_to_module:
+            module = importlib.import_module(attribute_to_module[name])
+            value = getattr(module, name)
+        else:
+            raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+
+        # so we only come through here once
+        setattr(package, name, value)
+
+        return value
+
+    def __dir__() -> list:
+        return sorted(set(vars(package)) | set(attribute_to_module) | submodules)
+
+    return __getattr__, __dir__
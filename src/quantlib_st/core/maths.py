@@ -111,6 +111,99 @@ def magnitude(x):
     return int(maths.log10(x))
 
 
+def rolling_max_and_min_for_lookbacks(
+    values: np.ndarray, list_of_lookbacks: list, list_of_min_periods: list
+) -> tuple:
+    """
+    Rolling max and min of values over several lookbacks, the same as
+    pd.Series(values).rolling(lookback, min_periods=min_periods).max() / .min()
+    for each lookback.
+
+    Rather than scan each window for each lookback we build a sparse table
+    once: level k holds the max / min of the 2**k values ending at each point.
+    Any window is then covered by two (overlapping) blocks from one level, so
+    each lookback costs O(T) however long it is.
+
+    :param values: 1 dimensional array, may contain NaN
+    :param list_of_lookbacks: list of int
+    :param list_of_min_periods: list of int, minimum non NaN values in a window
+    :returns: tuple of 2d arrays (rolling max, rolling min), each T x number of lookbacks
+
+    >>> values = np.array([1.0, 3.0, np.nan, 2.0, 0.0])
+    >>> roll_max, roll_min = rolling_max_and_min_for_lookbacks(values, [2, 3], [1, 2])
+    >>> roll_max[:, 1]
+    array([nan,  3.,  3.,  3.,  2.])
+    >>> roll_min[:, 0]
+    array([1., 1., 3., 2., 0.])
+    """
+    values = np.asarray(values, dtype=float)
+    length = len(values)
+    is_valid = ~np.isnan(values)
+    cumulative_count = np.concatenate([[0], np.cumsum(is_valid)])
+
+    levels_needed = int(np.floor(np.log2(max(max(list_of_lookbacks), 1)))) + 1
+    max_table = [np.where(is_valid, values, -np.inf)]
+    min_table = [np.where(is_valid, values, np.inf)]
+    for level in range(1, levels_needed):
+        # block ending at i is the two half blocks ending at i - half and at i
+        half_block = 2 ** (level - 1)
+        level_max = max_table[-1].copy()
+        level_min = min_table[-1].copy()
+        np.maximum(
+            level_max[half_block:],
+            max_table[-1][:-half_block],
+            out=level_max[half_block:],
+        )
+        np.minimum(
+            level_min[half_block:],
+            min_table[-1][:-half_block],
+            out=level_min[half_block:],
+        )
+        max_table.append(level_max)
+        min_table.append(level_min)
+
+    # at the start of the data windows are just everything so far
+    running_max = np.maximum.accumulate(max_table[0])
+    running_min = np.minimum.accumulate(min_table[0])
+
+    roll_max = np.full((length, len(list_of_lookbacks)), np.nan)
+    roll_min = np.full((length, len(list_of_lookbacks)), np.nan)
+
+    for column, (lookback, min_periods) in enumerate(
+        zip(list_of_lookbacks, list_of_min_periods)
+    ):
+        lookback = max(int(lookback), 1)
+        window_max = running_max.copy()
+        window_min = running_min.copy()
+        count = cumulative_count[1:].copy()
+
+        if lookback < length:
+            level = int(np.floor(np.log2(lookback)))
+            # full windows [i - lookback + 1, i] are covered by the blocks
+            # ending at i and at i - lookback + 2**level
+            offset = lookback - 2**level
+            level_max = max_table[level]
+            level_min = min_table[level]
+            window_max[lookback - 1 :] = np.maximum(
+                level_max[lookback - 1 :],
+                level_max[lookback - 1 - offset : length - offset],
+            )
+            window_min[lookback - 1 :] = np.minimum(
+                level_min[lookback - 1 :],
+                level_min[lookback - 1 - offset : length - offset],
+            )
+            count[lookback:] = (
+                cumulative_count[lookback + 1 :]
+                - cumulative_count[1 : length - lookback + 1]
+            )
+
+        enough_values = count >= max(min_periods, 1)
+        roll_max[enough_values, column] = window_max[enough_values]
+        roll_min[enough_values, column] = window_min[enough_values]
+
+    return roll_max, roll_min
+
+
 if __name__ == "__main__":
     import doctest
 
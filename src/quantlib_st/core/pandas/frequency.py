@@ -13,6 +13,7 @@ from quantlib_st.core.dateutils import (
     HOURLY_FREQ,
     HOURS_PER_DAY,
     NOTIONAL_CLOSING_TIME_AS_PD_OFFSET,
+    from_config_frequency_pandas_resample,
 )
 
 
@@ -222,3 +223,134 @@ def average_time_delta_for_time_series(
     avg_time_delta_in_days = avg_time_delta / np.timedelta64(1, "D")
 
     return avg_time_delta_in_days
+
+
+def reindex_last_monthly_include_first_date(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Sample a data frame on the last day of each month, plus its first date
+
+    >>> import datetime
+    >>> df = pd.DataFrame(dict(a=range(40)), index=pd.date_range(datetime.datetime(2000,1,20), periods=40))
+    >>> reindex_last_monthly_include_first_date(df)
+                 a
+    2000-01-20   0
+    2000-01-31  11
+    2000-02-29  39
+    """
+    monthly_index = list(df.resample("1ME").last().index)
+    monthly_index = pd.DatetimeIndex([df.index[0]] + monthly_index)
+
+    # month end might not be in the index, eg a weekend
+    df_reindexed = df.reindex(monthly_index, method="ffill")
+
+    return df_reindexed
+
+
+def sum_within_calendar_days(x: pd.Series) -> pd.Series:
+    """
+    Sum of x on each calendar day with data, ignoring NaN, indexed by date.
+    With a time zone the days are local ones, and keep the time zone.
+    Anything resampled into bins of whole days can be summed from this: see
+    sum_over_periods
+
+    >>> import datetime
+    >>> d = datetime.datetime
+    >>> date_index = [d(2000,1,1,15), d(2000,1,1,23), d(2000,1,3,15)]
+    >>> sum_within_calendar_days(pd.Series([1.0, np.nan, 3.0], index=date_index))
+    2000-01-01    1.0
+    2000-01-03    3.0
+    dtype: float64
+    """
+    index = pd.DatetimeIndex(x.index)
+    values = x.to_numpy(dtype=float)
+    days = _wall_clock_values(index).astype("datetime64[D]")
+    unique_days, day_codes = np.unique(days, return_inverse=True)
+    sums = np.bincount(
+        day_codes,
+        weights=np.where(np.isnan(values), 0.0, values),
+        minlength=len(unique_days),
+    )
+
+    day_index = _localize_wall_clock_index(
+        pd.DatetimeIndex(unique_days.astype("datetime64[ns]"), name=index.name),
+        tz=index.tz,
+    )
+
+    return pd.Series(sums, index=day_index, name=x.name)
+
+
+def sum_over_periods(calendar_day_sums: pd.Series, frequency: Frequency) -> pd.Series:
+    """
+    As x.resample(frequency).sum(), given calendar_day_sums from
+    sum_within_calendar_days(x); periods without data sum to zero
+
+    >>> days = pd.DatetimeIndex(["2000-01-07", "2000-01-08", "2000-01-12"])
+    >>> sum_over_periods(pd.Series([1.0, 2.0, 4.0], index=days), Frequency.Week)
+    2000-01-09    3.0
+    2000-01-16    4.0
+    Freq: W-SUN, dtype: float64
+    """
+    resample_freq = from_config_frequency_pandas_resample(frequency)
+    if len(calendar_day_sums) == 0:
+        return calendar_day_sums.resample(resample_freq).sum()
+
+    day_index = pd.DatetimeIndex(calendar_day_sums.index)
+    days = _wall_clock_values(day_index).astype("datetime64[D]")
+    period_labels = _period_labels_for_days(days, frequency)
+    period_index = pd.date_range(
+        period_labels[0],
+        period_labels[-1],
+        freq=resample_freq,
+        name=day_index.name,
+    )
+    period_codes = period_index.get_indexer(period_labels.astype("datetime64[ns]"))
+    sums = np.bincount(
+        period_codes,
+        weights=calendar_day_sums.to_numpy(dtype=float),
+        minlength=len(period_index),
+    )
+    if day_index.tz is not None:
+        # the same local dates, keeping the frequency
+        period_index = pd.date_range(
+            period_index[0],
+            period_index[-1],
+            freq=resample_freq,
+            tz=day_index.tz,
+            name=day_index.name,
+        )
+
+    return pd.Series(sums, index=period_index, name=calendar_day_sums.name)
+
+
+def _wall_clock_values(index: pd.DatetimeIndex) -> np.ndarray:
+    # local times, rather than the UTC ones .values gives with a time zone
+    if index.tz is not None:
+        index = index.tz_localize(None)
+
+    return index.values
+
+
+def _localize_wall_clock_index(index: pd.DatetimeIndex, tz) -> pd.DatetimeIndex:
+    if tz is None:
+        return index
+
+    return index.tz_localize(tz, ambiguous=True, nonexistent="shift_forward")
+
+
+def _period_labels_for_days(days: np.ndarray, frequency: Frequency) -> np.ndarray:
+    # the label pandas resample gives each day's bin
+    weekday = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+    if frequency == Frequency.Day:
+        return days
+    elif frequency == Frequency.BDay:
+        # weekends go in the Friday before
+        return days - np.maximum(weekday - 4, 0).astype("timedelta64[D]")
+    elif frequency == Frequency.Week:
+        # weeks end on Sunday
+        return days + (6 - weekday).astype("timedelta64[D]")
+    elif frequency == Frequency.Month:
+        return (days.astype("datetime64[M]") + 1).astype("datetime64[D]") - 1
+    elif frequency == Frequency.Year:
+        return (days.astype("datetime64[Y]") + 1).astype("datetime64[D]") - 1
+
+    raise ValueError("Resample frequency %s is not supported" % frequency)
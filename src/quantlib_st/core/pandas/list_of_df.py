@@ -0,0 +1,78 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+
+class listOfDataFrames(list):
+    """
+    A list of data frames with the same columns, eg forecasts or returns for
+    several instruments which we want to pool
+    """
+
+    def ffill(self) -> "listOfDataFrames":
+        return listOfDataFrames([df.ffill() for df in self])
+
+    def resample(self, frequency: str) -> "listOfDataFrames":
+        """
+        Last value in each period, for levels such as forecasts or prices
+        """
+        return listOfDataFrames([df.resample(frequency).last() for df in self])
+
+    def resample_sum(self, frequency: str) -> "listOfDataFrames":
+        return listOfDataFrames(
+            [df.resample(frequency).sum(min_count=1) for df in self]
+        )
+
+    def reindex_to_common_columns(self) -> "listOfDataFrames":
+        common_columns = _common_columns_of_list_of_df(self)
+
+        return listOfDataFrames([df.reindex(columns=common_columns) for df in self])
+
+    def stacked_df_with_added_time_from_list(self) -> pd.DataFrame:
+        """
+        One data frame with the rows of all the data frames, sorted by time.
+        Each frame's timestamps are moved on by a microsecond per position in
+        the list, so the index stays unique
+
+        >>> d = datetime.datetime
+        >>> df1 = pd.DataFrame(dict(a=[1.0, 2.0]), index=[d(2000,1,1), d(2000,1,2)])
+        >>> df2 = pd.DataFrame(dict(a=[3.0]), index=[d(2000,1,1)])
+        >>> listOfDataFrames([df1, df2]).stacked_df_with_added_time_from_list()
+                                      a
+        2000-01-01 00:00:00.000000  1.0
+        2000-01-01 00:00:00.000001  3.0
+        2000-01-02 00:00:00.000000  2.0
+        """
+        list_of_df = self.reindex_to_common_columns()
+        if len(list_of_df) == 0:
+            return pd.DataFrame()
+
+        list_of_df_with_added_time = [
+            _df_with_added_time(df, microseconds=position)
+            for position, df in enumerate(list_of_df)
+        ]
+        stacked_df = pd.concat(list_of_df_with_added_time, axis=0)
+
+        # mergesort is stable, so ties stay in list order
+        stacked_df = stacked_df.sort_index(kind="mergesort")
+
+        return stacked_df
+
+
+def _common_columns_of_list_of_df(list_of_df: list) -> list:
+    if len(list_of_df) == 0:
+        return []
+
+    common_columns = list(list_of_df[0].columns)
+    for df in list_of_df[1:]:
+        common_columns = [column for column in common_columns if column in df.columns]
+
+    return common_columns
+
+
+def _df_with_added_time(df: pd.DataFrame, microseconds: int) -> pd.DataFrame:
+    df = df.copy()
+    df.index = df.index + pd.Timedelta(microseconds=microseconds)
+
+    return df
@@ -56,6 +56,54 @@ def uniquets(x: Union[pd.Series, pd.DataFrame]) -> Union[pd.Series, pd.DataFrame
     return x
 
 
+def is_plain_pandas_object(x) -> bool:
+    # subclasses such as accountCurve carry extra state, and don't survive copying
+    return type(x) in (pd.Series, pd.DataFrame)
+
+
+def make_read_only(x):
+    """
+    Mark the numpy arrays holding the data of a pd.Series or pd.DataFrame as read
+    only, so anything trying to modify them in place raises a ValueError rather
+    than silently changing them for everyone else holding a reference
+
+    Anything else is returned untouched
+
+    >>> x = make_read_only(pd.Series([1.0, 2.0]))
+    >>> x[x > 1.0] = 0.0
+    Traceback (most recent call last):
+    ...
+    ValueError: putmask: output array is read-only
+    """
+    if not is_plain_pandas_object(x):
+        return x
+
+    if is_a_series(x):
+        list_of_arrays = [x.to_numpy(copy=False)]
+    else:
+        # a DataFrame keeps its data in one array per block of same type columns
+        list_of_arrays = [block.values for block in x._mgr.blocks]
+
+    for array in list_of_arrays:
+        if isinstance(array, np.ndarray):
+            array.flags.writeable = False
+
+    return x
+
+
+def read_only_view(x):
+    """
+    A new pd.Series or pd.DataFrame sharing the (read only) data of x without
+    copying it. Changing the index or name of the view doesn't affect x.
+
+    Anything else is returned untouched
+    """
+    if not is_plain_pandas_object(x):
+        return x
+
+    return x.copy(deep=False)
+
+
 def get_column_names_in_df_with_at_least_one_value(df: pd.DataFrame) -> List[str]:
     """
 
@@ -1,4 +1,3 @@
-from copy import copy
 from typing import Union
 
 import pandas as pd
@@ -70,11 +69,10 @@ def apply_abs_min(x: pd.Series, min_value: float = 0.1) -> pd.Series:
     Freq: B, dtype: int64
     """
 
-    ## Could also use clip but no quicker and this is more intuitive
-    x[(x < min_value) & (x > 0)] = min_value
-    x[(x > -min_value) & (x < 0)] = -min_value
+    ## out of place, so the caller's series (perhaps cached) is left alone
+    too_small = (x.abs() < min_value) & (x != 0)
 
-    return x
+    return x.mask(too_small, np.sign(x) * min_value)
 
 
 def spread_out_annualised_return_over_periods(data_as_annual: pd.Series) -> pd.Series:
@@ -102,13 +100,7 @@ def replace_all_zeros_with_nan(pd_series: pd.Series) -> pd.Series:
     2000-01-03 23:00:00    6.0
     dtype: float64
     """
-    copy_pd_series = copy(pd_series)
-    copy_pd_series[copy_pd_series == 0.0] = np.nan
-
-    if all(copy_pd_series.isna()):
-        copy_pd_series[:] = np.nan
-
-    return copy_pd_series
+    return pd_series.where(pd_series != 0.0)
 
 
 def calculate_cost_deflator(price: pd.Series) -> pd.Series:
@@ -146,6 +138,63 @@ def years_in_data(data: pd.Series) -> list[int]:
     return unique_years
 
 
+def weights_sum_to_one(weights: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalise each row of weights so it adds up to one, except rows of all
+    zeros which stay as they are
+
+    >>> import datetime
+    >>> d = datetime.datetime
+    >>> weights = pd.DataFrame(dict(a=[1.0, 0.0], b=[3.0, 0.0]), index=[d(2000,1,1), d(2000,1,2)])
+    >>> weights_sum_to_one(weights)
+                   a     b
+    2000-01-01  0.25  0.75
+    2000-01-02  0.00  0.00
+    """
+    weight_values = weights.to_numpy(dtype=float)
+    sum_weights = np.nansum(weight_values, axis=1)
+    sum_weights[sum_weights == 0.0] = 1.0
+
+    normalised_weights = pd.DataFrame(
+        weight_values / sum_weights[:, np.newaxis],
+        index=weights.index,
+        columns=weights.columns,
+    )
+
+    return normalised_weights
+
+
+def fix_weights_vs_position_or_forecast(
+    weights: pd.DataFrame, position_or_forecast: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    Take weights (eg monthly) onto the index of the forecasts or positions they
+    apply to, setting a weight to zero where there is no forecast or position
+
+    Weights aren't renormalised; see weights_sum_to_one
+
+    >>> import datetime
+    >>> d = datetime.datetime
+    >>> weights = pd.DataFrame(dict(a=[0.5], b=[0.5]), index=[d(2000,1,1)])
+    >>> forecasts = pd.DataFrame(dict(a=[1.0, 2.0, 3.0], b=[np.nan, 1.0, np.nan]), index=[d(2000,1,1), d(2000,1,2), d(2000,1,3)])
+    >>> fix_weights_vs_position_or_forecast(weights, forecasts)
+                  a    b
+    2000-01-01  0.5  0.0
+    2000-01-02  0.5  0.5
+    2000-01-03  0.5  0.5
+    """
+    position_or_forecast_ffill = position_or_forecast.ffill()
+
+    weights = weights[~weights.index.duplicated(keep="last")]
+    adjusted_weights = weights.reindex(
+        position_or_forecast_ffill.index, method="ffill"
+    )[position_or_forecast.columns]
+
+    adjusted_weights = adjusted_weights.where(position_or_forecast_ffill.notna(), 0.0)
+
+    return adjusted_weights
+
+
 if __name__ == "__main__":
     import doctest
 
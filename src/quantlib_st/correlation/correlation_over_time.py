@@ -22,6 +22,12 @@ class CorrelationList:
     column_names: list[str]
     fit_dates: listOfFittingDates
 
+    def stacked_values(self) -> np.ndarray:
+        """
+        :returns: P x K x K array, one correlation matrix per fit period
+        """
+        return np.stack([corr.values for corr in self.corr_list])
+
     def as_(
         self, fmt: Literal["jsonable", "long", "original"] = "jsonable"
     ) -> dict | list[dict] | CorrelationList:
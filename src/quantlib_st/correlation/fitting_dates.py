@@ -4,6 +4,7 @@ import datetime
 from dataclasses import dataclass
 from typing import List
 
+import numpy as np
 import pandas as pd
 
 
@@ -41,6 +42,24 @@ class listOfFittingDates(list):
 
         return index
 
+    def indices_of_most_recent_periods_before_relevant_dates(
+        self, relevant_dates
+    ) -> np.ndarray:
+        """
+        index_of_most_recent_period_before_relevant_date for many dates at once
+        """
+        list_of_start_periods = pd.DatetimeIndex(self.list_of_starting_periods())
+        relevant_dates = pd.DatetimeIndex(relevant_dates)
+        if len(relevant_dates) > 0 and relevant_dates.min() < list_of_start_periods[0]:
+            raise Exception(f"Date {relevant_dates.min()} is before first fitting date")
+
+        return (
+            np.searchsorted(
+                list_of_start_periods.values, relevant_dates.values, side="right"
+            )
+            - 1
+        )
+
 
 def generate_fitting_dates(
     data: pd.DataFrame,
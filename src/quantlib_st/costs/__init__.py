@@ -1,11 +1,20 @@
 from __future__ import annotations
 
-from quantlib_st.costs.calculator import (
-    calculate_sr_cost,
-    calculate_annualized_volatility,
-)
+from typing import TYPE_CHECKING
+
+from quantlib_st.core.lazy_imports import lazy_attributes
+
+if TYPE_CHECKING:
+    from quantlib_st.costs.calculator import (
+        calculate_sr_cost,
+        calculate_annualized_volatility,
+    )
 
 __all__ = [
     "calculate_sr_cost",
     "calculate_annualized_volatility",
 ]
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__, {name: "quantlib_st.costs.calculator" for name in __all__}
+)
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+from quantlib_st.correlation.correlation_over_time import CorrelationList
+
+
+def diversification_multiplier_from_list(
+    correlation_list: CorrelationList,
+    weight_df: pd.DataFrame,
+    ewma_span: int = 125,
+    dm_max: float = 2.5,
+    use_first_period_for_earlier_dates: bool = False,
+    **_ignored_kwargs,
+) -> pd.Series:
+    """
+    Diversification multiplier 1 / sqrt(w' C w) for every date in weight_df,
+    using the correlation matrix of the most recent fit period on that date.
+    Works for forecast weights (FDM) and instrument weights (IDM) alike.
+
+    :param correlation_list: P correlation matrices, one per fit period
+    :param weight_df: TxK weights, columns as correlation_list.column_names
+    :param ewma_span: smoothing, in the periods of weight_df (business days)
+    :param dm_max: cap on the multiplier
+    :param use_first_period_for_earlier_dates: dates before the first fit
+        period use its correlations, rather than raising
+
+    :returns: Tx1 pd.Series
+
+    >>> from quantlib_st.correlation.exponential_correlation import CorrelationEstimate
+    >>> from quantlib_st.correlation.fitting_dates import fitDates, listOfFittingDates
+    >>> dates = pd.date_range("2020-01-01", periods=3, freq="B")
+    >>> fit_dates = listOfFittingDates([fitDates(dates[0], dates[0], dates[0], dates[-1])])
+    >>> corr = CorrelationEstimate(values=np.array([[1.0, 0.0], [0.0, 1.0]]), columns=["a", "b"])
+    >>> correlation_list = CorrelationList([corr], ["a", "b"], fit_dates)
+    >>> weight_df = pd.DataFrame(dict(a=[0.5, 1.0, 0.0], b=[0.5, 0.0, 0.0]), index=dates)
+    >>> diversification_multiplier_from_list(correlation_list, weight_df, ewma_span=1).round(4).tolist()
+    [1.4142, 1.0, 1.0]
+    """
+    weights = weight_df[correlation_list.column_names]
+    div_mult_vector = diversification_multiplier_for_each_date(
+        correlation_list,
+        weights,
+        dm_max=dm_max,
+        use_first_period_for_earlier_dates=use_first_period_for_earlier_dates,
+    )
+
+    div_mult = pd.Series(div_mult_vector, index=weights.index)
+    div_mult_smoothed = div_mult.ewm(span=ewma_span).mean()
+
+    return div_mult_smoothed
+
+
+def diversification_multiplier_for_each_date(
+    correlation_list: CorrelationList,
+    weight_df: pd.DataFrame,
+    dm_max: float = 2.5,
+    use_first_period_for_earlier_dates: bool = False,
+) -> np.ndarray:
+    """
+    Unsmoothed multiplier per row of weight_df. Dates with all zero weights
+    get 1.0; dates with no risk get dm_max. Dates before the first fit
+    period raise, or with use_first_period_for_earlier_dates use its
+    correlations.
+    """
+    fit_dates = correlation_list.fit_dates
+    relevant_dates = weight_df.index.values
+    if use_first_period_for_earlier_dates:
+        relevant_dates = np.maximum(
+            relevant_dates, np.datetime64(fit_dates[0].period_start, "ns")
+        )
+    period_indices = fit_dates.indices_of_most_recent_periods_before_relevant_dates(
+        relevant_dates
+    )
+    # missing correlations are treated as zero
+    correlation_stack = np.nan_to_num(correlation_list.stacked_values(), nan=0.0)
+    weights = np.nan_to_num(weight_df.values, nan=0.0)
+
+    # one einsum per fit period rather than gathering a T x K x K stack
+    risk = np.empty(len(weights))
+    for period_index in np.unique(period_indices):
+        rows = period_indices == period_index
+        risk[rows] = np.einsum(
+            "tk,kl,tl->t",
+            weights[rows],
+            correlation_stack[period_index],
+            weights[rows],
+            optimize=True,
+        )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        div_mult = 1.0 / np.sqrt(risk)
+
+    div_mult[risk < 1e-7] = dm_max
+    div_mult = np.minimum(div_mult, dm_max)
+    div_mult[~weights.any(axis=1)] = 1.0
+
+    return div_mult
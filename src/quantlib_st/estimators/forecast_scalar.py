@@ -1,4 +1,3 @@
-from copy import copy
 import pandas as pd
 import numpy as np
 
@@ -38,17 +37,16 @@ def forecast_scalar(
         backfill = backfill.lower() in ("t", "true", "yes", "1")
 
     # Remove zeros/nans to avoid bias from missing data
-    copy_cs_forecasts = copy(cs_forecasts)
-    copy_cs_forecasts[copy_cs_forecasts == 0.0] = np.nan
+    cs_forecasts_no_zeros = cs_forecasts.where(cs_forecasts != 0.0)
 
     # Take Cross-Sectional average first (median is more robust to outliers)
     # We do this before the Time-Series average to avoid jumps in scalar
     # when new markets are introduced.
-    if copy_cs_forecasts.shape[1] == 1:
-        x = copy_cs_forecasts.abs().iloc[:, 0]
+    if cs_forecasts_no_zeros.shape[1] == 1:
+        x = cs_forecasts_no_zeros.abs().iloc[:, 0]
     else:
         # ffill here ensures we have a view of the "current" forecast level across the pool
-        x = copy_cs_forecasts.ffill().abs().median(axis=1)
+        x = cs_forecasts_no_zeros.ffill().abs().median(axis=1)
 
     # Compute Rolling Time-Series average of absolute values
     avg_abs_value = x.rolling(window=window, min_periods=min_periods).mean()
@@ -0,0 +1,344 @@
+"""
+Correlations pooled across instruments, without stacking their data
+
+Pooling means estimating one correlation matrix from the forecasts of every
+instrument with the same rules, as if their rows were stacked end to end in
+one data frame (listOfDataFrames.stacked_df_with_added_time_from_list) and
+passed to compute_correlation_over_time. For wide pools that frame holds the
+whole history many times over. Here each instrument's data is fed into
+running sums one instrument at a time, one pair of columns at a time, and
+only the timestamps of the stacked rows are kept, to find each row's place
+in the stacked order.
+"""
+
+import numpy as np
+import pandas as pd
+
+from quantlib_st.core.genutils import str2Bool
+from quantlib_st.core.pandas.list_of_df import listOfDataFrames
+from quantlib_st.correlation.correlation_over_time import CorrelationList
+from quantlib_st.correlation.exponential_correlation import (
+    CorrelationEstimate,
+    create_boring_corr_matrix,
+    modify_correlation,
+)
+from quantlib_st.correlation.fitting_dates import generate_fitting_dates
+
+# sums kept for each pair of columns: weights, x, y, x*x, y*y, x*y
+NUMBER_OF_SUMS = 6
+
+
+def pooled_correlation_estimator(
+    data: listOfDataFrames,
+    frequency: str = "W",
+    date_method: str = "expanding",
+    using_exponent: bool = True,
+    ew_lookback: int = 250,
+    min_periods: int = 20,
+    cleaning: bool = True,
+    rollyears: int = 20,
+    floor_at_zero: bool = True,
+    forward_fill_data: bool = True,
+    interval_frequency: str = "12M",
+    no_data_offdiag: float = 0.99,
+    clip: float = None,
+    shrinkage: float = 0.0,
+    **_ignored_kwargs,
+) -> CorrelationList:
+    """
+    Same CorrelationList as compute_correlation_over_time on the stacked
+    data, which is never built
+
+    :param data: listOfDataFrames, eg forecasts for each instrument in a pool
+    :param frequency: data is resampled to this (last value) before estimating
+    :param forward_fill_data: forward fill after resampling
+    :param cleaning: fill correlations we can't estimate with no_data_offdiag
+
+    :returns: CorrelationList
+    """
+    pooled_data = _pooled_data_from_list(
+        data, frequency=frequency, forward_fill_data=str2Bool(forward_fill_data)
+    )
+    column_names = pooled_data.column_names
+
+    fit_dates = generate_fitting_dates(
+        pd.DataFrame(index=pooled_data.first_and_last_timestamps()),
+        date_method=date_method,
+        rollyears=int(rollyears),
+        interval_frequency=interval_frequency,
+    )
+    periods_with_data = [
+        period_index
+        for period_index, fit_period in enumerate(fit_dates)
+        if not fit_period.no_data
+    ]
+
+    if str2Bool(using_exponent):
+        raw_correlations = pooled_data.exponential_correlations_at(
+            [fit_dates[period_index].fit_end for period_index in periods_with_data],
+            ew_lookback=ew_lookback,
+            min_periods=int(min_periods),
+        )
+    else:
+        raw_correlations = pooled_data.correlations_over_windows(
+            [fit_dates[period_index].fit_start for period_index in periods_with_data],
+            [fit_dates[period_index].fit_end for period_index in periods_with_data],
+        )
+    raw_correlations_by_period = dict(zip(periods_with_data, raw_correlations))
+
+    boring_corr = create_boring_corr_matrix(
+        len(column_names), column_names, offdiag=no_data_offdiag
+    )
+    corr_list = []
+    for period_index in range(len(fit_dates)):
+        raw_values = raw_correlations_by_period.get(period_index, None)
+        if raw_values is None or np.isnan(raw_values).all():
+            corr_list.append(boring_corr)
+            continue
+
+        if str2Bool(cleaning):
+            raw_values = np.where(np.isnan(raw_values), boring_corr.values, raw_values)
+
+        corr = modify_correlation(
+            CorrelationEstimate(values=raw_values, columns=column_names),
+            floor_at_zero=str2Bool(floor_at_zero),
+            clip_value=clip,
+            shrinkage=shrinkage,
+        )
+        corr_list.append(corr)
+
+    return CorrelationList(
+        corr_list=corr_list, column_names=column_names, fit_dates=fit_dates
+    )
+
+
+class pooledData(object):
+    """
+    The data frames of a pool, with each one's timestamps moved on by a
+    microsecond per position in the list, as the stacked frame would have
+    them
+    """
+
+    def __init__(self, list_of_df: listOfDataFrames):
+        self._column_names = list(list_of_df[0].columns) if len(list_of_df) else []
+        self._list_of_timestamps = [
+            (df.index + pd.Timedelta(microseconds=position)).asi8
+            for position, df in enumerate(list_of_df)
+        ]
+        self._list_of_values = [df.to_numpy(dtype=float) for df in list_of_df]
+
+        # only timestamps: where each row would be in the stacked frame
+        self._stacked_timestamps = np.sort(
+            np.concatenate(self._list_of_timestamps + [np.empty(0, dtype=np.int64)]),
+            kind="mergesort",
+        )
+        self._list_of_stacked_positions = [
+            np.searchsorted(self._stacked_timestamps, timestamps)
+            for timestamps in self._list_of_timestamps
+        ]
+
+    @property
+    def column_names(self) -> list:
+        return self._column_names
+
+    def first_and_last_timestamps(self) -> pd.DatetimeIndex:
+        if len(self._stacked_timestamps) == 0:
+            raise Exception("No data to estimate pooled correlations from")
+
+        return pd.DatetimeIndex(
+            self._stacked_timestamps[[0, -1]].astype("datetime64[ns]")
+        )
+
+    def pairs_of_columns(self) -> list:
+        number_of_columns = len(self.column_names)
+        return [
+            (column_a, column_b)
+            for column_a in range(number_of_columns)
+            for column_b in range(column_a, number_of_columns)
+        ]
+
+    def exponential_correlations_at(
+        self, fit_ends: list, ew_lookback: int, min_periods: int
+    ) -> list:
+        """
+        The correlation of an exponentially weighted estimate run through the
+        stacked rows, as of the last row before each fit end, as
+        ExponentialCorrelationResults gives
+
+        :returns: list of K x K arrays, one per fit end (which must increase)
+        """
+        decay = 1.0 - 2.0 / (ew_lookback + 1.0)
+        fit_end_timestamps = pd.DatetimeIndex(fit_ends).asi8
+        stacked_rows_before_fit_end = np.searchsorted(
+            self._stacked_timestamps, fit_end_timestamps, side="left"
+        )
+        # rows with segment s are before fit ends s, s+1, ...
+        list_of_segments = [
+            np.searchsorted(fit_end_timestamps, timestamps, side="right")
+            for timestamps in self._list_of_timestamps
+        ]
+
+        number_of_columns = len(self.column_names)
+        all_sums = np.zeros(
+            (len(fit_ends), number_of_columns, number_of_columns, NUMBER_OF_SUMS)
+        )
+        all_counts = np.zeros((len(fit_ends), number_of_columns, number_of_columns))
+        for column_a, column_b in self.pairs_of_columns():
+            sums, counts = self._exponential_sums_for_pair(
+                column_a,
+                column_b,
+                decay=decay,
+                list_of_segments=list_of_segments,
+                stacked_rows_before_fit_end=stacked_rows_before_fit_end,
+            )
+            all_sums[:, column_a, column_b] = all_sums[:, column_b, column_a] = sums
+            all_counts[:, column_a, column_b] = all_counts[:, column_b, column_a] = (
+                counts
+            )
+
+        correlations = _correlation_from_sums(all_sums)
+        correlations[all_counts < max(min_periods, 1)] = np.nan
+
+        return list(correlations)
+
+    def correlations_over_windows(self, fit_starts: list, fit_ends: list) -> list:
+        """
+        Pairwise correlations of the stacked rows from each fit start to fit
+        end, both included, as DataFrame.corr would give
+
+        :returns: list of K x K arrays, one per window
+        """
+        fit_start_timestamps = pd.DatetimeIndex(fit_starts).asi8
+        fit_end_timestamps = pd.DatetimeIndex(fit_ends).asi8
+        number_of_columns = len(self.column_names)
+
+        all_sums = np.zeros(
+            (len(fit_ends), number_of_columns, number_of_columns, NUMBER_OF_SUMS)
+        )
+        for column_a, column_b in self.pairs_of_columns():
+            sums = np.zeros((len(fit_ends), NUMBER_OF_SUMS))
+            for timestamps, values in zip(
+                self._list_of_timestamps, self._list_of_values
+            ):
+                x, y, valid = _pair_of_columns(values, column_a, column_b)
+                cumulative_sums = np.vstack(
+                    [
+                        np.zeros(NUMBER_OF_SUMS),
+                        np.cumsum(
+                            _terms_to_sum(x, y, weights=valid.astype(float)), axis=0
+                        ),
+                    ]
+                )
+                first_rows = np.searchsorted(
+                    timestamps, fit_start_timestamps, side="left"
+                )
+                end_rows = np.searchsorted(timestamps, fit_end_timestamps, side="right")
+                sums += cumulative_sums[end_rows] - cumulative_sums[first_rows]
+
+            all_sums[:, column_a, column_b] = all_sums[:, column_b, column_a] = sums
+
+        return list(_correlation_from_sums(all_sums))
+
+    def _exponential_sums_for_pair(
+        self,
+        column_a: int,
+        column_b: int,
+        decay: float,
+        list_of_segments: list,
+        stacked_rows_before_fit_end: np.ndarray,
+    ):
+        number_of_fit_ends = len(stacked_rows_before_fit_end)
+
+        # rank of each row among the stacked rows where both columns have data
+        valid_in_stacked_order = np.zeros(len(self._stacked_timestamps), dtype=bool)
+        list_of_pairs = []
+        for values, stacked_positions in zip(
+            self._list_of_values, self._list_of_stacked_positions
+        ):
+            x, y, valid = _pair_of_columns(values, column_a, column_b)
+            valid_in_stacked_order[stacked_positions] = valid
+            list_of_pairs.append((x, y, valid))
+
+        valid_rows_so_far = np.concatenate([[0], np.cumsum(valid_in_stacked_order)])
+        valid_rows_before_fit_end = valid_rows_so_far[stacked_rows_before_fit_end]
+
+        # weights are decay ** (valid rows after this one, up to the fit end
+        # of its segment); each segment is summed on its own and then rolled
+        # forward, so the exponents never get large
+        segment_sums = np.zeros((number_of_fit_ends, NUMBER_OF_SUMS))
+        for (x, y, valid), stacked_positions, segments in zip(
+            list_of_pairs, self._list_of_stacked_positions, list_of_segments
+        ):
+            use_row = valid & (segments < number_of_fit_ends)
+            segments = segments[use_row]
+            ranks = valid_rows_so_far[stacked_positions[use_row] + 1]
+            weights = decay ** (valid_rows_before_fit_end[segments] - ranks)
+
+            terms = _terms_to_sum(x[use_row], y[use_row], weights=weights)
+            for sum_index in range(NUMBER_OF_SUMS):
+                segment_sums[:, sum_index] += np.bincount(
+                    segments, weights=terms[:, sum_index], minlength=number_of_fit_ends
+                )
+
+        sums = np.zeros((number_of_fit_ends, NUMBER_OF_SUMS))
+        running_sums = np.zeros(NUMBER_OF_SUMS)
+        previous_valid_rows = 0
+        for fit_end_index in range(number_of_fit_ends):
+            rows_added = valid_rows_before_fit_end[fit_end_index] - previous_valid_rows
+            running_sums = (
+                running_sums * decay**rows_added + segment_sums[fit_end_index]
+            )
+            sums[fit_end_index] = running_sums
+            previous_valid_rows = valid_rows_before_fit_end[fit_end_index]
+
+        return sums, valid_rows_before_fit_end
+
+
+def _pooled_data_from_list(
+    data: listOfDataFrames, frequency: str, forward_fill_data: bool
+) -> pooledData:
+    data = listOfDataFrames(data).reindex_to_common_columns().resample(frequency)
+    if forward_fill_data:
+        data = data.ffill()
+
+    return pooledData(data)
+
+
+def _pair_of_columns(values: np.ndarray, column_a: int, column_b: int):
+    x = values[:, column_a]
+    y = values[:, column_b]
+    valid = ~np.isnan(x) & ~np.isnan(y)
+
+    return np.where(valid, x, 0.0), np.where(valid, y, 0.0), valid
+
+
+def _terms_to_sum(x: np.ndarray, y: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    weighted_x = weights * x
+    weighted_y = weights * y
+
+    return np.column_stack(
+        [
+            weights,
+            weighted_x,
+            weighted_y,
+            weighted_x * x,
+            weighted_y * y,
+            weighted_x * y,
+        ]
+    )
+
+
+def _correlation_from_sums(sums: np.ndarray) -> np.ndarray:
+    sum_of_weights = sums[..., 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_x = sums[..., 1] / sum_of_weights
+        mean_y = sums[..., 2] / sum_of_weights
+        var_x = sums[..., 3] / sum_of_weights - mean_x**2
+        var_y = sums[..., 4] / sum_of_weights - mean_y**2
+        cov = sums[..., 5] / sum_of_weights - mean_x * mean_y
+
+        correlation = cov / np.sqrt(np.maximum(var_x * var_y, 0.0))
+
+    correlation[~np.isfinite(correlation)] = np.nan
+
+    return correlation
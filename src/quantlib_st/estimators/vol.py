@@ -82,9 +82,8 @@ def robust_vol_calc(
 
 
 def apply_min_vol(vol: pd.Series, vol_abs_min: float = 0.0000000001) -> pd.Series:
-    vol[vol < vol_abs_min] = vol_abs_min
-
-    return vol
+    # out of place, so the caller's series (perhaps cached) is left alone
+    return vol.clip(lower=vol_abs_min)
 
 
 def apply_vol_floor(
@@ -1,4 +1,17 @@
-from quantlib_st.objects.adjusted_prices import futuresAdjustedPrices
-from quantlib_st.objects.multiple_prices import futuresMultiplePrices
+from typing import TYPE_CHECKING
+
+from quantlib_st.core.lazy_imports import lazy_attributes
+
+if TYPE_CHECKING:
+    from quantlib_st.objects.adjusted_prices import futuresAdjustedPrices
+    from quantlib_st.objects.multiple_prices import futuresMultiplePrices
 
 __all__ = ["futuresAdjustedPrices", "futuresMultiplePrices"]
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    dict(
+        futuresAdjustedPrices="quantlib_st.objects.adjusted_prices",
+        futuresMultiplePrices="quantlib_st.objects.multiple_prices",
+    ),
+)
@@ -38,55 +38,258 @@ def empty_fill(date: datetime.datetime) -> Fill:
     return Fill.zero_fill(date)
 
 
-class ListOfFills(list):
-    def __init__(self, list_of_fills):
+class ListOfFills(object):
+    """
+    Fills held as columns: datetime64 dates, float qty and price, and a bool
+    slippage flag, rather than one Fill object per trade. Dates with a time
+    zone are held in UTC, and given back in their time zone.
+
+    Behaves like the list of Fill it used to be: iterating or indexing gives
+    Fill views, and + concatenates with another ListOfFills or a list of Fill.
+    Empty fills are dropped on the way in.
+
+    >>> fills = ListOfFills([Fill(datetime.datetime(2020, 1, 2), 2, 100.0), Fill(datetime.datetime(2020, 1, 3), 0, 101.0)])
+    >>> len(fills)
+    1
+    >>> fills[0].qty
+    2.0
+    >>> fills.as_pd_df()
+                qty  price
+    2020-01-02  2.0  100.0
+    """
+
+    def __init__(self, list_of_fills=()):
         list_of_fills = [fill for fill in list_of_fills if not is_empty_fill(fill)]
-        super().__init__(list_of_fills)
+        self._set_arrays(
+            dates=pd.DatetimeIndex([fill.date for fill in list_of_fills]),
+            qty=[fill.qty for fill in list_of_fills],
+            price=[fill.price for fill in list_of_fills],
+            price_requires_slippage_adjustment=[
+                fill.price_requires_slippage_adjustment for fill in list_of_fills
+            ],
+        )
+
+    @classmethod
+    def from_arrays(
+        cls,
+        dates,
+        qty,
+        price,
+        price_requires_slippage_adjustment=False,
+    ):
+        """
+        :param dates: array-like of dates, all with the same time zone or none
+        :param qty: array-like of quantities; zero quantities are dropped
+        :param price: array-like of prices
+        :param price_requires_slippage_adjustment: bool, or array-like of bool
+        """
+        qty = np.asarray(qty, dtype=float)
+        not_empty = qty != 0
+        slippage_flags = np.broadcast_to(
+            np.asarray(price_requires_slippage_adjustment, dtype=bool), qty.shape
+        )
 
-    def _as_dict_of_lists(self) -> dict:
-        qty_list = [fill.qty for fill in self]
-        price_list = [fill.price for fill in self]
-        date_list = [fill.date for fill in self]
+        list_of_fills = cls.__new__(cls)
+        list_of_fills._set_arrays(
+            dates=pd.DatetimeIndex(dates)[not_empty],
+            qty=qty[not_empty],
+            price=np.asarray(price, dtype=float)[not_empty],
+            price_requires_slippage_adjustment=slippage_flags[not_empty],
+        )
 
-        return dict(qty=qty_list, price=price_list, date=date_list)
+        return list_of_fills
 
-    def as_pd_df(self) -> pd.DataFrame:
-        self_as_dict = self._as_dict_of_lists()
-        date_index = self_as_dict.pop("date")
-        df = pd.DataFrame(self_as_dict, index=date_index)
-        df = df.sort_index()
+    @classmethod
+    def concatenate(cls, list_of_list_of_fills: list):
+        """
+        :param list_of_list_of_fills: ListOfFills, or lists of Fill
+        """
+        list_of_list_of_fills = [
+            fills if isinstance(fills, ListOfFills) else ListOfFills(fills)
+            for fills in list_of_list_of_fills
+        ]
+        if len(list_of_list_of_fills) == 0:
+            return cls()
+
+        tz = _common_tz([fills.tz for fills in list_of_list_of_fills if len(fills) > 0])
+        dates = pd.DatetimeIndex(
+            np.concatenate([fills.dates for fills in list_of_list_of_fills])
+        )
+
+        return cls.from_arrays(
+            dates=_localize_utc_dates(dates, tz),
+            qty=np.concatenate([fills.qty for fills in list_of_list_of_fills]),
+            price=np.concatenate([fills.price for fills in list_of_list_of_fills]),
+            price_requires_slippage_adjustment=np.concatenate(
+                [
+                    fills.price_requires_slippage_adjustment
+                    for fills in list_of_list_of_fills
+                ]
+            ),
+        )
+
+    def _set_arrays(
+        self,
+        dates: pd.DatetimeIndex,
+        qty,
+        price,
+        price_requires_slippage_adjustment,
+    ):
+        qty_and_price = np.empty((len(dates), 2))
+        qty_and_price[:, 0] = qty
+        qty_and_price[:, 1] = price
+        qty_and_price.setflags(write=False)
+        tz = dates.tz
+        # in UTC if there's a time zone
+        dates = np.array(dates.values, dtype="datetime64[ns]")
+        dates.setflags(write=False)
+        slippage_flags = np.array(price_requires_slippage_adjustment, dtype=bool)
+        slippage_flags.setflags(write=False)
+
+        # one block, so as_pd_df doesn't copy
+        self._qty_and_price = qty_and_price
+        self._dates = dates
+        self._tz = tz
+        self._price_requires_slippage_adjustment = slippage_flags
+
+    @property
+    def dates(self) -> np.ndarray:
+        """
+        :returns: np.ndarray of datetime64[ns], in UTC if the fills have a
+            time zone; see date_index
+        """
+        return self._dates
+
+    @property
+    def tz(self):
+        return self._tz
+
+    @property
+    def date_index(self) -> pd.DatetimeIndex:
+        date_index = getattr(self, "_date_index", None)
+        if date_index is None:
+            date_index = _localize_utc_dates(pd.DatetimeIndex(self.dates), self.tz)
+            self._date_index = date_index
+
+        return date_index
+
+    @property
+    def qty(self) -> np.ndarray:
+        return self._qty_and_price[:, 0]
+
+    @property
+    def price(self) -> np.ndarray:
+        return self._qty_and_price[:, 1]
+
+    @property
+    def price_requires_slippage_adjustment(self) -> np.ndarray:
+        return self._price_requires_slippage_adjustment
+
+    def __len__(self) -> int:
+        return len(self._dates)
+
+    def __getitem__(self, item):
+        if isinstance(item, (int, np.integer)):
+            return Fill(
+                date=self.date_index[item],
+                qty=float(self.qty[item]),
+                price=float(self.price[item]),
+                price_requires_slippage_adjustment=bool(
+                    self.price_requires_slippage_adjustment[item]
+                ),
+            )
+
+        return ListOfFills.from_arrays(
+            dates=self.date_index[item],
+            qty=self.qty[item],
+            price=self.price[item],
+            price_requires_slippage_adjustment=self.price_requires_slippage_adjustment[
+                item
+            ],
+        )
+
+    def __iter__(self):
+        for date, qty, price, price_requires_slippage_adjustment in zip(
+            self.date_index,
+            self.qty.tolist(),
+            self.price.tolist(),
+            self.price_requires_slippage_adjustment.tolist(),
+        ):
+            yield Fill(
+                date=date,
+                qty=qty,
+                price=price,
+                price_requires_slippage_adjustment=price_requires_slippage_adjustment,
+            )
+
+    def __add__(self, other):
+        return ListOfFills.concatenate([self, other])
+
+    def __radd__(self, other):
+        return ListOfFills.concatenate([other, self])
+
+    def __eq__(self, other):
+        if not isinstance(other, (ListOfFills, list)):
+            return NotImplemented
+
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return "ListOfFills(%s)" % str(list(self))
+
+    def is_sorted(self) -> bool:
+        return bool(np.all(self.dates[1:] >= self.dates[:-1]))
+
+    def as_pd_df(self, copy: bool = True) -> pd.DataFrame:
+        """
+        :param copy: if False, and the fills are already in date order, the
+            dataframe is a read only view on the fills; setting values in it
+            raises ValueError
+        :returns: pd.DataFrame, columns qty and price, indexed by date
+        """
+        df = pd.DataFrame(
+            self._qty_and_price,
+            index=self.date_index,
+            columns=["qty", "price"],
+            copy=copy,
+        )
+        if not self.is_sorted():
+            df = df.sort_index(kind="stable")
 
         return df
 
     @classmethod
     def from_position_series_and_prices(cls, positions: pd.Series, price: pd.Series):
-        list_of_fills = _list_of_fills_from_position_series_and_prices(
-            positions=positions, price=price
+        (
+            trades_without_zeros,
+            prices_aligned_to_trades,
+        ) = _get_valid_trades_and_aligned_prices(positions=positions, price=price)
+
+        return cls.from_arrays(
+            dates=trades_without_zeros.index,
+            qty=trades_without_zeros.values,
+            price=prices_aligned_to_trades.values,
+            price_requires_slippage_adjustment=True,
         )
 
-        return cls(list_of_fills)
 
+def _localize_utc_dates(dates: pd.DatetimeIndex, tz) -> pd.DatetimeIndex:
+    if tz is None:
+        return dates
 
-def _list_of_fills_from_position_series_and_prices(
-    positions: pd.Series, price: pd.Series
-) -> ListOfFills:
-    (
-        trades_without_zeros,
-        prices_aligned_to_trades,
-    ) = _get_valid_trades_and_aligned_prices(positions=positions, price=price)
-
-    trades_as_list = list(trades_without_zeros.values)
-    prices_as_list = list(prices_aligned_to_trades.values)
-    dates_as_list = list(prices_aligned_to_trades.index)
+    return dates.tz_localize("UTC").tz_convert(tz)
 
-    list_of_fills_as_list = [
-        Fill(date, qty, price, price_requires_slippage_adjustment=True)
-        for date, qty, price in zip(dates_as_list, trades_as_list, prices_as_list)
-    ]
 
-    list_of_fills = ListOfFills(list_of_fills_as_list)
+def _common_tz(list_of_tz: list):
+    if len(list_of_tz) == 0:
+        return None
+    if any(str(tz) != str(list_of_tz[0]) for tz in list_of_tz[1:]):
+        raise Exception(
+            "Can't put together fills with different time zones %s"
+            % str(sorted(set(str(tz) for tz in list_of_tz)))
+        )
 
-    return list_of_fills
+    return list_of_tz[0]
 
 
 def _get_valid_trades_and_aligned_prices(
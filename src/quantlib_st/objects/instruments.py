@@ -363,6 +363,43 @@ class instrumentCosts(object):
 
         return slippage + commission
 
+    def calculate_cost_instrument_currency_for_arrays(
+        self,
+        blocks_traded: np.ndarray,
+        block_price_multiplier: float,
+        price: np.ndarray,
+        include_slippage=True,
+    ) -> np.ndarray:
+        """
+        calculate_cost_instrument_currency for many trades at once
+
+        :param blocks_traded: array of trades
+        :param price: array of prices, aligned to blocks_traded
+        :param include_slippage: bool, or array of bool aligned to blocks_traded
+
+        :returns: np.ndarray of costs
+        """
+        abs_blocks_traded = np.abs(blocks_traded)
+        value_per_block = np.asarray(price) * block_price_multiplier
+
+        slippage = np.where(
+            include_slippage,
+            abs_blocks_traded * self.price_slippage * block_price_multiplier,
+            0.0,
+        )
+
+        per_block_commission = abs_blocks_traded * self.value_of_block_commission
+        percentage_commission = (
+            self.percentage_cost * abs_blocks_traded * value_per_block
+        )
+        # as max() of the three, a missing price only loses the percentage
+        commission = np.fmax(
+            np.maximum(per_block_commission, self.value_of_pertrade_commission),
+            percentage_commission,
+        )
+
+        return slippage + commission
+
     def calculate_total_commission(self, blocks_traded: float, value_per_block: float):
         ### YOU WILL NEED TO CHANGE THIS IF YOUR BROKER HAS A MORE COMPLEX STRUCTURE
         per_trade_commission = self.calculate_per_trade_commission()
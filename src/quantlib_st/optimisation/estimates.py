@@ -0,0 +1,148 @@
+"""
+Vectorised estimates of means, standard deviations and correlations, for a
+window of returns or for a batch of bootstrap draws at once
+
+All estimates are per period; annualise with the number of periods in a year.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class returnEstimates:
+    mean: np.ndarray  # K
+    stdev: np.ndarray  # K
+    corr: np.ndarray  # K x K
+
+    def annualised(self, periods_per_year: float) -> "returnEstimates":
+        return returnEstimates(
+            mean=self.mean * periods_per_year,
+            stdev=self.stdev * np.sqrt(periods_per_year),
+            corr=self.corr,
+        )
+
+
+def exponential_weights(number_of_rows: int, span: float = None) -> np.ndarray:
+    """
+    Weights as pandas ewm(span=span, adjust=True) gives the last row: the most
+    recent row gets the largest weight. No span gives equal weights
+
+    >>> exponential_weights(3, span=3)
+    array([0.25, 0.5 , 1.  ])
+    """
+    if span is None:
+        return np.ones(number_of_rows)
+
+    alpha = 2.0 / (span + 1.0)
+    ages = np.arange(number_of_rows - 1, -1, -1)
+
+    return (1.0 - alpha) ** ages
+
+
+def estimates_for_window(
+    returns: np.ndarray,
+    mean_span: float = None,
+    vol_span: float = None,
+    corr_span: float = None,
+    mean_min_periods: int = 1,
+    vol_min_periods: int = 2,
+    corr_min_periods: int = 2,
+) -> returnEstimates:
+    """
+    Means, standard deviations and pairwise correlations of a T x K array of
+    returns, which can have NaN. Spans make the estimates exponentially
+    weighted. Estimates with fewer than min_periods observations are NaN.
+
+    :returns: returnEstimates
+    """
+    mask = ~np.isnan(returns)
+    zero_filled = np.where(mask, returns, 0.0)
+    counts = mask.sum(axis=0)
+
+    mean = _weighted_mean(
+        zero_filled, mask, exponential_weights(returns.shape[0], mean_span)
+    )
+    mean[counts < mean_min_periods] = np.nan
+
+    vol_weights = exponential_weights(returns.shape[0], vol_span)
+    vol_mean = _weighted_mean(zero_filled, mask, vol_weights)
+    demeaned = np.where(mask, zero_filled - vol_mean, 0.0)
+    stdev = np.sqrt(
+        _bias_corrected_weighted_sum_of_products(demeaned * demeaned, mask, vol_weights)
+    )
+    stdev[counts < vol_min_periods] = np.nan
+
+    corr = _pairwise_correlation(
+        zero_filled,
+        mask,
+        exponential_weights(returns.shape[0], corr_span),
+        min_periods=corr_min_periods,
+    )
+
+    return returnEstimates(mean=mean, stdev=stdev, corr=corr)
+
+
+def estimates_for_bootstrap_draws(samples: np.ndarray) -> returnEstimates:
+    """
+    Estimates for each of a batch of draws at once
+
+    :param samples: R x L x K array; R draws of L periods of K assets, no NaN
+    :returns: returnEstimates with mean and stdev R x K, corr R x K x K
+    """
+    number_of_periods = samples.shape[1]
+    mean = samples.mean(axis=1)
+    demeaned = samples - mean[:, np.newaxis, :]
+
+    covariance = np.einsum("rtk,rtl->rkl", demeaned, demeaned) / (number_of_periods - 1)
+    stdev = np.sqrt(np.einsum("rkk->rk", covariance))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = covariance / (stdev[:, :, np.newaxis] * stdev[:, np.newaxis, :])
+
+    return returnEstimates(mean=mean, stdev=stdev, corr=corr)
+
+
+def _weighted_mean(
+    zero_filled: np.ndarray, mask: np.ndarray, weights: np.ndarray
+) -> np.ndarray:
+    sum_of_weights = weights @ mask
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (weights @ zero_filled) / sum_of_weights
+
+
+def _bias_corrected_weighted_sum_of_products(
+    products: np.ndarray, mask: np.ndarray, weights: np.ndarray
+) -> np.ndarray:
+    # as pandas ewm(adjust=True, bias=False)
+    sum_of_weights = weights @ mask
+    sum_of_squared_weights = (weights * weights) @ mask
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (weights @ products) / (
+            sum_of_weights - sum_of_squared_weights / sum_of_weights
+        )
+
+
+def _pairwise_correlation(
+    zero_filled: np.ndarray, mask: np.ndarray, weights: np.ndarray, min_periods: int
+) -> np.ndarray:
+    # each pair uses the rows where both have data; demeaning is by each
+    # column's own mean, which is close enough for weighting purposes
+    float_mask = mask.astype(float)
+    mean = _weighted_mean(zero_filled, mask, weights)
+    demeaned = np.where(mask, zero_filled - mean, 0.0)
+
+    weighted_demeaned = demeaned * weights[:, np.newaxis]
+    cross_products = weighted_demeaned.T @ demeaned
+    # sum of squares of i, over the rows where j also has data
+    sums_of_squares = (weighted_demeaned * demeaned).T @ float_mask
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cross_products / np.sqrt(sums_of_squares * sums_of_squares.T)
+
+    pair_counts = float_mask.T @ float_mask
+    corr[pair_counts < min_periods] = np.nan
+    np.fill_diagonal(corr, 1.0)
+
+    return corr
@@ -0,0 +1,436 @@
+"""
+Estimate forecast (or instrument) weights over time from net returns
+
+Configured from the forecast_weight_estimate block, eg
+
+    forecast_weight_estimate:
+      func: optimisation.generic_optimiser.genericOptimiser
+      method: shrinkage    # or one_period, bootstrap
+      ...
+
+For each fitting period we estimate means, standard deviations and
+correlations, adjust them (equalise, shrink, clean) and find the long only
+weights that maximise the Sharpe ratio. Bootstrap does this for a batch of
+random draws of the data and averages the weights.
+"""
+
+from copy import copy
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize
+
+from quantlib_st.core.genutils import str2Bool
+from quantlib_st.correlation.fitting_dates import (
+    fitDates,
+    generate_fitting_dates,
+    listOfFittingDates,
+)
+from quantlib_st.optimisation.estimates import (
+    estimates_for_bootstrap_draws,
+    estimates_for_window,
+    returnEstimates,
+)
+from quantlib_st.optimisation.pre_processing import returnsPreProcessor
+from quantlib_st.systems.tools.parallel import PROCESS_EXECUTOR, get_pool_executor
+
+ONE_PERIOD = "one_period"
+SHRINKAGE = "shrinkage"
+BOOTSTRAP = "bootstrap"
+
+POSSIBLE_METHODS = [ONE_PERIOD, SHRINKAGE, BOOTSTRAP]
+
+
+@dataclass
+class optimisationParameters:
+    method: str = SHRINKAGE
+    periods_per_year: float = 52.0
+    cleaning: bool = True
+    equalise_SR: bool = False
+    ann_target_SR: float = 0.5
+    equalise_vols: bool = True
+    shrinkage_SR: float = 0.9
+    shrinkage_corr: float = 0.5
+    floor_correlation_at_zero: bool = False
+    monte_runs: int = 100
+    bootstrap_length: int = 50
+    seed: int = None
+    estimate_kwargs: dict = field(default_factory=dict)
+
+
+class genericOptimiser(object):
+    def __init__(
+        self,
+        returns_pre_processor: returnsPreProcessor,
+        asset_name: str,
+        log=None,
+        method: str = SHRINKAGE,
+        date_method: str = "expanding",
+        rollyears: int = 20,
+        cleaning: bool = True,
+        equalise_SR: bool = False,
+        ann_target_SR: float = 0.5,
+        equalise_vols: bool = True,
+        shrinkage_SR: float = 0.9,
+        shrinkage_corr: float = 0.5,
+        monte_runs: int = 100,
+        bootstrap_length: int = 50,
+        bootstrap_max_workers: int = None,
+        seed: int = None,
+        correlation_estimate: dict = None,
+        mean_estimate: dict = None,
+        vol_estimate: dict = None,
+        **_ignored_kwargs,
+    ):
+        """
+        :param returns_pre_processor: gives us the net returns to optimise over
+        :param asset_name: instrument we are estimating weights for
+        :param method: one of one_period, shrinkage, bootstrap
+        :param bootstrap_max_workers: if more than one, bootstrap fitting
+            periods are spread over a pool of this many processes
+        :param seed: makes bootstrap draws repeatable
+        """
+        if method not in POSSIBLE_METHODS:
+            raise Exception(
+                "Optimisation method %s not supported, must be one of %s"
+                % (method, str(POSSIBLE_METHODS))
+            )
+
+        self._returns_pre_processor = returns_pre_processor
+        self._asset_name = asset_name
+        self._log = log
+        self._date_method = date_method
+        self._rollyears = int(rollyears)
+        self._bootstrap_max_workers = bootstrap_max_workers
+
+        correlation_estimate = copy(correlation_estimate or {})
+        self._parameters = optimisationParameters(
+            method=method,
+            periods_per_year=returns_pre_processor.periods_per_year,
+            cleaning=str2Bool(cleaning),
+            equalise_SR=str2Bool(equalise_SR),
+            ann_target_SR=float(ann_target_SR),
+            equalise_vols=str2Bool(equalise_vols),
+            shrinkage_SR=float(shrinkage_SR),
+            shrinkage_corr=float(shrinkage_corr),
+            floor_correlation_at_zero=str2Bool(
+                correlation_estimate.get("floor_at_zero", False)
+            ),
+            monte_runs=int(monte_runs),
+            bootstrap_length=int(bootstrap_length),
+            seed=seed,
+            estimate_kwargs=_estimate_kwargs_from_config(
+                correlation_estimate=correlation_estimate,
+                mean_estimate=mean_estimate or {},
+                vol_estimate=vol_estimate or {},
+            ),
+        )
+
+        self._weights = None
+
+    @property
+    def parameters(self) -> optimisationParameters:
+        return self._parameters
+
+    @property
+    def net_returns(self) -> pd.DataFrame:
+        return self._returns_pre_processor.get_net_returns(self._asset_name)
+
+    @property
+    def fit_dates(self) -> listOfFittingDates:
+        return generate_fitting_dates(
+            self.net_returns, date_method=self._date_method, rollyears=self._rollyears
+        )
+
+    def weights(self) -> pd.DataFrame:
+        """
+        :returns: pd.DataFrame of weights, indexed by the start of each fitting
+            period, a column per rule
+        """
+        if self._weights is None:
+            self._weights = self._calculate_weights()
+
+        return self._weights
+
+    def _calculate_weights(self) -> pd.DataFrame:
+        net_returns = self.net_returns
+        fit_dates = self.fit_dates
+        list_of_windows = [
+            _returns_for_fit_period(net_returns, fit_period) for fit_period in fit_dates
+        ]
+        period_indices = list(range(len(fit_dates)))
+
+        if self._use_pool():
+            with get_pool_executor(
+                PROCESS_EXECUTOR, max_workers=int(self._bootstrap_max_workers)
+            ) as executor:
+                list_of_weights = list(
+                    executor.map(
+                        weights_for_period,
+                        list_of_windows,
+                        [self.parameters] * len(fit_dates),
+                        period_indices,
+                    )
+                )
+        else:
+            list_of_weights = [
+                weights_for_period(window, self.parameters, period_index)
+                for window, period_index in zip(list_of_windows, period_indices)
+            ]
+
+        weights = pd.DataFrame(
+            np.array(list_of_weights),
+            index=fit_dates.list_of_starting_periods(),
+            columns=net_returns.columns,
+        )
+
+        return weights
+
+    def _use_pool(self) -> bool:
+        if self.parameters.method != BOOTSTRAP:
+            return False
+        if self._bootstrap_max_workers is None:
+            return False
+
+        return int(self._bootstrap_max_workers) > 1
+
+
+def weights_for_period(
+    returns: np.ndarray, parameters: optimisationParameters, period_index: int = 0
+) -> np.ndarray:
+    """
+    Long only weights summing to one for a T x K window of returns, which
+    can have NaN. A window with no data gets equal weights if cleaning,
+    otherwise zeros.
+
+    Module level so it can be sent to a process pool.
+    """
+    number_of_assets = returns.shape[1]
+    if returns.shape[0] == 0:
+        return _weights_with_no_data(number_of_assets, parameters)
+
+    if parameters.method == BOOTSTRAP:
+        return _bootstrapped_weights(returns, parameters, period_index)
+
+    estimates = estimates_for_window(returns, **parameters.estimate_kwargs)
+
+    return _weights_given_estimates(
+        estimates.annualised(parameters.periods_per_year), parameters
+    )
+
+
+def _bootstrapped_weights(
+    returns: np.ndarray, parameters: optimisationParameters, period_index: int
+) -> np.ndarray:
+    number_of_assets = returns.shape[1]
+    complete_returns = returns[~np.isnan(returns).any(axis=1)]
+    if complete_returns.shape[0] < 2:
+        return _weights_with_no_data(number_of_assets, parameters)
+
+    if parameters.seed is None:
+        random_generator = np.random.default_rng()
+    else:
+        random_generator = np.random.default_rng([int(parameters.seed), period_index])
+
+    # one draw per row: monte_runs x bootstrap_length x K
+    draw_indices = random_generator.integers(
+        0,
+        complete_returns.shape[0],
+        size=(parameters.monte_runs, parameters.bootstrap_length),
+    )
+    all_estimates = estimates_for_bootstrap_draws(
+        complete_returns[draw_indices]
+    ).annualised(parameters.periods_per_year)
+
+    list_of_weights = [
+        _weights_given_estimates(
+            returnEstimates(
+                mean=all_estimates.mean[run],
+                stdev=all_estimates.stdev[run],
+                corr=all_estimates.corr[run],
+            ),
+            parameters,
+        )
+        for run in range(parameters.monte_runs)
+    ]
+
+    return _normalise(np.mean(list_of_weights, axis=0))
+
+
+def _weights_given_estimates(
+    estimates: returnEstimates, parameters: optimisationParameters
+) -> np.ndarray:
+    number_of_assets = len(estimates.mean)
+    available = np.isfinite(estimates.mean) & np.isfinite(estimates.stdev)
+    available = available & (estimates.stdev > 0)
+
+    if not available.any():
+        return _weights_with_no_data(number_of_assets, parameters)
+
+    if parameters.cleaning:
+        estimates = _clean_estimates(estimates, available)
+        assets_to_use = np.ones(number_of_assets, dtype=bool)
+    else:
+        assets_to_use = available
+
+    mean, stdev, corr = _adjusted_estimates(
+        mean=estimates.mean[assets_to_use],
+        stdev=estimates.stdev[assets_to_use],
+        corr=estimates.corr[np.ix_(assets_to_use, assets_to_use)],
+        parameters=parameters,
+    )
+
+    weights = np.zeros(number_of_assets)
+    weights[assets_to_use] = optimise_max_sharpe_ratio(mean, stdev, corr)
+
+    return weights
+
+
+def _clean_estimates(
+    estimates: returnEstimates, available: np.ndarray
+) -> returnEstimates:
+    # missing assets get the average of the others
+    mean = np.where(available, estimates.mean, np.nanmean(estimates.mean[available]))
+    stdev = np.where(available, estimates.stdev, np.nanmean(estimates.stdev[available]))
+
+    corr = estimates.corr.copy()
+    off_diagonal = ~np.eye(len(mean), dtype=bool)
+    known_correlations = corr[off_diagonal & np.isfinite(corr)]
+    average_corr = known_correlations.mean() if len(known_correlations) > 0 else 0.0
+    corr[~np.isfinite(corr)] = average_corr
+    np.fill_diagonal(corr, 1.0)
+
+    return returnEstimates(mean=mean, stdev=stdev, corr=corr)
+
+
+def _adjusted_estimates(
+    mean: np.ndarray,
+    stdev: np.ndarray,
+    corr: np.ndarray,
+    parameters: optimisationParameters,
+):
+    if parameters.equalise_SR:
+        mean = parameters.ann_target_SR * stdev
+
+    if parameters.method == SHRINKAGE:
+        sharpe_ratios = mean / stdev
+        shrunk_sharpe_ratios = (
+            parameters.shrinkage_SR * np.nanmean(sharpe_ratios)
+            + (1.0 - parameters.shrinkage_SR) * sharpe_ratios
+        )
+        mean = shrunk_sharpe_ratios * stdev
+
+    if parameters.equalise_vols:
+        mean = mean / stdev
+        stdev = np.ones(len(stdev))
+
+    corr = np.nan_to_num(corr, nan=0.0)
+    if parameters.floor_correlation_at_zero:
+        corr = np.maximum(corr, 0.0)
+    if parameters.method == SHRINKAGE and parameters.shrinkage_corr > 0:
+        corr = _shrink_correlation_to_average(corr, parameters.shrinkage_corr)
+    np.fill_diagonal(corr, 1.0)
+
+    return mean, stdev, corr
+
+
+def _shrink_correlation_to_average(corr: np.ndarray, shrinkage: float) -> np.ndarray:
+    if len(corr) < 2:
+        return corr
+
+    shrinkage = min(shrinkage, 1.0)
+    off_diagonal = ~np.eye(len(corr), dtype=bool)
+    average_corr = corr[off_diagonal].mean()
+
+    return shrinkage * average_corr + (1.0 - shrinkage) * corr
+
+
+def optimise_max_sharpe_ratio(
+    mean: np.ndarray, stdev: np.ndarray, corr: np.ndarray
+) -> np.ndarray:
+    """
+    Long only weights summing to one with the highest Sharpe ratio
+
+    >>> optimise_max_sharpe_ratio(np.array([0.1, 0.1]), np.array([0.2, 0.2]), np.eye(2)).round(3)
+    array([0.5, 0.5])
+    """
+    number_of_assets = len(mean)
+    if number_of_assets == 1:
+        return np.ones(1)
+
+    sigma = corr * np.outer(stdev, stdev)
+    starting_weights = np.full(number_of_assets, 1.0 / number_of_assets)
+
+    def _negative_sharpe_ratio(weights):
+        variance = weights @ sigma @ weights
+        if variance <= 0:
+            return 0.0
+        return -(weights @ mean) / np.sqrt(variance)
+
+    result = minimize(
+        _negative_sharpe_ratio,
+        starting_weights,
+        method="SLSQP",
+        bounds=[(0.0, 1.0)] * number_of_assets,
+        constraints=[{"type": "eq", "fun": lambda weights: weights.sum() - 1.0}],
+        tol=1e-8,
+    )
+    if not result.success or not np.all(np.isfinite(result.x)):
+        return starting_weights
+
+    return _normalise(np.clip(result.x, 0.0, None))
+
+
+def _weights_with_no_data(
+    number_of_assets: int, parameters: optimisationParameters
+) -> np.ndarray:
+    if parameters.cleaning:
+        return np.full(number_of_assets, 1.0 / number_of_assets)
+
+    return np.zeros(number_of_assets)
+
+
+def _normalise(weights: np.ndarray) -> np.ndarray:
+    total = weights.sum()
+    if total <= 0:
+        return np.full(len(weights), 1.0 / len(weights))
+
+    return weights / total
+
+
+def _returns_for_fit_period(
+    net_returns: pd.DataFrame, fit_period: fitDates
+) -> np.ndarray:
+    if fit_period.no_data:
+        return np.empty((0, net_returns.shape[1]))
+
+    in_period = (net_returns.index >= fit_period.fit_start) & (
+        net_returns.index < fit_period.fit_end
+    )
+
+    return net_returns.values[in_period]
+
+
+def _estimate_kwargs_from_config(
+    correlation_estimate: dict, mean_estimate: dict, vol_estimate: dict
+) -> dict:
+    return dict(
+        mean_span=_span_from_config(mean_estimate),
+        vol_span=_span_from_config(vol_estimate),
+        corr_span=_span_from_config(correlation_estimate),
+        mean_min_periods=int(mean_estimate.get("min_periods", 1)),
+        vol_min_periods=int(vol_estimate.get("min_periods", 2)),
+        corr_min_periods=int(correlation_estimate.get("min_periods", 2)),
+    )
+
+
+def _span_from_config(estimate_config: dict):
+    if not str2Bool(estimate_config.get("using_exponent", True)):
+        return None
+
+    ew_lookback = estimate_config.get("ew_lookback", None)
+    if ew_lookback is None:
+        return None
+
+    return float(ew_lookback)
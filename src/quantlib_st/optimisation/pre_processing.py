@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+
+from quantlib_st.core.dateutils import (
+    BUSINESS_DAYS_IN_YEAR,
+    MONTHS_IN_YEAR,
+    WEEKS_IN_YEAR,
+)
+from quantlib_st.core.genutils import str2Bool
+from quantlib_st.core.pandas.list_of_df import listOfDataFrames
+from quantlib_st.optimisation.returns import dictOfReturnsForOptimisationWithCosts
+
+PERIODS_PER_YEAR = {
+    "D": BUSINESS_DAYS_IN_YEAR,
+    "B": BUSINESS_DAYS_IN_YEAR,
+    "W": WEEKS_IN_YEAR,
+    "M": MONTHS_IN_YEAR,
+    "ME": MONTHS_IN_YEAR,
+    "Y": 1.0,
+    "YE": 1.0,
+}
+
+
+class returnsPreProcessor(object):
+    """
+    Turns forecast p&l for one or more instruments into the net returns we
+    optimise forecast weights over:
+
+    - daily gross returns are summed to frequency
+    - if pool_gross_returns, the gross returns of all the instruments are
+      stacked into one data frame, otherwise just the instrument's own
+    - if equalise_gross, every rule gets the same gross Sharpe ratio, so only
+      costs and correlations matter
+    - costs (the instrument's own, or the average across instruments if
+      use_pooled_costs) times cost_multiplier are taken off as a Sharpe ratio
+
+    Turnover pooling (use_pooled_turnover) is already reflected in the costs of
+    the account curves, so turnovers are only kept for reference.
+    """
+
+    def __init__(
+        self,
+        dict_of_returns: dictOfReturnsForOptimisationWithCosts,
+        log=None,
+        frequency: str = "W",
+        pool_gross_returns: bool = True,
+        use_pooled_costs: bool = False,
+        equalise_gross: bool = False,
+        cost_multiplier: float = 1.0,
+        turnovers=None,
+        **_ignored_kwargs,
+    ):
+        if frequency not in PERIODS_PER_YEAR:
+            raise Exception(
+                "Frequency %s not recognised, must be one of %s"
+                % (frequency, str(list(PERIODS_PER_YEAR.keys())))
+            )
+
+        self._dict_of_returns = dict_of_returns
+        self._log = log
+        self._frequency = frequency
+        self._pool_gross_returns = str2Bool(pool_gross_returns)
+        self._use_pooled_costs = str2Bool(use_pooled_costs)
+        self._equalise_gross = str2Bool(equalise_gross)
+        self._cost_multiplier = float(cost_multiplier)
+        self._turnovers = turnovers
+
+        self._net_returns = {}
+        self._pooled_gross_returns = None
+
+    @property
+    def dict_of_returns(self) -> dictOfReturnsForOptimisationWithCosts:
+        return self._dict_of_returns
+
+    @property
+    def frequency(self) -> str:
+        return self._frequency
+
+    @property
+    def periods_per_year(self) -> float:
+        return PERIODS_PER_YEAR[self.frequency]
+
+    @property
+    def turnovers(self):
+        return self._turnovers
+
+    @property
+    def rule_names(self) -> list:
+        return self.dict_of_returns.rule_names
+
+    def get_net_returns(self, asset_name: str) -> pd.DataFrame:
+        """
+        :returns: pd.DataFrame of returns at frequency, a column per rule. If
+            pooling, rows from different instruments on the same date are kept
+            apart by a microsecond
+        """
+        net_returns = self._net_returns.get(asset_name, None)
+        if net_returns is None:
+            net_returns = self._calculate_net_returns(asset_name)
+            self._net_returns[asset_name] = net_returns
+
+        return net_returns
+
+    def get_gross_returns(self, asset_name: str) -> pd.DataFrame:
+        if self._pool_gross_returns:
+            # the same for every asset, so only done once
+            if self._pooled_gross_returns is None:
+                self._pooled_gross_returns = self._calculate_gross_returns(
+                    list(self.dict_of_returns.keys())
+                )
+            return self._pooled_gross_returns
+
+        return self._calculate_gross_returns([asset_name])
+
+    def _calculate_gross_returns(self, asset_names: list) -> pd.DataFrame:
+        rule_names = self.rule_names
+
+        list_of_gross_returns = listOfDataFrames(
+            [
+                self.dict_of_returns[code].gross_returns[rule_names]
+                for code in asset_names
+            ]
+        ).resample_sum(self.frequency)
+
+        gross_returns = list_of_gross_returns.stacked_df_with_added_time_from_list()
+
+        if self._equalise_gross:
+            gross_returns = _equalise_sharpe_ratios(gross_returns)
+
+        return gross_returns
+
+    def get_costs_as_SR(self, asset_name: str) -> pd.Series:
+        if self._use_pooled_costs:
+            costs_as_SR = self.dict_of_returns.pooled_costs_as_SR()
+        else:
+            costs_as_SR = self.dict_of_returns[asset_name].costs_as_SR
+
+        return costs_as_SR[self.rule_names] * self._cost_multiplier
+
+    def _calculate_net_returns(self, asset_name: str) -> pd.DataFrame:
+        gross_returns = self.get_gross_returns(asset_name)
+        costs_as_SR = self.get_costs_as_SR(asset_name)
+
+        # an annual SR cost, in the units of each column's returns per period
+        cost_per_period = (
+            costs_as_SR * gross_returns.std() / np.sqrt(self.periods_per_year)
+        )
+        net_returns = gross_returns - cost_per_period
+
+        return net_returns
+
+
+def _equalise_sharpe_ratios(returns: pd.DataFrame) -> pd.DataFrame:
+    std = returns.std()
+    sharpe_ratios = returns.mean() / std
+    average_sharpe_ratio = sharpe_ratios.mean()
+
+    return returns - returns.mean() + average_sharpe_ratio * std
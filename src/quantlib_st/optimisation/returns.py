@@ -0,0 +1,73 @@
+import pandas as pd
+
+from quantlib_st.core.dateutils import BUSINESS_DAYS_IN_YEAR, ROOT_BDAYS_INYEAR
+
+
+class returnsForOptimisationWithCosts(object):
+    """
+    Daily gross returns for one instrument, a column per trading rule, and the
+    cost of each rule in annualised Sharpe ratio units
+
+    Made from an accountCurveGroup, eg accounts.pandl_for_instrument_rules_unweighted
+    """
+
+    def __init__(self, account_curve_group):
+        gross_returns = account_curve_group.gross.to_frame()
+        costs = account_curve_group.costs.to_frame()
+
+        self._gross_returns = gross_returns
+        self._costs_as_SR = _costs_as_SR(gross_returns=gross_returns, costs=costs)
+
+    @property
+    def gross_returns(self) -> pd.DataFrame:
+        return self._gross_returns
+
+    @property
+    def costs_as_SR(self) -> pd.Series:
+        """
+        :returns: pd.Series, rule name -> annualised SR cost (positive is a cost)
+        """
+        return self._costs_as_SR
+
+    @property
+    def rule_names(self) -> list:
+        return list(self.gross_returns.columns)
+
+
+class dictOfReturnsForOptimisationWithCosts(dict):
+    """
+    dict, instrument code -> returnsForOptimisationWithCosts
+    """
+
+    @property
+    def rule_names(self) -> list:
+        all_rule_names = [returns.rule_names for returns in self.values()]
+        if len(all_rule_names) == 0:
+            return []
+
+        return [
+            rule_name
+            for rule_name in all_rule_names[0]
+            if all(rule_name in rule_names for rule_names in all_rule_names)
+        ]
+
+    def pooled_costs_as_SR(self) -> pd.Series:
+        """
+        Average SR cost of each rule across instruments
+        """
+        rule_names = self.rule_names
+        all_costs = pd.concat(
+            [returns.costs_as_SR[rule_names] for returns in self.values()], axis=1
+        )
+
+        return all_costs.mean(axis=1)
+
+
+def _costs_as_SR(gross_returns: pd.DataFrame, costs: pd.DataFrame) -> pd.Series:
+    # costs are negative returns
+    annual_costs = -costs.mean() * BUSINESS_DAYS_IN_YEAR
+    annual_gross_std = gross_returns.std() * ROOT_BDAYS_INYEAR
+
+    costs_as_SR = (annual_costs / annual_gross_std).fillna(0.0)
+
+    return costs_as_SR
@@ -1,3 +1,12 @@
-from quantlib_st.sysdata.data_blob import dataBlob
+from typing import TYPE_CHECKING
+
+from quantlib_st.core.lazy_imports import lazy_attributes
+
+if TYPE_CHECKING:
+    from quantlib_st.sysdata.data_blob import dataBlob
 
 __all__ = ["dataBlob"]
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__, dict(dataBlob="quantlib_st.sysdata.data_blob")
+)
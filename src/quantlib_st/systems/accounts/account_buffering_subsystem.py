@@ -46,6 +46,13 @@ class accountBufferingSubSystemLevel(accountCosts):
         2015-12-11         1
         """
 
+        if self.use_buffered_position_panel():
+            return self.get_buffered_subsystem_position_panel(
+                roundpositions=roundpositions
+            )[instrument_code].reindex(
+                self.get_subsystem_position(instrument_code).index
+            )
+
         optimal_position = self.get_subsystem_position(instrument_code)
 
         buffer_method = self.config.get_element_or_default("buffer_method", "none")
@@ -67,6 +74,45 @@ class accountBufferingSubSystemLevel(accountCosts):
 
         return buffered_position
 
+    @diagnostic()
+    def get_buffered_subsystem_position_panel(
+        self, roundpositions: bool = True
+    ) -> pd.DataFrame:
+        """
+        Buffered subsystem positions for every instrument, in one pass
+
+        :param roundpositions: Round positions to whole contracts
+        :type roundpositions: bool
+
+        :returns: TxN pd.DataFrame, a column per instrument
+        """
+        instrument_list = self.get_instrument_list()
+        optimal_positions = {
+            instrument_code: self.get_subsystem_position(instrument_code)
+            for instrument_code in instrument_list
+        }
+
+        buffer_method = self.config.get_element_or_default("buffer_method", "none")
+        if buffer_method == "none":
+            optimal_position_panel = pd.concat(optimal_positions, axis=1)
+            if roundpositions:
+                return optimal_position_panel.round()
+            else:
+                return optimal_position_panel
+
+        self.log.debug("Calculating buffered subsystem positions for all instruments")
+        pos_buffers = {
+            instrument_code: self.get_buffers_for_subsystem_position(instrument_code)
+            for instrument_code in instrument_list
+        }
+
+        return buffered_position_panel(
+            optimal_positions,
+            pos_buffers,
+            trade_to_edge=self.config.buffer_trade_to_edge,  # type: ignore
+            roundpositions=roundpositions,
+        )
+
     def _get_buffered_subsystem_position_given_optimal_position_and_buffers(
         self,
         optimal_position: pd.Series,
@@ -103,6 +149,59 @@ class accountBufferingSubSystemLevel(accountCosts):
         )
 
 
+def buffered_position_panel(
+    optimal_positions: dict,
+    pos_buffers: dict,
+    trade_to_edge: bool = False,
+    roundpositions: bool = False,
+) -> pd.DataFrame:
+    """
+    apply_buffer_to_panel for dicts of per instrument positions and buffers,
+    which can have different indices. Each instrument starts on its own first
+    date, so the values on its own dates are those apply_buffer gives.
+
+    :param optimal_positions: dict, instrument -> pd.Series
+    :param pos_buffers: dict, instrument -> Tx2 pd.DataFrame, top_pos and bot_pos
+
+    :returns: TxN pd.DataFrame, on the union of the indices
+    """
+    instrument_list = list(optimal_positions.keys())
+    optimal_position_panel = pd.concat(optimal_positions, axis=1)[instrument_list]
+    top_positions = pd.concat(
+        {
+            instrument_code: pos_buffers[instrument_code].top_pos
+            for instrument_code in instrument_list
+        },
+        axis=1,
+    )
+    bottom_positions = pd.concat(
+        {
+            instrument_code: pos_buffers[instrument_code].bot_pos
+            for instrument_code in instrument_list
+        },
+        axis=1,
+    )
+    first_dates = {
+        instrument_code: optimal_position.index[0]
+        for instrument_code, optimal_position in optimal_positions.items()
+        if len(optimal_position) > 0
+    }
+    # instruments with no positions stay all NaN
+    first_dates = {
+        instrument_code: first_dates.get(instrument_code, pd.NaT)
+        for instrument_code in instrument_list
+    }
+
+    return apply_buffer_to_panel(
+        optimal_position_panel,
+        top_positions,
+        bottom_positions,
+        trade_to_edge=trade_to_edge,
+        roundpositions=roundpositions,
+        first_dates=first_dates,
+    )
+
+
 def apply_buffer(
     optimal_position: pd.Series,
     pos_buffers: pd.DataFrame,
@@ -143,23 +242,196 @@ def apply_buffer(
         top_pos = top_pos.round()
         bot_pos = bot_pos.round()
 
-    current_position = use_optimal_position.values[0]
-    if np.isnan(current_position):
-        current_position = 0.0
+    buffered_position = buffer_positions_array(
+        use_optimal_position.to_numpy(dtype=float)[:, np.newaxis],
+        top_pos.to_numpy(dtype=float)[:, np.newaxis],
+        bot_pos.to_numpy(dtype=float)[:, np.newaxis],
+        trade_to_edge=trade_to_edge,
+    )
 
-    buffered_position_list = [current_position]
+    return pd.Series(buffered_position[:, 0], index=optimal_position.index)
 
-    for idx in range(len(optimal_position.index))[1:]:
-        current_position = apply_buffer_single_period(
-            current_position,
-            float(use_optimal_position.values[idx]),
-            float(top_pos.values[idx]),
-            float(bot_pos.values[idx]),
+
+def apply_buffer_to_panel(
+    optimal_positions: pd.DataFrame,
+    top_positions: pd.DataFrame,
+    bottom_positions: pd.DataFrame,
+    trade_to_edge: bool = False,
+    roundpositions: bool = False,
+    first_dates: dict = None,
+) -> pd.DataFrame:
+    """
+    apply_buffer for many instruments at once
+
+    :param optimal_positions: TxN, a column per instrument
+    :param top_positions: TxN top of buffer, aligned to optimal_positions
+    :param bottom_positions: TxN bottom of buffer, aligned to optimal_positions
+    :param first_dates: instrument -> first date of its own positions, if
+        the panel index is a union of instruments starting on different
+        dates. Each instrument starts there, as apply_buffer would
+
+    :returns: TxN pd.DataFrame of buffered positions
+    """
+    index = optimal_positions.index
+    columns = optimal_positions.columns
+
+    use_optimal_positions = optimal_positions.ffill()
+    top_positions = top_positions.reindex(index=index, columns=columns).ffill()
+    bottom_positions = bottom_positions.reindex(index=index, columns=columns).ffill()
+
+    if roundpositions:
+        use_optimal_positions = use_optimal_positions.round()
+        top_positions = top_positions.round()
+        bottom_positions = bottom_positions.round()
+
+    if first_dates is None:
+        first_rows = None
+    else:
+        first_rows = index.get_indexer([first_dates[column] for column in columns])
+
+    buffered_positions = buffer_positions_array(
+        use_optimal_positions.to_numpy(dtype=float),
+        top_positions.to_numpy(dtype=float),
+        bottom_positions.to_numpy(dtype=float),
+        trade_to_edge=trade_to_edge,
+        first_rows=first_rows,
+    )
+
+    return pd.DataFrame(buffered_positions, index=index, columns=columns)
+
+
+def buffer_positions_array(
+    optimal_positions: np.ndarray,
+    top_positions: np.ndarray,
+    bottom_positions: np.ndarray,
+    trade_to_edge: bool = False,
+    first_rows: np.ndarray = None,
+) -> np.ndarray:
+    """
+    Buffered positions for TxN arrays, same rules as apply_buffer_single_period
+
+    The position carries from one period to the next, so we loop over time,
+    but each step does every instrument at once. Each column starts at the
+    optimal position, or zero if that's missing, in its first row (default
+    row 0); it's NaN before that.
+
+    >>> optimal = np.array([[0.0], [3.0], [2.5], [-1.0]])
+    >>> buffer_positions_array(optimal, optimal + 1, optimal - 1, trade_to_edge=True)[:, 0]
+    array([0., 2., 2., 0.])
+    >>> buffer_positions_array(optimal, optimal + 1, optimal - 1)[:, 0]
+    array([ 0.,  3.,  3., -1.])
+    """
+    # no trade in a period where anything is missing
+    missing = (
+        np.isnan(optimal_positions)
+        | np.isnan(top_positions)
+        | np.isnan(bottom_positions)
+    )
+    top_positions = np.where(missing, np.inf, top_positions)
+    bottom_positions = np.where(missing, -np.inf, bottom_positions)
+
+    buffered_positions = np.empty(optimal_positions.shape)
+    if len(buffered_positions) == 0:
+        return buffered_positions
+
+    if first_rows is not None and np.any(first_rows != 0):
+        return _buffer_positions_with_first_rows(
+            optimal_positions,
+            top_positions,
+            bottom_positions,
+            trade_to_edge=trade_to_edge,
+            first_rows=first_rows,
+        )
+
+    buffered_positions[0] = np.nan_to_num(optimal_positions[0], nan=0.0)
+
+    if optimal_positions.shape[1] == 1:
+        # a Python loop over floats beats NumPy calls on length one arrays
+        buffered_positions[:, 0] = _buffer_single_position(
+            optimal_positions[:, 0].tolist(),
+            top_positions[:, 0].tolist(),
+            bottom_positions[:, 0].tolist(),
+            first_position=float(buffered_positions[0, 0]),
+            trade_to_edge=trade_to_edge,
+        )
+        return buffered_positions
+
+    for idx in range(1, len(buffered_positions)):
+        buffered_positions[idx] = _buffer_one_period(
+            buffered_positions[idx - 1],
+            optimal_positions[idx],
+            top_positions[idx],
+            bottom_positions[idx],
             trade_to_edge=trade_to_edge,
         )
-        buffered_position_list.append(current_position)
 
-    buffered_position = pd.Series(buffered_position_list, index=optimal_position.index)
+    return buffered_positions
+
+
+def _buffer_positions_with_first_rows(
+    optimal_positions: np.ndarray,
+    top_positions: np.ndarray,
+    bottom_positions: np.ndarray,
+    trade_to_edge: bool,
+    first_rows: np.ndarray,
+) -> np.ndarray:
+    # NaN positions compare False with the buffers, so stay NaN until started
+    buffered_positions = np.full(optimal_positions.shape, np.nan)
+    columns_starting_in_row = {}
+    for column, first_row in enumerate(first_rows):
+        columns_starting_in_row.setdefault(int(first_row), []).append(column)
+
+    for idx in range(len(buffered_positions)):
+        if idx > 0:
+            buffered_positions[idx] = _buffer_one_period(
+                buffered_positions[idx - 1],
+                optimal_positions[idx],
+                top_positions[idx],
+                bottom_positions[idx],
+                trade_to_edge=trade_to_edge,
+            )
+        starting_columns = columns_starting_in_row.get(idx, None)
+        if starting_columns is not None:
+            buffered_positions[idx, starting_columns] = np.nan_to_num(
+                optimal_positions[idx, starting_columns], nan=0.0
+            )
+
+    return buffered_positions
+
+
+def _buffer_one_period(
+    last_positions: np.ndarray,
+    optimal_positions: np.ndarray,
+    top_pos: np.ndarray,
+    bot_pos: np.ndarray,
+    trade_to_edge: bool,
+) -> np.ndarray:
+    above_top = last_positions > top_pos
+    below_bottom = last_positions < bot_pos
+
+    if trade_to_edge:
+        return np.where(
+            above_top, top_pos, np.where(below_bottom, bot_pos, last_positions)
+        )
+
+    return np.where(above_top | below_bottom, optimal_positions, last_positions)
+
+
+def _buffer_single_position(
+    optimal_position: list,
+    top_pos: list,
+    bot_pos: list,
+    first_position: float,
+    trade_to_edge: bool,
+) -> list:
+    current_position = first_position
+    buffered_position = [current_position]
+    for optimal, top, bot in zip(optimal_position[1:], top_pos[1:], bot_pos[1:]):
+        if current_position > top:
+            current_position = top if trade_to_edge else optimal
+        elif current_position < bot:
+            current_position = bot if trade_to_edge else optimal
+        buffered_position.append(current_position)
 
     return buffered_position
 
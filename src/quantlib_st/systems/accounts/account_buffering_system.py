@@ -1,6 +1,9 @@
 import pandas as pd
 
-from quantlib_st.systems.accounts.account_buffering_subsystem import apply_buffer
+from quantlib_st.systems.accounts.account_buffering_subsystem import (
+    apply_buffer,
+    buffered_position_panel,
+)
 from quantlib_st.core.pandas.strategy_functions import turnover
 from quantlib_st.systems.system_cache import diagnostic
 
@@ -76,6 +79,11 @@ class accountBufferingSystemLevel(accountInputs):
         2015-12-11         1
         """
 
+        if self.use_buffered_position_panel():
+            return self.get_buffered_position_panel(roundpositions=roundpositions)[
+                instrument_code
+            ].reindex(self.get_notional_position(instrument_code).index)
+
         optimal_position = self.get_notional_position(instrument_code)
 
         buffer_method = self.config.get_element_or_default("buffer_method", "none")
@@ -97,6 +105,43 @@ class accountBufferingSystemLevel(accountInputs):
 
         return buffered_position
 
+    @diagnostic()
+    def get_buffered_position_panel(self, roundpositions: bool = True) -> pd.DataFrame:
+        """
+        Buffered positions for every instrument, in one pass
+
+        :param roundpositions: Round positions to whole contracts
+        :type roundpositions: bool
+
+        :returns: TxN pd.DataFrame, a column per instrument
+        """
+        instrument_list = self.get_instrument_list()
+        optimal_positions = {
+            instrument_code: self.get_notional_position(instrument_code)
+            for instrument_code in instrument_list
+        }
+
+        buffer_method = self.config.get_element_or_default("buffer_method", "none")
+        if buffer_method == "none":
+            optimal_position_panel = pd.concat(optimal_positions, axis=1)
+            if roundpositions:
+                return optimal_position_panel.round()
+            else:
+                return optimal_position_panel
+
+        self.log.debug("Calculating buffered positions for all instruments")
+        pos_buffers = {
+            instrument_code: self.get_buffers_for_position(instrument_code)
+            for instrument_code in instrument_list
+        }
+
+        return buffered_position_panel(
+            optimal_positions,
+            pos_buffers,
+            trade_to_edge=self.config.buffer_trade_to_edge,  # type: ignore
+            roundpositions=roundpositions,
+        )
+
     def _get_buffered_position_given_optimal_position_and_buffers(
         self,
         optimal_position: pd.Series,
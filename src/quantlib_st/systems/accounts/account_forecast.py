@@ -11,7 +11,10 @@ from quantlib_st.systems.accounts.curves.account_curve import accountCurve
 from quantlib_st.systems.accounts.pandl_calculators.pandl_SR_cost import (
     pandlCalculationWithSRCosts,
 )
-from quantlib_st.systems.system_cache import diagnostic
+from quantlib_st.systems.accounts.pandl_calculators.pandl_panel import (
+    pandlCalculationPanel,
+)
+from quantlib_st.systems.system_cache import diagnostic, dont_cache
 
 ARBITRARY_FORECAST_CAPITAL = 100
 ARBITRARY_FORECAST_ANNUAL_RISK_TARGET_PERCENTAGE = 0.16
@@ -209,6 +212,14 @@ class accountForecast(accountCosts):
             instrument_code=instrument_code,
         )
 
+        if self._use_pandl_panel_for_forecast(instrument_code, rule_variation_name):
+            return self._pandl_for_instrument_forecast_from_panel(
+                instrument_code,
+                rule_variation_name,
+                delayfill=delayfill,
+                roundpositions=roundpositions,
+            )
+
         forecast = self.get_capped_forecast(instrument_code, rule_variation_name)
 
         price = self.get_instrument_prices_for_position_or_forecast(
@@ -246,6 +257,82 @@ class accountForecast(accountCosts):
 
         return pandl_fcast
 
+    @dont_cache
+    def _use_pandl_panel_for_forecast(
+        self, instrument_code: str, rule_variation_name: str
+    ) -> bool:
+        if not self.use_pandl_panel():
+            return False
+
+        # the panel only has the instrument's own rules; others, eg from
+        # pandl_for_trading_rule_unweighted, are worked out on their own
+        return rule_variation_name in self.list_of_rules_for_code(instrument_code)
+
+    @dont_cache
+    def _pandl_for_instrument_forecast_from_panel(
+        self,
+        instrument_code: str,
+        rule_variation_name: str,
+        delayfill: bool = True,
+        roundpositions: bool = False,
+    ) -> accountCurve:
+        pandl_panel = self.get_pandl_panel_for_instrument_forecasts(
+            instrument_code, delayfill=delayfill, roundpositions=roundpositions
+        )
+        pandl_calculator = pandl_panel.pandl_calculator_for_item(rule_variation_name)
+
+        return accountCurve(pandl_calculator)
+
+    @diagnostic(not_pickable=True)
+    def get_pandl_panel_for_instrument_forecasts(
+        self,
+        instrument_code: str,
+        delayfill: bool = True,
+        roundpositions: bool = False,
+    ) -> pandlCalculationPanel:
+        """
+        P&L for every trading rule of an instrument, worked out together; each
+        rule matches pandl_for_instrument_forecast
+
+        :returns: pandlCalculationPanel, an item per trading rule
+        """
+        list_of_rules = self.list_of_rules_for_code(instrument_code)
+        dict_of_forecasts = {
+            rule_variation_name: self.get_capped_forecast(
+                instrument_code, rule_variation_name
+            )
+            for rule_variation_name in list_of_rules
+        }
+        # reindexed to each forecast, which is usually the same for every rule
+        dict_of_prices = {
+            rule_variation_name: self.get_instrument_prices_for_position_or_forecast(
+                instrument_code=instrument_code, position_or_forecast=forecast
+            )
+            for rule_variation_name, forecast in dict_of_forecasts.items()
+        }
+        SR_cost = {
+            rule_variation_name: self.get_SR_cost_for_instrument_forecast(
+                instrument_code, rule_variation_name
+            )
+            for rule_variation_name in list_of_rules
+        }
+
+        pandl_panel = _pandl_panel_for_forecasts(
+            dict_of_forecasts,
+            dict_of_prices=dict_of_prices,
+            daily_returns_volatility=self.get_daily_returns_volatility(instrument_code),
+            capital=self.get_notional_capital(),
+            fx=self.get_fx_rate(instrument_code),
+            risk_target=self.get_annual_risk_target(),
+            target_abs_forecast=self.target_abs_forecast(),
+            SR_cost=SR_cost,
+            delayfill=delayfill,
+            roundpositions=roundpositions,
+            value_per_point=self.get_value_of_block_price_move(instrument_code),
+        )
+
+        return pandl_panel
+
 
 def pandl_for_instrument_forecast(
     forecast: pd.Series,
@@ -293,6 +380,114 @@ def pandl_for_instrument_forecast(
     return account_curve
 
 
+def pandl_for_instrument_forecasts(
+    dict_of_forecasts: dict,
+    price: pd.Series,
+    capital: float = ARBITRARY_FORECAST_CAPITAL,
+    fx=None,
+    risk_target: float = ARBITRARY_FORECAST_ANNUAL_RISK_TARGET_PERCENTAGE,
+    daily_returns_volatility: Optional[pd.Series] = None,
+    target_abs_forecast: float = 10.0,
+    SR_cost=0.0,
+    delayfill=True,
+    roundpositions: bool = False,
+    value_per_point=ARBITRARY_VALUE_OF_PRICE_POINT,
+) -> dict:
+    """
+    As pandl_for_instrument_forecast, for several forecasts of one instrument
+    (eg one per trading rule). The volatility and average notional position
+    are worked out once, and the P&L of every forecast together in a
+    pandlCalculationPanel.
+
+    :param dict_of_forecasts: dict, name -> forecast
+    :param SR_cost: float for every forecast, or dict name -> float
+
+    :returns: dict, name -> accountCurve
+    """
+    if daily_returns_volatility is None:
+        daily_returns_volatility = robust_daily_vol_given_price(price)
+
+    pandl_panel = _pandl_panel_for_forecasts(
+        dict_of_forecasts,
+        dict_of_prices={
+            forecast_name: price for forecast_name in dict_of_forecasts.keys()
+        },
+        daily_returns_volatility=daily_returns_volatility,
+        capital=capital,
+        fx=fx,
+        risk_target=risk_target,
+        target_abs_forecast=target_abs_forecast,
+        SR_cost=SR_cost,
+        delayfill=delayfill,
+        roundpositions=roundpositions,
+        value_per_point=value_per_point,
+    )
+
+    return {
+        forecast_name: accountCurve(
+            pandl_panel.pandl_calculator_for_item(forecast_name)  # type: ignore
+        )
+        for forecast_name in dict_of_forecasts.keys()
+    }
+
+
+def _pandl_panel_for_forecasts(
+    dict_of_forecasts: dict,
+    dict_of_prices: dict,
+    daily_returns_volatility: pd.Series,
+    capital: float,
+    fx,
+    risk_target: float,
+    target_abs_forecast: float,
+    SR_cost,
+    delayfill: bool,
+    roundpositions: bool,
+    value_per_point,
+) -> pandlCalculationPanel:
+    average_notional_position = _get_average_notional_position(
+        daily_returns_volatility,
+        risk_target=risk_target,
+        value_per_point=value_per_point,
+        capital=capital,
+    )
+
+    forecast_names = list(dict_of_forecasts.keys())
+    notional_positions = {
+        forecast_name: _get_notional_position_for_forecast(
+            _get_normalised_forecast(forecast, target_abs_forecast=target_abs_forecast),
+            average_notional_position=average_notional_position,
+        )
+        for forecast_name, forecast in dict_of_forecasts.items()
+    }
+    if not isinstance(SR_cost, dict):
+        SR_cost = {forecast_name: SR_cost for forecast_name in forecast_names}
+
+    pandl_panel = pandlCalculationPanel(
+        price=dict_of_prices,
+        positions=notional_positions,
+        SR_cost=SR_cost,
+        average_position={
+            forecast_name: average_notional_position for forecast_name in forecast_names
+        },
+        daily_returns_volatility={
+            forecast_name: daily_returns_volatility for forecast_name in forecast_names
+        },
+        fx=(
+            None
+            if fx is None
+            else {forecast_name: fx for forecast_name in forecast_names}
+        ),
+        capital=capital,
+        value_per_point={
+            forecast_name: value_per_point for forecast_name in forecast_names
+        },
+        delayfill=delayfill,
+        roundpositions=roundpositions,
+    )
+
+    return pandl_panel
+
+
 def pandl_for_position(
     notional_position: pd.Series,
     price: pd.Series,
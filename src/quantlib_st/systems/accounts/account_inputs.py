@@ -3,11 +3,12 @@ import pandas as pd
 from quantlib_st.core.dateutils import BUSINESS_DAY_FREQ, HOURLY_FREQ
 from quantlib_st.core.pandas.frequency import infer_frequency
 from quantlib_st.core.constants import arg_not_supplied, named_object
+from quantlib_st.core.genutils import str2Bool
 from quantlib_st.core.pandas.pdutils import from_scalar_values_to_ts
 from quantlib_st.objects.instruments import instrumentCosts
 
 from quantlib_st.systems.stage import SystemStage
-from quantlib_st.systems.system_cache import diagnostic
+from quantlib_st.systems.system_cache import diagnostic, dont_cache
 
 
 class accountInputs(SystemStage):
@@ -267,6 +268,14 @@ class accountInputs(SystemStage):
     def get_instrument_list(self) -> list:
         return self.parent.get_instrument_list()
 
+    @dont_cache
+    def use_buffered_position_panel(self) -> bool:
+        return str2Bool(self.config.use_buffered_position_panel)
+
+    @dont_cache
+    def use_pandl_panel(self) -> bool:
+        return str2Bool(self.config.use_pandl_panel)
+
     @property
     def config(self):
         return self.parent.config
@@ -13,6 +13,9 @@ from quantlib_st.systems.accounts.pandl_calculators.pandl_SR_cost import (
 from quantlib_st.systems.accounts.pandl_calculators.pandl_cash_costs import (
     pandlCalculationWithCashCostsAndFills,
 )
+from quantlib_st.systems.accounts.pandl_calculators.pandl_panel import (
+    pandlCalculationPanel,
+)
 from quantlib_st.systems.accounts.curves.account_curve import accountCurve
 
 
@@ -161,6 +164,82 @@ class accountInstruments(accountCosts, accountBufferingSystemLevel):
 
         return account_curve
 
+    @diagnostic(not_pickable=True)
+    def _pandl_for_instrument_from_panel(
+        self, instrument_code: str, delayfill: bool = True, roundpositions: bool = True
+    ) -> accountCurve:
+        pandl_panel = self.get_pandl_panel_for_instruments(
+            delayfill=delayfill, roundpositions=roundpositions
+        )
+        pandl_calculator = pandl_panel.pandl_calculator_for_item(instrument_code)
+
+        account_curve = accountCurve(pandl_calculator, weighted=True)  # type: ignore
+
+        return account_curve
+
+    @diagnostic(not_pickable=True)
+    def get_pandl_panel_for_instruments(
+        self, delayfill: bool = True, roundpositions: bool = True
+    ) -> pandlCalculationPanel:
+        """
+        P&L with SR costs for every instrument, worked out together; each
+        instrument matches _pandl_for_instrument_with_SR_costs
+
+        :returns: pandlCalculationPanel
+        """
+        instrument_list = self.get_instrument_list()
+        positions = {
+            instrument_code: self.get_buffered_position(
+                instrument_code, roundpositions=roundpositions
+            )
+            for instrument_code in instrument_list
+        }
+        price = {
+            instrument_code: self.get_instrument_prices_for_position_or_forecast(
+                instrument_code, position_or_forecast=positions[instrument_code]
+            )
+            for instrument_code in instrument_list
+        }
+        SR_cost = {
+            instrument_code: self.get_SR_cost_given_turnover(
+                instrument_code,
+                self.instrument_turnover(
+                    instrument_code, roundpositions=roundpositions
+                ),
+            )
+            for instrument_code in instrument_list
+        }
+        average_position = {
+            instrument_code: self.get_average_position_for_instrument_at_portfolio_level(
+                instrument_code
+            )
+            for instrument_code in instrument_list
+        }
+
+        pandl_panel = pandlCalculationPanel(
+            price=price,
+            positions=positions,
+            SR_cost=SR_cost,
+            average_position=average_position,
+            daily_returns_volatility={
+                instrument_code: self.get_daily_returns_volatility(instrument_code)
+                for instrument_code in instrument_list
+            },
+            fx={
+                instrument_code: self.get_fx_rate(instrument_code)
+                for instrument_code in instrument_list
+            },
+            value_per_point={
+                instrument_code: self.get_value_of_block_price_move(instrument_code)
+                for instrument_code in instrument_list
+            },
+            capital=self.get_notional_capital(),
+            delayfill=delayfill,
+            roundpositions=roundpositions,
+        )
+
+        return pandl_panel
+
     @diagnostic()
     def turnover_at_portfolio_level(
         self, instrument_code: str, roundpositions: bool = True
@@ -34,11 +34,16 @@ class accountPortfolio(accountInstruments):
         self.log.info("Calculating pandl for portfolio")
         capital = self.get_notional_capital()
         instruments = self.get_instrument_list()
+        if self.use_SR_costs and self.use_pandl_panel():
+            pandl_for_instrument = self._pandl_for_instrument_from_panel
+        else:
+            pandl_for_instrument = self.pandl_for_instrument
+
         dict_of_pandl_by_instrument = dict(
             [
                 (
                     instrument_code,
-                    self.pandl_for_instrument(
+                    pandl_for_instrument(
                         instrument_code,
                         delayfill=delayfill,
                         roundpositions=roundpositions,
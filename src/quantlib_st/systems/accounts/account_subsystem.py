@@ -8,6 +8,9 @@ from quantlib_st.systems.accounts.pandl_calculators.pandl_SR_cost import (
 from quantlib_st.systems.accounts.pandl_calculators.pandl_cash_costs import (
     pandlCalculationWithCashCostsAndFills,
 )
+from quantlib_st.systems.accounts.pandl_calculators.pandl_panel import (
+    pandlCalculationPanel,
+)
 from quantlib_st.systems.accounts.curves.account_curve import accountCurve
 from quantlib_st.systems.accounts.curves.account_curve_group import accountCurveGroup
 from quantlib_st.systems.accounts.curves.dict_of_account_curves import (
@@ -32,19 +35,24 @@ class accountSubsystem(accountBufferingSubSystemLevel):
     def pandl_across_subsystems_given_instrument_list(
         self, instrument_list: list, delayfill=True, roundpositions=False
     ) -> accountCurveGroup:
-        dict_of_pandl_across_subsystems = dict(
-            [
-                (
-                    instrument_code,
-                    self.pandl_for_subsystem(
+        if self.use_SR_costs and self.use_pandl_panel():
+            dict_of_pandl_across_subsystems = self._pandl_for_subsystems_from_panel(
+                instrument_list, delayfill=delayfill, roundpositions=roundpositions
+            )
+        else:
+            dict_of_pandl_across_subsystems = dict(
+                [
+                    (
                         instrument_code,
-                        delayfill=delayfill,
-                        roundpositions=roundpositions,
-                    ),
-                )
-                for instrument_code in instrument_list
-            ]
-        )
+                        self.pandl_for_subsystem(
+                            instrument_code,
+                            delayfill=delayfill,
+                            roundpositions=roundpositions,
+                        ),
+                    )
+                    for instrument_code in instrument_list
+                ]
+            )
 
         dict_of_pandl_across_subsystems = dictOfAccountCurves(
             dict_of_pandl_across_subsystems
@@ -157,6 +165,83 @@ class accountSubsystem(accountBufferingSubSystemLevel):
 
         return pandl_calculator
 
+    def _pandl_for_subsystems_from_panel(
+        self, instrument_list: list, delayfill=True, roundpositions=False
+    ) -> dict:
+        pandl_panel = self.get_pandl_panel_for_subsystems(
+            instrument_list, delayfill=delayfill, roundpositions=roundpositions
+        )
+
+        return dict(
+            [
+                (
+                    instrument_code,
+                    accountCurve(
+                        pandl_panel.pandl_calculator_for_item(instrument_code)
+                    ),
+                )
+                for instrument_code in instrument_list
+            ]
+        )
+
+    @diagnostic(not_pickable=True)
+    def get_pandl_panel_for_subsystems(
+        self, instrument_list: list, delayfill=True, roundpositions=False
+    ) -> pandlCalculationPanel:
+        """
+        Subsystem P&L with SR costs for instrument_list, worked out together;
+        each instrument matches _pandl_calculator_for_subsystem_with_SR_costs
+
+        :returns: pandlCalculationPanel
+        """
+        positions = {
+            instrument_code: self.get_buffered_subsystem_position(instrument_code)
+            for instrument_code in instrument_list
+        }
+        price = {
+            instrument_code: self.get_instrument_prices_for_position_or_forecast(
+                instrument_code, position_or_forecast=positions[instrument_code]
+            )
+            for instrument_code in instrument_list
+        }
+        SR_cost = {
+            instrument_code: self.get_SR_cost_given_turnover(
+                instrument_code, self.subsystem_turnover(instrument_code)
+            )
+            for instrument_code in instrument_list
+        }
+        ## following doesn't include IDM or instrument weight
+        average_position = {
+            instrument_code: self.get_average_position_at_subsystem_level(
+                instrument_code
+            )
+            for instrument_code in instrument_list
+        }
+
+        pandl_panel = pandlCalculationPanel(
+            price=price,
+            positions=positions,
+            SR_cost=SR_cost,
+            average_position=average_position,
+            daily_returns_volatility={
+                instrument_code: self.get_daily_returns_volatility(instrument_code)
+                for instrument_code in instrument_list
+            },
+            fx={
+                instrument_code: self.get_fx_rate(instrument_code)
+                for instrument_code in instrument_list
+            },
+            value_per_point={
+                instrument_code: self.get_value_of_block_price_move(instrument_code)
+                for instrument_code in instrument_list
+            },
+            capital=self.get_notional_capital(),
+            delayfill=delayfill,
+            roundpositions=roundpositions,
+        )
+
+        return pandl_panel
+
     @diagnostic(not_pickable=True)
     def _pandl_for_subsystem_with_cash_costs(
         self, instrument_code, delayfill=True, roundpositions=True
@@ -4,10 +4,22 @@ from quantlib_st.systems.accounts.curves.account_curve import (
     quant_ratio_lower_curve,
     quant_ratio_upper_curve,
 )
+from quantlib_st.systems.accounts.curves.bootstrap import (
+    confidence_intervals,
+    confidence_intervals_for_each_curve,
+)
+from quantlib_st.systems.accounts.curves.curve_stats import (
+    curveStatistics,
+    statsBundle,
+)
 
 __all__ = [
     "accountCurve",
+    "confidence_intervals",
+    "confidence_intervals_for_each_curve",
+    "curveStatistics",
     "demeaned_remove_zeros",
     "quant_ratio_lower_curve",
     "quant_ratio_upper_curve",
+    "statsBundle",
 ]
@@ -2,10 +2,16 @@
 import pandas as pd
 import numpy as np
 
-from scipy.stats import skew, ttest_1samp, norm
-
 from quantlib_st.core.dateutils import Frequency, from_frequency_to_times_per_year
 from quantlib_st.core.pandas.strategy_functions import drawdown
+from quantlib_st.systems.accounts.curves.bootstrap import confidence_intervals
+from quantlib_st.systems.accounts.curves.curve_stats import (
+    NORMAL_DISTR_RATIO,
+    QUANT_PERCENTILE_EXTREME,
+    QUANT_PERCENTILE_STD,
+    curveStatistics,
+    statsBundle,
+)
 from quantlib_st.systems.accounts.pandl_calculators.pandl_generic_costs import (
     GROSS_CURVE,
     NET_CURVE,
@@ -13,10 +19,6 @@ from quantlib_st.systems.accounts.pandl_calculators.pandl_generic_costs import (
     pandlCalculationWithGenericCosts,
 )
 
-QUANT_PERCENTILE_EXTREME = 0.01
-QUANT_PERCENTILE_STD = 0.3
-NORMAL_DISTR_RATIO = norm.ppf(QUANT_PERCENTILE_EXTREME) / norm.ppf(QUANT_PERCENTILE_STD)
-
 
 class accountCurve(pd.Series):
     def __init__(
@@ -202,22 +204,22 @@ class accountCurve(pd.Series):
         return self.cumsum().ffill()
 
     def mean(self, *args, **kwargs):  # type: ignore[override]
-        return float(self.as_ts.mean(*args, **kwargs))
+        if args or kwargs:
+            return float(self.as_ts.mean(*args, **kwargs))
+
+        return self.curve_statistics.mean()
 
     def std(self, *args, **kwargs):  # type: ignore[override]
-        return float(self.as_ts.std(*args, **kwargs))
+        if args or kwargs:
+            return float(self.as_ts.std(*args, **kwargs))
 
-    def ann_mean(self):
-        ## If nans, then mean will be biased upwards
-        total = self.sum()
-        divisor = self.number_of_years_in_data
+        return self.curve_statistics.std()
 
-        return total / divisor
+    def ann_mean(self):
+        return self.curve_statistics.ann_mean()
 
     def ann_std(self):
-        period_std = self.std()
-
-        return period_std * self.vol_scalar
+        return self.curve_statistics.ann_std()
 
     @property
     def number_of_years_in_data(self) -> float:
@@ -232,113 +234,114 @@ class accountCurve(pd.Series):
         times_per_year = from_frequency_to_times_per_year(self.frequency)
         return times_per_year**0.5
 
+    @property
+    def curve_statistics(self) -> curveStatistics:
+        ## values are extracted once, and intermediates shared between stats
+        curve_statistics = getattr(self, "_curve_statistics", None)
+        if curve_statistics is None:
+            curve_statistics = curveStatistics(
+                self.as_ts.to_numpy(dtype=float), returns_scalar=self.returns_scalar
+            )
+            self._curve_statistics = curve_statistics
+
+        return curve_statistics
+
+    def stats_bundle(self) -> statsBundle:
+        return self.curve_statistics.bundle()
+
+    def confidence_intervals(self, **kwargs) -> pd.DataFrame:
+        """
+        Block bootstrap confidence intervals for statistics of this curve
+
+        :param kwargs: passed to bootstrap.confidence_intervals, eg stat_names,
+            confidence, number_of_resamples, block_length, seed, max_workers
+
+        :returns: pd.DataFrame, a row per stat, columns estimate, lower and upper
+        """
+        return confidence_intervals(
+            self.as_ts.to_numpy(dtype=float),
+            returns_scalar=self.returns_scalar,
+            **kwargs,
+        )
+
     def sharpe(self):
-        mean_return = self.ann_mean()
-        vol = self.ann_std()
-        try:
-            sharpe = mean_return / vol
-        except ZeroDivisionError:
-            sharpe = np.nan
-        return sharpe
+        return self.curve_statistics.sharpe()
 
     def drawdown(self):
         x = self.curve()
         return drawdown(x)
 
     def avg_drawdown(self):
-        dd = self.drawdown()
-        return float(np.nanmean(dd.to_numpy()))
+        return self.curve_statistics.avg_drawdown()
 
     def worst_drawdown(self):
-        dd = self.drawdown()
-        return float(np.nanmin(dd.to_numpy()))
+        return self.curve_statistics.worst_drawdown()
 
     def time_in_drawdown(self):
-        dd = self.drawdown().dropna()
-        dd_series = dd if isinstance(dd, pd.Series) else dd.iloc[:, 0]
-        in_dd = float(dd_series[dd_series < 0].shape[0])
-        return in_dd / float(dd_series.shape[0])
+        return self.curve_statistics.time_in_drawdown()
 
     def calmar(self):
-        return self.ann_mean() / -self.worst_drawdown()
+        return self.curve_statistics.calmar()
 
     def avg_return_to_drawdown(self):
-        return self.ann_mean() / -self.avg_drawdown()
+        return self.curve_statistics.avg_return_to_drawdown()
 
     def sortino(self):
-        period_stddev = np.std(self.losses())
-
-        ann_stdev = period_stddev * self.vol_scalar
-        ann_mean = self.ann_mean()
-
-        try:
-            sortino = ann_mean / ann_stdev
-        except ZeroDivisionError:
-            sortino = np.nan
-
-        return sortino
+        return self.curve_statistics.sortino()
 
     def vals(self):
-        series_vals = pd.Series(self.values)
-        vals = pd.to_numeric(series_vals.dropna(), errors="coerce").to_numpy()
-
-        return vals
+        return self.curve_statistics.vals
 
     ## added args, kwargs for consistency with parent method
     def min(self, *args, **kwargs):
-        return np.nanmin(self)
+        return self.curve_statistics.min()
 
     ## added args, kwargs for consistency with parent method
     def max(self, *args, **kwargs):
-        return np.nanmax(self)
+        return self.curve_statistics.max()
 
     def median(self, *args, **kwargs):  # type: ignore[override]
-        return float(self.as_ts.median(*args, **kwargs))
+        if args or kwargs:
+            return float(self.as_ts.median(*args, **kwargs))
+
+        return self.curve_statistics.median()
 
     def skew(self, *args, **kwargs):
-        return float(skew(self.vals()))
+        return self.curve_statistics.skew()
 
     def losses(self):
-        x = self.vals()
-        return x[x < 0]
+        return self.curve_statistics.losses
 
     def gains(self):
-        x = self.vals()
-        return x[x > 0]
+        return self.curve_statistics.gains
 
     def avg_loss(self):
-        return np.mean(self.losses())
+        return self.curve_statistics.avg_loss()
 
     def avg_gain(self):
-        return np.mean(self.gains())
+        return self.curve_statistics.avg_gain()
 
     def gaintolossratio(self):
-        return self.avg_gain() / -self.avg_loss()
+        return self.curve_statistics.gaintolossratio()
 
     def profitfactor(self):
-        return np.sum(self.gains()) / -np.sum(self.losses())
+        return self.curve_statistics.profitfactor()
 
     def hitrate(self):
-        no_gains = float(self.gains().shape[0])
-        no_losses = float(self.losses().shape[0])
-        if (no_losses + no_gains) == 0.0:
-            return 0.0
-        return no_gains / (no_losses + no_gains)
+        return self.curve_statistics.hitrate()
 
     def rolling_ann_std(self, window=40):
         y = self.as_ts.rolling(window, min_periods=4, center=True).std().to_frame()
         return y * self.vol_scalar
 
     def t_test(self):
-        return ttest_1samp(self.vals(), 0.0)
+        return self.curve_statistics.t_test
 
     def t_stat(self):
-        result = self.t_test()
-        return float(result[0])  # type: ignore[arg-type]
+        return self.curve_statistics.t_stat()
 
     def p_value(self):
-        result = self.t_test()
-        return float(result[1])  # type: ignore[arg-type]
+        return self.curve_statistics.p_value()
 
     def average_quant_ratio(self):
         upper = self.quant_ratio_upper()
@@ -357,35 +360,7 @@ class accountCurve(pd.Series):
         return demeaned_remove_zeros(x)
 
     def stats(self):
-        stats_list = [
-            "min",
-            "max",
-            "median",
-            "mean",
-            "std",
-            "skew",
-            "ann_mean",
-            "ann_std",
-            "sharpe",
-            "sortino",
-            "avg_drawdown",
-            "time_in_drawdown",
-            "calmar",
-            "avg_return_to_drawdown",
-            "avg_loss",
-            "avg_gain",
-            "gaintolossratio",
-            "profitfactor",
-            "hitrate",
-            "t_stat",
-            "p_value",
-        ]
-
-        build_stats = []
-        for stat_name in stats_list:
-            stat_method = getattr(self, stat_name)
-            ans = stat_method()
-            build_stats.append((stat_name, "{0:.4g}".format(ans)))
+        build_stats = self.stats_bundle().as_list_of_formatted_stats()
 
         comment1 = (
             "You can also plot / print:",
@@ -412,5 +387,5 @@ def quant_ratio_upper_curve(x: pd.Series):
 
 
 def demeaned_remove_zeros(x: pd.Series) -> pd.Series:
-    x[x == 0] = np.nan
-    return x - x.mean()
+    x_no_zeros = x.where(x != 0)
+    return x_no_zeros - x_no_zeros.mean()
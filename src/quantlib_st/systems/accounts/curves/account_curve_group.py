@@ -1,7 +1,8 @@
 from copy import copy
+import numpy as np
 import pandas as pd
 
-from quantlib_st.core.dateutils import Frequency
+from quantlib_st.core.dateutils import Frequency, from_frequency_to_times_per_year
 
 from quantlib_st.systems.accounts.curves.account_curve import accountCurve
 from quantlib_st.systems.accounts.curves.dict_of_account_curves import (
@@ -12,7 +13,15 @@ from quantlib_st.systems.accounts.pandl_calculators.pandl_generic_costs import (
     NET_CURVE,
     COSTS_CURVE,
 )
-from quantlib_st.systems.accounts.curves.stats_dict import statsDict
+from quantlib_st.systems.accounts.curves.bootstrap import (
+    confidence_intervals_for_each_curve,
+)
+from quantlib_st.systems.accounts.curves.curve_stats import stats_for_each_column
+from quantlib_st.systems.accounts.curves.stats_dict import (
+    statsDict,
+    from_curve_str_to_curve_type,
+    from_freq_str_to_frequency,
+)
 
 
 class accountCurveGroup(accountCurve):
@@ -49,6 +58,123 @@ class accountCurveGroup(accountCurve):
     ) -> statsDict:
         return statsDict(self, item=stat_name, freq=freq, curve_type=curve_type)
 
+    def stats_for_each_asset(
+        self, curve_type: str = "net", freq: str = "daily", percent: bool = True
+    ) -> pd.DataFrame:
+        """
+        Every statistic for every asset, from one TxN array of their curves
+
+        :param curve_type: gross, net or costs
+        :param freq: daily, weekly, monthly or annual
+        :param percent: percentage returns, or in base currency
+
+        :returns: pd.DataFrame, a row per asset, a column per stat
+        """
+        key = (curve_type, freq, percent)
+        stats_by_key = getattr(self, "_stats_for_each_asset", None)
+        if stats_by_key is None:
+            self._stats_for_each_asset = stats_by_key = {}
+        stats = stats_by_key.get(key, None)
+        if stats is None:
+            stats = self._calculate_stats_for_each_asset(
+                curve_type=curve_type, freq=freq, percent=percent
+            )
+            stats_by_key[key] = stats
+
+        return stats
+
+    def confidence_intervals_for_each_asset(
+        self,
+        curve_type: str = "net",
+        freq: str = "daily",
+        percent: bool = True,
+        **kwargs,
+    ) -> pd.DataFrame:
+        """
+        Block bootstrap confidence intervals for statistics of each asset; with
+        max_workers, one pool is shared by every asset
+
+        :param kwargs: passed to bootstrap.confidence_intervals_for_each_curve,
+            eg stat_names, confidence, number_of_resamples, seed, max_workers
+
+        :returns: pd.DataFrame, a row per asset and stat, columns estimate,
+            lower and upper
+        """
+        frequency = from_freq_str_to_frequency(freq)
+        curves = self._curves_for_each_asset(
+            curve_type=curve_type, frequency=frequency, percent=percent
+        )
+        intervals = confidence_intervals_for_each_curve(
+            {
+                asset_name: curve.to_numpy(dtype=float)
+                for asset_name, curve in curves.items()
+            },
+            returns_scalar=from_frequency_to_times_per_year(frequency),
+            **kwargs,
+        )
+
+        return intervals.rename_axis(index=["asset", "stat"])
+
+    def _curves_for_each_asset(
+        self, curve_type: str, frequency: Frequency, percent: bool
+    ) -> dict:
+        return {
+            asset_name: accountCurve(
+                self.get_pandl_calculator_for_item(asset_name),
+                curve_type=from_curve_str_to_curve_type(curve_type),
+                is_percentage=percent,
+                frequency=frequency,
+            ).as_ts
+            for asset_name in self.asset_columns
+        }
+
+    def _calculate_stats_for_each_asset(
+        self, curve_type: str, freq: str, percent: bool
+    ) -> pd.DataFrame:
+        frequency = from_freq_str_to_frequency(freq)
+        curves = self._curves_for_each_asset(
+            curve_type=curve_type, frequency=frequency, percent=percent
+        )
+        returns = pd.concat(curves, axis=1)
+        in_curve = pd.concat(
+            {
+                asset_name: pd.Series(True, index=curve.index)
+                for asset_name, curve in curves.items()
+            },
+            axis=1,
+        )
+        return stats_for_each_column(
+            returns[self.asset_columns],
+            returns_scalar=from_frequency_to_times_per_year(frequency),
+            in_curve=in_curve,
+        )
+
+    def length_in_months_for_each_asset(self) -> pd.Series:
+        """
+        As length_in_months for each asset: the months from the first with a
+        position to the last
+
+        :returns: pd.Series, indexed by asset
+        """
+        first_and_last_dates = [
+            _first_and_last_date_of_positions(
+                self.get_pandl_calculator_for_item(asset_name).positions
+            )
+            for asset_name in self.asset_columns
+        ]
+        first_dates = pd.DatetimeIndex([dates[0] for dates in first_and_last_dates])
+        last_dates = pd.DatetimeIndex([dates[1] for dates in first_and_last_dates])
+
+        months = (
+            (last_dates.year - first_dates.year) * 12
+            + last_dates.month
+            - first_dates.month
+            + 1
+        )
+        months = np.nan_to_num(np.asarray(months, dtype=float), nan=0.0)
+
+        return pd.Series(months.astype(int), index=self.asset_columns)
+
     ## TO RETURN A 'NEW' ACCOUNT CURVE GROUP
     @property
     def gross(self):
@@ -156,6 +282,13 @@ class accountCurveGroup(accountCurve):
         return self._kwargs
 
 
+def _first_and_last_date_of_positions(positions: pd.Series) -> tuple:
+    if positions is None or positions.count() == 0:
+        return pd.NaT, pd.NaT
+
+    return positions.first_valid_index(), positions.index[-1]
+
+
 def _kwargs_with_defaults(kwargs: dict) -> dict:
     if "frequency" not in kwargs:
         kwargs["frequency"] = Frequency.BDay
@@ -0,0 +1,297 @@
+"""
+Block bootstrap confidence intervals for account curve statistics
+
+Each resample is a column of a TxB matrix of row indices, made of blocks of
+consecutive returns (circular, so every return is equally likely to be
+drawn), which keeps some of the autocorrelation and volatility clustering a
+plain bootstrap would lose. Statistics are worked out for all B resamples at
+once with stats_for_each_column_of_array.
+
+Resamples are drawn in tasks of a fixed size, each with its own seed made
+from the seed, a hash of the curve's returns and the task, so the intervals
+are the same whether or not the tasks are spread over a pool of processes,
+and a curve gets the same intervals on its own or with any other curves.
+"""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from quantlib_st.systems.accounts.curves.curve_stats import (
+    COLUMN_STATS_LIST,
+    stats_for_each_column_of_array,
+)
+from quantlib_st.systems.tools.parallel import PROCESS_EXECUTOR, get_pool_executor
+
+DEFAULT_BOOTSTRAP_STATS = [
+    "sharpe",
+    "sortino",
+    "skew",
+    "worst_drawdown",
+    "avg_drawdown",
+]
+RESAMPLES_PER_TASK = 100
+
+INTERVAL_COLUMNS = ["estimate", "lower", "upper"]
+
+
+def confidence_intervals(
+    values: np.ndarray,
+    returns_scalar: float,
+    stat_names: list = None,
+    confidence: float = 0.95,
+    number_of_resamples: int = 1000,
+    block_length: int = None,
+    seed: int = None,
+    max_workers: int = None,
+) -> pd.DataFrame:
+    """
+    :param values: returns of one curve, can have NaN
+    :param returns_scalar: periods per year of the returns
+    :param stat_names: any of COLUMN_STATS_LIST; default DEFAULT_BOOTSTRAP_STATS
+    :param confidence: the intervals go from (1 - confidence) / 2 to
+        (1 + confidence) / 2 of the bootstrapped statistics
+    :param block_length: default the cube root of the length of the curve
+    :param seed: makes the resamples repeatable
+    :param max_workers: if more than one, tasks of resamples are spread over
+        a pool of this many processes
+
+    :returns: pd.DataFrame, a row per stat, columns estimate, lower and upper
+
+    >>> values = np.random.default_rng(1).normal(0.1, 1.0, size=500)
+    >>> intervals = confidence_intervals(values, returns_scalar=256, seed=1)
+    >>> list(intervals.columns)
+    ['estimate', 'lower', 'upper']
+    >>> bool((intervals.lower <= intervals.estimate).all() and (intervals.estimate <= intervals.upper).all())
+    True
+    """
+    return confidence_intervals_for_each_curve(
+        dict(curve=values),
+        returns_scalar=returns_scalar,
+        stat_names=stat_names,
+        confidence=confidence,
+        number_of_resamples=number_of_resamples,
+        block_length=block_length,
+        seed=seed,
+        max_workers=max_workers,
+    ).loc["curve"]
+
+
+def confidence_intervals_for_each_curve(
+    dict_of_values: dict,
+    returns_scalar: float,
+    stat_names: list = None,
+    confidence: float = 0.95,
+    number_of_resamples: int = 1000,
+    block_length: int = None,
+    seed: int = None,
+    max_workers: int = None,
+) -> pd.DataFrame:
+    """
+    As confidence_intervals, for several curves; with a pool, the tasks of
+    every curve share it
+
+    :param dict_of_values: curve name -> returns
+
+    :returns: pd.DataFrame, a row per curve and stat
+    """
+    if stat_names is None:
+        stat_names = DEFAULT_BOOTSTRAP_STATS
+    _check_stat_names(stat_names)
+    if seed is None:
+        # different every time, but still one seed per task
+        seed = np.random.SeedSequence().entropy
+
+    dict_of_values = {
+        curve_name: np.asarray(values, dtype=float)
+        for curve_name, values in dict_of_values.items()
+    }
+    tasks_by_curve = {
+        curve_name: _tasks_for_curve(
+            values,
+            returns_scalar=returns_scalar,
+            stat_names=stat_names,
+            number_of_resamples=number_of_resamples,
+            block_length=block_length,
+            seed=[int(seed), _hash_of_values(values)],
+        )
+        for curve_name, values in dict_of_values.items()
+    }
+    list_of_tasks = sum(tasks_by_curve.values(), [])
+    list_of_bootstrapped_stats = _run_tasks(list_of_tasks, max_workers=max_workers)
+
+    intervals_by_curve = {}
+    for curve_name, values in dict_of_values.items():
+        number_of_tasks = len(tasks_by_curve[curve_name])
+        bootstrapped_stats = list_of_bootstrapped_stats[:number_of_tasks]
+        list_of_bootstrapped_stats = list_of_bootstrapped_stats[number_of_tasks:]
+        intervals_by_curve[curve_name] = _intervals_given_bootstrapped_stats(
+            values,
+            bootstrapped_stats,
+            returns_scalar=returns_scalar,
+            stat_names=stat_names,
+            confidence=confidence,
+        )
+
+    return pd.concat(intervals_by_curve, names=["curve", "stat"])
+
+
+def block_bootstrap_indices(
+    length: int,
+    number_of_resamples: int,
+    block_length: int,
+    random_generator: np.random.Generator,
+) -> np.ndarray:
+    """
+    Circular block bootstrap
+
+    :returns: length x number_of_resamples np.ndarray of row indices
+
+    >>> block_bootstrap_indices(5, 2, 2, np.random.default_rng(0)).shape
+    (5, 2)
+    """
+    block_length = max(1, min(int(block_length), length))
+    number_of_blocks = -(-length // block_length)
+    block_starts = random_generator.integers(
+        0, length, size=(number_of_blocks, number_of_resamples)
+    )
+    offsets = np.arange(block_length)[np.newaxis, :, np.newaxis]
+    indices = (block_starts[:, np.newaxis, :] + offsets) % length
+
+    return indices.reshape(number_of_blocks * block_length, number_of_resamples)[
+        :length
+    ]
+
+
+def default_block_length(length: int) -> int:
+    return max(1, int(round(length ** (1.0 / 3.0))))
+
+
+def bootstrapped_stats_for_task(
+    values: np.ndarray,
+    returns_scalar: float,
+    stat_names: list,
+    number_of_resamples: int,
+    block_length: int,
+    seed: list,
+) -> dict:
+    """
+    Module level so it can be sent to a process pool
+
+    :returns: dict, stat name -> np.ndarray with a value per resample
+    """
+    random_generator = np.random.default_rng(seed)
+    indices = block_bootstrap_indices(
+        len(values),
+        number_of_resamples=number_of_resamples,
+        block_length=block_length,
+        random_generator=random_generator,
+    )
+    stats = stats_for_each_column_of_array(
+        values[indices],
+        returns_scalar=returns_scalar,
+        with_quant_ratios=_needs_quant_ratios(stat_names),
+    )
+
+    return {stat_name: stats[stat_name] for stat_name in stat_names}
+
+
+def _tasks_for_curve(
+    values: np.ndarray,
+    returns_scalar: float,
+    stat_names: list,
+    number_of_resamples: int,
+    block_length: int,
+    seed: list,
+) -> list:
+    if len(values) == 0:
+        return []
+    if block_length is None:
+        block_length = default_block_length(len(values))
+
+    list_of_tasks = []
+    for task_number, first_resample in enumerate(
+        range(0, number_of_resamples, RESAMPLES_PER_TASK)
+    ):
+        list_of_tasks.append(
+            (
+                values,
+                returns_scalar,
+                stat_names,
+                min(RESAMPLES_PER_TASK, number_of_resamples - first_resample),
+                block_length,
+                seed + [task_number],
+            )
+        )
+
+    return list_of_tasks
+
+
+def _hash_of_values(values: np.ndarray) -> int:
+    # the same for the same returns, in any process; NaN written one way
+    canonical_values = np.where(np.isnan(values), np.nan, values).astype("<f8")
+    digest = hashlib.sha256(canonical_values.tobytes()).digest()
+
+    return int.from_bytes(digest[:8], "little")
+
+
+def _run_tasks(list_of_tasks: list, max_workers: int = None) -> list:
+    if max_workers is None or int(max_workers) <= 1 or len(list_of_tasks) <= 1:
+        return [bootstrapped_stats_for_task(*task) for task in list_of_tasks]
+
+    with get_pool_executor(PROCESS_EXECUTOR, max_workers=int(max_workers)) as executor:
+        return list(executor.map(bootstrapped_stats_for_task, *zip(*list_of_tasks)))
+
+
+def _intervals_given_bootstrapped_stats(
+    values: np.ndarray,
+    bootstrapped_stats: list,
+    returns_scalar: float,
+    stat_names: list,
+    confidence: float,
+) -> pd.DataFrame:
+    estimates = stats_for_each_column_of_array(
+        values[:, np.newaxis],
+        returns_scalar=returns_scalar,
+        with_quant_ratios=_needs_quant_ratios(stat_names),
+    )
+    quantiles = [(1.0 - confidence) / 2.0, (1.0 + confidence) / 2.0]
+
+    intervals = []
+    for stat_name in stat_names:
+        if len(bootstrapped_stats) == 0:
+            lower, upper = np.nan, np.nan
+        else:
+            all_resamples = np.concatenate(
+                [stats[stat_name] for stats in bootstrapped_stats]
+            )
+            lower, upper = _nanquantile_or_nan(all_resamples, quantiles)
+        intervals.append([float(estimates[stat_name][0]), lower, upper])
+
+    return pd.DataFrame(intervals, index=stat_names, columns=INTERVAL_COLUMNS)
+
+
+def _nanquantile_or_nan(values: np.ndarray, quantiles: list) -> tuple:
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return np.nan, np.nan
+
+    lower, upper = np.quantile(values, quantiles)
+
+    return float(lower), float(upper)
+
+
+def _needs_quant_ratios(stat_names: list) -> bool:
+    return any("quant_ratio" in stat_name for stat_name in stat_names)
+
+
+def _check_stat_names(stat_names: list):
+    unknown_stat_names = [
+        stat_name for stat_name in stat_names if stat_name not in COLUMN_STATS_LIST
+    ]
+    if len(unknown_stat_names) > 0:
+        raise Exception(
+            "Statistics %s not recognised, must be in %s"
+            % (str(unknown_stat_names), str(COLUMN_STATS_LIST))
+        )
@@ -0,0 +1,467 @@
+"""
+Statistics for an account curve from a single pass over its values
+
+accountCurve methods like sharpe() and worst_drawdown() used to rebuild the
+cumulated curve, drawdown, gains and losses each time they were called.
+curveStatistics extracts the values once and memoises those intermediates,
+so asking for every statistic costs little more than asking for one.
+
+stats_for_each_column does the same for a TxN array of curves, a column at
+a time in numpy, for groups of account curves.
+"""
+
+import warnings
+from dataclasses import dataclass, fields
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm, skew, t, ttest_1samp
+
+QUANT_PERCENTILE_EXTREME = 0.01
+QUANT_PERCENTILE_STD = 0.3
+NORMAL_DISTR_RATIO = norm.ppf(QUANT_PERCENTILE_EXTREME) / norm.ppf(QUANT_PERCENTILE_STD)
+
+STATS_LIST = [
+    "min",
+    "max",
+    "median",
+    "mean",
+    "std",
+    "skew",
+    "ann_mean",
+    "ann_std",
+    "sharpe",
+    "sortino",
+    "avg_drawdown",
+    "time_in_drawdown",
+    "calmar",
+    "avg_return_to_drawdown",
+    "avg_loss",
+    "avg_gain",
+    "gaintolossratio",
+    "profitfactor",
+    "hitrate",
+    "t_stat",
+    "p_value",
+]
+
+
+@dataclass(frozen=True)
+class statsBundle:
+    min: float
+    max: float
+    median: float
+    mean: float
+    std: float
+    skew: float
+    ann_mean: float
+    ann_std: float
+    sharpe: float
+    sortino: float
+    avg_drawdown: float
+    worst_drawdown: float
+    time_in_drawdown: float
+    calmar: float
+    avg_return_to_drawdown: float
+    avg_loss: float
+    avg_gain: float
+    gaintolossratio: float
+    profitfactor: float
+    hitrate: float
+    t_stat: float
+    p_value: float
+
+    def as_dict(self) -> dict:
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
+    def as_list_of_formatted_stats(self) -> list:
+        """
+        :returns: list of (stat name, str) in the order of STATS_LIST
+        """
+        return [
+            (stat_name, "{0:.4g}".format(getattr(self, stat_name)))
+            for stat_name in STATS_LIST
+        ]
+
+
+class curveStatistics(object):
+    """
+    Every accountCurve statistic from one array of returns
+
+    :param values: returns, can have NaN
+    :param returns_scalar: periods per year of the returns
+
+    >>> stats = curveStatistics(np.array([1.0, np.nan, -2.0, 3.0]), returns_scalar=4.0)
+    >>> stats.ann_mean(), stats.worst_drawdown(), stats.hitrate()
+    (2.0, -2.0, 0.6666666666666666)
+    """
+
+    def __init__(self, values: np.ndarray, returns_scalar: float):
+        self._values = np.asarray(values, dtype=float)
+        self._returns_scalar = returns_scalar
+
+    def bundle(self) -> statsBundle:
+        return statsBundle(
+            **{
+                stat_name: getattr(self, stat_name)()
+                for stat_name in statsBundle.__dataclass_fields__
+            }
+        )
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values
+
+    @property
+    def vol_scalar(self) -> float:
+        return self._returns_scalar**0.5
+
+    @property
+    def number_of_years_in_data(self) -> float:
+        return len(self.values) / self._returns_scalar
+
+    ## memoised intermediates
+    @property
+    def has_value(self) -> np.ndarray:
+        return self._memoised("_has_value", lambda: ~np.isnan(self.values))
+
+    @property
+    def zero_filled(self) -> np.ndarray:
+        return self._memoised(
+            "_zero_filled", lambda: np.where(self.has_value, self.values, 0.0)
+        )
+
+    @property
+    def count(self) -> int:
+        return self._memoised("_count", lambda: int(self.has_value.sum()))
+
+    @property
+    def vals(self) -> np.ndarray:
+        return self._memoised("_vals", lambda: self.values[self.has_value])
+
+    @property
+    def losses(self) -> np.ndarray:
+        return self._memoised("_losses", lambda: self.vals[self.vals < 0])
+
+    @property
+    def gains(self) -> np.ndarray:
+        return self._memoised("_gains", lambda: self.vals[self.vals > 0])
+
+    @property
+    def curve(self) -> np.ndarray:
+        # as cumsum().ffill(): NaN only before the first value
+        return self._memoised("_curve", self._calculate_curve)
+
+    @property
+    def drawdown(self) -> np.ndarray:
+        return self._memoised("_drawdown", self._calculate_drawdown)
+
+    @property
+    def valid_drawdown(self) -> np.ndarray:
+        return self._memoised(
+            "_valid_drawdown", lambda: self.drawdown[~np.isnan(self.drawdown)]
+        )
+
+    @property
+    def t_test(self):
+        return self._memoised("_t_test", lambda: ttest_1samp(self.vals, 0.0))
+
+    ## statistics
+    def min(self) -> float:
+        return self._nan_if_empty(np.nanmin)
+
+    def max(self) -> float:
+        return self._nan_if_empty(np.nanmax)
+
+    def median(self) -> float:
+        return self._nan_if_empty(np.median, self.vals)
+
+    def mean(self) -> float:
+        return self._memoised("_mean", self._calculate_mean)
+
+    def std(self) -> float:
+        return self._memoised("_std", self._calculate_std)
+
+    def skew(self) -> float:
+        return float(skew(self.vals))
+
+    def ann_mean(self) -> float:
+        ## If nans, then mean will be biased upwards
+        return self._memoised(
+            "_ann_mean",
+            lambda: float(self.zero_filled.sum() / self.number_of_years_in_data),
+        )
+
+    def ann_std(self) -> float:
+        return self.std() * self.vol_scalar
+
+    def sharpe(self) -> float:
+        return _divide(self.ann_mean(), self.ann_std())
+
+    def sortino(self) -> float:
+        ann_stdev = np.std(self.losses) * self.vol_scalar
+
+        return _divide(self.ann_mean(), ann_stdev)
+
+    def avg_drawdown(self) -> float:
+        return self._nan_if_empty(np.mean, self.valid_drawdown)
+
+    def worst_drawdown(self) -> float:
+        return self._nan_if_empty(np.min, self.valid_drawdown)
+
+    def time_in_drawdown(self) -> float:
+        valid_drawdown = self.valid_drawdown
+
+        return _divide(
+            float(np.count_nonzero(valid_drawdown < 0)), float(len(valid_drawdown))
+        )
+
+    def calmar(self) -> float:
+        return _divide(self.ann_mean(), -self.worst_drawdown())
+
+    def avg_return_to_drawdown(self) -> float:
+        return _divide(self.ann_mean(), -self.avg_drawdown())
+
+    def avg_loss(self) -> float:
+        return self._nan_if_empty(np.mean, self.losses)
+
+    def avg_gain(self) -> float:
+        return self._nan_if_empty(np.mean, self.gains)
+
+    def gaintolossratio(self) -> float:
+        return _divide(self.avg_gain(), -self.avg_loss())
+
+    def profitfactor(self) -> float:
+        return _divide(np.sum(self.gains), -np.sum(self.losses))
+
+    def hitrate(self) -> float:
+        no_gains = float(len(self.gains))
+        no_losses = float(len(self.losses))
+        if (no_losses + no_gains) == 0.0:
+            return 0.0
+
+        return no_gains / (no_losses + no_gains)
+
+    def t_stat(self) -> float:
+        return float(self.t_test[0])
+
+    def p_value(self) -> float:
+        return float(self.t_test[1])
+
+    def _calculate_mean(self) -> float:
+        # as pandas: the sum with missing values as zero, over the count
+        if self.count == 0:
+            return np.nan
+
+        return float(self.zero_filled.sum() / self.count)
+
+    def _calculate_std(self) -> float:
+        # as pandas, ddof=1
+        if self.count < 2:
+            return np.nan
+        squared_deviations = np.where(
+            self.has_value, (self.values - self._calculate_mean()) ** 2, 0.0
+        )
+
+        return float(np.sqrt(squared_deviations.sum() / (self.count - 1)))
+
+    def _calculate_curve(self) -> np.ndarray:
+        curve = np.cumsum(self.zero_filled)
+        if self.count < len(curve):
+            before_first_value = np.cumsum(self.has_value) == 0
+            curve[before_first_value] = np.nan
+
+        return curve
+
+    def _calculate_drawdown(self) -> np.ndarray:
+        curve = self.curve
+        # fmax ignores the NaN before the first value
+        return curve - np.fmax.accumulate(curve)
+
+    def _nan_if_empty(self, func, values: np.ndarray = None) -> float:
+        if values is None:
+            values = self.vals
+        if len(values) == 0:
+            return np.nan
+
+        return float(func(values))
+
+    def _memoised(self, attr_name: str, calculate):
+        value = getattr(self, attr_name, None)
+        if value is None:
+            value = calculate()
+            setattr(self, attr_name, value)
+
+        return value
+
+
+def _divide(numerator: float, denominator: float) -> float:
+    # float division by zero gives inf or nan, as numpy does, not an exception
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return float(np.float64(numerator) / np.float64(denominator))
+
+
+COLUMN_STATS_LIST = list(statsBundle.__dataclass_fields__) + [
+    "quant_ratio_lower",
+    "quant_ratio_upper",
+    "average_quant_ratio",
+]
+
+
+def stats_for_each_column(
+    returns: pd.DataFrame, returns_scalar: float, in_curve: pd.DataFrame = None
+) -> pd.DataFrame:
+    """
+    curveStatistics for every column at once, plus the quantile ratios
+
+    :param returns: TxN returns, a column per curve, can have NaN
+    :param returns_scalar: periods per year of the returns
+    :param in_curve: TxN bool, True for rows in each curve's own index, if
+        the curves were aligned onto a union of their indices. Rows that
+        aren't in a curve don't count towards its length or drawdowns
+
+    :returns: pd.DataFrame, a row per column of returns, a column per stat
+    """
+    if in_curve is not None:
+        in_curve = in_curve.reindex_like(returns).eq(True).to_numpy()
+
+    stats = stats_for_each_column_of_array(
+        returns.to_numpy(dtype=float), returns_scalar=returns_scalar, in_curve=in_curve
+    )
+
+    return pd.DataFrame(stats, index=returns.columns)[COLUMN_STATS_LIST]
+
+
+def stats_for_each_column_of_array(
+    values: np.ndarray,
+    returns_scalar: float,
+    in_curve: np.ndarray = None,
+    with_quant_ratios: bool = True,
+) -> dict:
+    """
+    As stats_for_each_column, for a TxN np.ndarray
+
+    :param with_quant_ratios: include the quantile ratios; False leaves them
+        out, as they are the slowest to work out
+
+    :returns: dict, stat name -> np.ndarray with a value per column
+    """
+    if in_curve is None:
+        in_curve = np.ones(values.shape, dtype=bool)
+
+    with np.errstate(divide="ignore", invalid="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        stats = _stats_for_each_column_of_array(
+            values, returns_scalar=returns_scalar, in_curve=in_curve
+        )
+        if with_quant_ratios:
+            stats.update(_quant_ratios_for_each_column(values))
+
+    return stats
+
+
+def _stats_for_each_column_of_array(
+    values: np.ndarray, returns_scalar: float, in_curve: np.ndarray
+) -> dict:
+    has_value = ~np.isnan(values)
+    zero_filled = np.where(has_value, values, 0.0)
+    count = has_value.sum(axis=0)
+    length = in_curve.sum(axis=0)
+    vol_scalar = returns_scalar**0.5
+
+    stats = dict(
+        min=np.nanmin(values, axis=0),
+        max=np.nanmax(values, axis=0),
+        median=np.nanmedian(values, axis=0),
+    )
+
+    mean = zero_filled.sum(axis=0) / count
+    deviations = np.where(has_value, values - mean, 0.0)
+    sum_of_squares = (deviations**2).sum(axis=0)
+    std = np.where(count > 1, np.sqrt(sum_of_squares / (count - 1)), np.nan)
+    stats.update(mean=mean, std=std)
+
+    second_moment = sum_of_squares / count
+    third_moment = (deviations**3).sum(axis=0) / count
+    no_variance = second_moment <= (np.finfo(float).eps * mean) ** 2
+    stats["skew"] = np.where(no_variance, np.nan, third_moment / second_moment**1.5)
+
+    ann_mean = zero_filled.sum(axis=0) / (length / returns_scalar)
+    ann_std = std * vol_scalar
+    stats.update(ann_mean=ann_mean, ann_std=ann_std, sharpe=ann_mean / ann_std)
+
+    is_loss = has_value & (values < 0)
+    is_gain = has_value & (values > 0)
+    number_of_losses = is_loss.sum(axis=0)
+    number_of_gains = is_gain.sum(axis=0)
+    sum_of_losses = np.where(is_loss, values, 0.0).sum(axis=0)
+    sum_of_gains = np.where(is_gain, values, 0.0).sum(axis=0)
+    avg_loss = sum_of_losses / number_of_losses
+    avg_gain = sum_of_gains / number_of_gains
+    loss_stdev = np.sqrt(
+        (np.where(is_loss, values - avg_loss, 0.0) ** 2).sum(axis=0) / number_of_losses
+    )
+    number_of_gains_and_losses = number_of_gains + number_of_losses
+    stats.update(
+        sortino=ann_mean / (loss_stdev * vol_scalar),
+        avg_loss=avg_loss,
+        avg_gain=avg_gain,
+        gaintolossratio=avg_gain / -avg_loss,
+        profitfactor=sum_of_gains / -sum_of_losses,
+        hitrate=np.where(
+            number_of_gains_and_losses == 0,
+            0.0,
+            number_of_gains / number_of_gains_and_losses,
+        ),
+    )
+
+    curve = np.cumsum(zero_filled, axis=0)
+    curve[np.cumsum(has_value, axis=0) == 0] = np.nan
+    drawdown = curve - np.fmax.accumulate(curve, axis=0)
+    valid_drawdown = in_curve & ~np.isnan(drawdown)
+    number_of_drawdowns = valid_drawdown.sum(axis=0)
+    avg_drawdown = np.where(valid_drawdown, drawdown, 0.0).sum(axis=0) / np.where(
+        number_of_drawdowns > 0, number_of_drawdowns, np.nan
+    )
+    worst_drawdown = np.where(
+        number_of_drawdowns > 0,
+        np.where(valid_drawdown, drawdown, np.inf).min(axis=0),
+        np.nan,
+    )
+    stats.update(
+        avg_drawdown=avg_drawdown,
+        worst_drawdown=worst_drawdown,
+        time_in_drawdown=(valid_drawdown & (drawdown < 0)).sum(axis=0)
+        / number_of_drawdowns,
+        calmar=ann_mean / -worst_drawdown,
+        avg_return_to_drawdown=ann_mean / -avg_drawdown,
+    )
+
+    t_stat = mean / (std / np.sqrt(count))
+    stats.update(t_stat=t_stat, p_value=2 * t.sf(np.abs(t_stat), count - 1))
+
+    return stats
+
+
+def _quant_ratios_for_each_column(values: np.ndarray) -> dict:
+    # as quant_ratio_lower_curve and quant_ratio_upper_curve
+    no_zeros = np.where(values != 0, values, np.nan)
+    demeaned = no_zeros - np.nanmean(no_zeros, axis=0)
+    quantiles = np.nanquantile(
+        demeaned,
+        [
+            QUANT_PERCENTILE_EXTREME,
+            QUANT_PERCENTILE_STD,
+            1 - QUANT_PERCENTILE_EXTREME,
+            1 - QUANT_PERCENTILE_STD,
+        ],
+        axis=0,
+    )
+    quant_ratio_lower = quantiles[0] / quantiles[1] / NORMAL_DISTR_RATIO
+    quant_ratio_upper = quantiles[2] / quantiles[3] / NORMAL_DISTR_RATIO
+
+    return dict(
+        quant_ratio_lower=quant_ratio_lower,
+        quant_ratio_upper=quant_ratio_upper,
+        average_quant_ratio=(quant_ratio_lower + quant_ratio_upper) / 2.0,
+    )
@@ -5,6 +5,7 @@ import numpy as np
 from quantlib_st.core.dateutils import Frequency
 from quantlib_st.core.constants import arg_not_supplied
 from quantlib_st.systems.accounts.curves.account_curve import accountCurve
+from quantlib_st.systems.accounts.curves.curve_stats import COLUMN_STATS_LIST
 from quantlib_st.systems.accounts.pandl_calculators.pandl_generic_costs import (
     GROSS_CURVE,
     NET_CURVE,
@@ -12,7 +13,7 @@ from quantlib_st.systems.accounts.pandl_calculators.pandl_generic_costs import (
 )
 
 
-def _from_freq_str_to_frequency(freq_str):
+def from_freq_str_to_frequency(freq_str):
     LOOKUP_DICT = dict(
         daily=Frequency.BDay,
         weekly=Frequency.Week,
@@ -23,7 +24,7 @@ def _from_freq_str_to_frequency(freq_str):
     return LOOKUP_DICT[freq_str]
 
 
-def _from_curve_str_to_curve_type(curve_type_str):
+def from_curve_str_to_curve_type(curve_type_str):
     LOOKUP_DICT = dict(gross=GROSS_CURVE, net=NET_CURVE, costs=COSTS_CURVE)
 
     return LOOKUP_DICT[curve_type_str]
@@ -116,6 +117,15 @@ class statsDict(dict):
     ):
         if account_curve_group is arg_not_supplied:
             account_curve_group = self.account_curve_group
+        if item is arg_not_supplied:
+            item = self.item
+
+        if item in COLUMN_STATS_LIST:
+            ## every asset at once
+            stats_for_each_asset = account_curve_group.stats_for_each_asset(
+                curve_type=curve_type_str, freq=freq_str, percent=is_percentage
+            )
+            return stats_for_each_asset[item].to_dict()
 
         dict_of_results_by_stat = dict(
             [
@@ -171,8 +181,8 @@ class statsDict(dict):
         if account_curve_group is arg_not_supplied:
             account_curve_group = self.account_curve_group
 
-        frequency = _from_freq_str_to_frequency(freq_str)
-        curve_type = _from_curve_str_to_curve_type(curve_type_str)
+        frequency = from_freq_str_to_frequency(freq_str)
+        curve_type = from_curve_str_to_curve_type(curve_type_str)
 
         account_curve = accountCurve(
             account_curve_group.get_pandl_calculator_for_item(asset_name),
@@ -224,14 +234,12 @@ class statsDict(dict):
         return ttest_1samp(results_values, 0.0).pvalue
 
     def _time_weights(self) -> dict:
+        length_in_months_for_each_asset = (
+            self.account_curve_group.length_in_months_for_each_asset()
+        )
         dict_of_time_lengths = dict(
             [
-                (
-                    asset_name,
-                    self.account_curve_for_asset(
-                        asset_name=asset_name
-                    ).length_in_months,
-                )
+                (asset_name, length_in_months_for_each_asset[asset_name])
                 for asset_name in self.keys()
             ]
         )
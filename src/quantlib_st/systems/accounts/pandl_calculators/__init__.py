@@ -12,6 +12,9 @@ from quantlib_st.systems.accounts.pandl_calculators.pandl_generic_costs import (
 from quantlib_st.systems.accounts.pandl_calculators.pandl_SR_cost import (
     pandlCalculationWithSRCosts,
 )
+from quantlib_st.systems.accounts.pandl_calculators.pandl_panel import (
+    pandlCalculationPanel,
+)
 
 __all__ = [
     "pandlCalculation",
@@ -22,4 +25,5 @@ __all__ = [
     "NET_CURVE",
     "pandlCalculationWithGenericCosts",
     "pandlCalculationWithSRCosts",
+    "pandlCalculationPanel",
 ]
@@ -10,6 +10,7 @@ from quantlib_st.systems.accounts.pandl_calculators.pandl_generic_costs import (
 )
 from quantlib_st.systems.accounts.pandl_calculators.pandl_calculation import (
     apply_weighting,
+    memoised_series,
 )
 
 
@@ -45,6 +46,7 @@ class pandlCalculationWithSRCosts(pandlCalculationWithGenericCosts):
             delayfill=self.delayfill,
         )
 
+    @memoised_series
     def costs_pandl_in_points(self) -> pd.Series:
         SR_cost_as_annualised_figure = self.SR_cost_as_annualised_figure_points()
 
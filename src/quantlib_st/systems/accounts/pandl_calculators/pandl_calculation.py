@@ -1,3 +1,5 @@
+from functools import wraps
+
 import pandas as pd
 
 from quantlib_st.core.dateutils import (
@@ -5,6 +7,33 @@ from quantlib_st.core.dateutils import (
     DAILY_PRICE_FREQ,
     from_config_frequency_pandas_resample,
 )
+from quantlib_st.core.pandas.frequency import (
+    sum_over_periods,
+    sum_within_calendar_days,
+)
+
+
+def memoised_series(method):
+    """
+    Keep what method returns on the calculator, so the gross, net, costs and
+    percentage curves, at any frequency, share their intermediate series.
+
+    Callers mustn't change what they get back in place. weight() returns a
+    new calculator, which starts with nothing kept.
+    """
+    method_name = method.__name__
+
+    @wraps(method)
+    def _method_with_memo(self):
+        memoised = getattr(self, "_memoised_series", None)
+        if memoised is None:
+            self._memoised_series = memoised = {}
+        if method_name not in memoised:
+            memoised[method_name] = method(self)
+
+        return memoised[method_name]
+
+    return _method_with_memo
 
 
 class pandlCalculation:
@@ -66,14 +95,34 @@ class pandlCalculation:
     def as_pd_series_for_frequency(
         self, frequency: Frequency = DAILY_PRICE_FREQ, **kwargs
     ) -> pd.Series:
-        as_pd_series = self.as_pd_series(**kwargs)
-
-        as_pd_series.index = pd.to_datetime(as_pd_series.index)
-
-        resample_freq = from_config_frequency_pandas_resample(frequency)
-        pd_series_at_frequency = as_pd_series.resample(resample_freq).sum()
-
-        return pd_series_at_frequency
+        # kept for each frequency, and summed from the calendar day sums, so
+        # every frequency and curve type costs one P&L calculation
+        key = (frequency, tuple(sorted(kwargs.items())))
+        pd_series_by_frequency = getattr(self, "_pd_series_by_frequency", None)
+        if pd_series_by_frequency is None:
+            self._pd_series_by_frequency = pd_series_by_frequency = {}
+
+        pd_series_at_frequency = pd_series_by_frequency.get(key, None)
+        if pd_series_at_frequency is None:
+            calendar_day_sums = self._calendar_day_sums(**kwargs)
+            pd_series_at_frequency = sum_over_periods(calendar_day_sums, frequency)
+            pd_series_by_frequency[key] = pd_series_at_frequency
+
+        # a copy, since account curves are built on it and may be changed
+        return pd_series_at_frequency.copy()
+
+    def _calendar_day_sums(self, **kwargs) -> pd.Series:
+        key = tuple(sorted(kwargs.items()))
+        calendar_day_sums_by_key = getattr(self, "_calendar_day_sums_by_key", None)
+        if calendar_day_sums_by_key is None:
+            self._calendar_day_sums_by_key = calendar_day_sums_by_key = {}
+
+        calendar_day_sums = calendar_day_sums_by_key.get(key, None)
+        if calendar_day_sums is None:
+            calendar_day_sums = sum_within_calendar_days(self.as_pd_series(**kwargs))
+            calendar_day_sums_by_key[key] = calendar_day_sums
+
+        return calendar_day_sums
 
     def as_pd_series(self, percent: bool = False):
         if percent:
@@ -81,6 +130,7 @@ class pandlCalculation:
         else:
             return self.pandl_in_base_currency()
 
+    @memoised_series
     def percentage_pandl(self) -> pd.Series:
         pandl_in_base = self.pandl_in_base_currency()
 
@@ -99,6 +149,7 @@ class pandlCalculation:
 
         return 100.0 * pandl_in_base / capital_aligned
 
+    @memoised_series
     def pandl_in_base_currency(self) -> pd.Series:
         pandl_in_ccy = self.pandl_in_instrument_currency()
         pandl_in_base = self._base_pandl_given_currency_pandl(pandl_in_ccy)
@@ -111,6 +162,7 @@ class pandlCalculation:
 
         return pandl_in_ccy * fx_aligned
 
+    @memoised_series
     def pandl_in_instrument_currency(self) -> pd.Series:
         pandl_in_points = self.pandl_in_points()
         pandl_in_ccy = self._pandl_in_instrument_ccy_given_points_pandl(pandl_in_points)
@@ -124,6 +176,7 @@ class pandlCalculation:
 
         return pandl_in_points * point_size
 
+    @memoised_series
     def pandl_in_points(self) -> pd.Series:
         if self.positions is None:
             raise ValueError("Positions are required to compute P&L")
@@ -145,6 +198,7 @@ class pandlCalculation:
         return len(positions_no_nans.index)
 
     @property
+    @memoised_series
     def positions(self) -> pd.Series | None:
         positions = self._get_passed_positions()
         if positions is None:
@@ -195,6 +249,7 @@ class pandlCalculation:
         return diagnostic_df
 
     @property
+    @memoised_series
     def fx(self) -> pd.Series:
         fx = self._fx
         if fx is None:
@@ -204,6 +259,7 @@ class pandlCalculation:
         return fx
 
     @property
+    @memoised_series
     def capital(self) -> pd.Series:
         capital = self._capital
         if capital is None:
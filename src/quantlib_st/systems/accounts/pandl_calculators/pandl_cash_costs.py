@@ -2,14 +2,15 @@ import datetime
 import numpy as np
 import pandas as pd
 
-from quantlib_st.core.pandas.find_data import get_row_of_series_before_date
 from quantlib_st.core.pandas.strategy_functions import (
     calculate_cost_deflator,
     years_in_data,
 )
 from quantlib_st.core.dateutils import generate_equal_dates_within_year
-from quantlib_st.core.genutils import flatten_list
 
+from quantlib_st.systems.accounts.pandl_calculators.pandl_calculation import (
+    memoised_series,
+)
 from quantlib_st.systems.accounts.pandl_calculators.pandl_generic_costs import (
     pandlCalculationWithGenericCosts,
 )
@@ -18,7 +19,7 @@ from quantlib_st.systems.accounts.pandl_calculators.pandl_using_fills import (
 )
 
 from quantlib_st.objects.instruments import instrumentCosts
-from quantlib_st.objects.fills import Fill
+from quantlib_st.objects.fills import Fill, ListOfFills
 
 
 class pandlCalculationWithCashCostsAndFills(  # type: ignore
@@ -50,6 +51,7 @@ class pandlCalculationWithCashCostsAndFills(  # type: ignore
 
         return calculations_df
 
+    @memoised_series
     def costs_pandl_in_points(self) -> pd.Series:
         ## We work backwards since the cost calculator returns a currency cost
         costs_pandl_in_instrument_currency = self.costs_pandl_in_instrument_currency()
@@ -60,6 +62,7 @@ class pandlCalculationWithCashCostsAndFills(  # type: ignore
 
         return costs_pandl_in_points
 
+    @memoised_series
     def costs_pandl_in_instrument_currency(self) -> pd.Series:
         costs_as_pd_series = self.costs_from_trading_in_instrument_currency_as_series()
         normalised_costs = self.normalise_costs_in_instrument_currency(
@@ -69,12 +72,12 @@ class pandlCalculationWithCashCostsAndFills(  # type: ignore
         return normalised_costs
 
     def costs_from_trading_in_instrument_currency_as_series(self) -> pd.Series:
-        instrument_currency_costs_as_list = (
-            self.costs_from_trading_in_instrument_currency_as_list()
+        instrument_currency_costs = (
+            self.costs_from_trading_in_instrument_currency_as_array()
         )
         date_index = self.date_index_for_all_fills()
         costs_as_pd_series = pd.Series(
-            instrument_currency_costs_as_list, date_index, dtype="float64"
+            instrument_currency_costs, date_index, dtype="float64"
         )
         costs_as_pd_series = costs_as_pd_series.sort_index()
         costs_as_pd_series = costs_as_pd_series.groupby(costs_as_pd_series.index).sum()
@@ -82,110 +85,45 @@ class pandlCalculationWithCashCostsAndFills(  # type: ignore
         return costs_as_pd_series
 
     def costs_from_trading_in_instrument_currency_as_list(self) -> list:
+        return list(self.costs_from_trading_in_instrument_currency_as_array())
+
+    def costs_from_trading_in_instrument_currency_as_array(self) -> np.ndarray:
         list_of_fills = self.list_of_all_fills()
 
-        instrument_currency_costs = [
-            -self.calculate_cost_instrument_currency_for_a_fill(fill)
-            for fill in list_of_fills
-        ]
+        instrument_currency_costs = -calculate_costs_from_fills_with_cost_object(
+            fills=list_of_fills,
+            value_per_point=self.value_per_point,
+            raw_costs=self.raw_costs,
+        )
 
         return instrument_currency_costs
 
-    def date_index_for_all_fills(self) -> list:
+    def date_index_for_all_fills(self) -> pd.DatetimeIndex:
         list_of_all_fills = self.list_of_all_fills()
-        date_index = [fill.date for fill in list_of_all_fills]
 
-        return date_index
+        return list_of_all_fills.date_index
 
-    def list_of_all_fills(self) -> list:
+    def list_of_all_fills(self) -> ListOfFills:
         list_of_holding_fills = self.pseudo_fills_from_holding
         list_of_trading_fills = self.fills
 
-        return list_of_trading_fills + list_of_holding_fills
+        return ListOfFills.concatenate([list_of_trading_fills, list_of_holding_fills])
 
     @property
-    def pseudo_fills_from_holding(self) -> list:
+    def pseudo_fills_from_holding(self) -> ListOfFills:
         pseudo_fills = getattr(self, "_pseudo_fills", None)
         if pseudo_fills is None:
             self._pseudo_fills = pseudo_fills = self._calculate_pseudo_fills()
 
         return pseudo_fills
 
-    def _calculate_pseudo_fills(self) -> list:
-        list_of_years_in_data = years_in_data(self.positions)
-        fills_by_year = [
-            self._pseudo_fills_for_year(year) for year in list_of_years_in_data
-        ]
-
-        fills_as_single_list = flatten_list(fills_by_year)
-
-        return fills_as_single_list
-
-    def _pseudo_fills_for_year(self, year: int) -> list:
-        rolls_per_year = self.rolls_per_year
-
-        if rolls_per_year == 0:
-            return []
-
-        date_list = generate_equal_dates_within_year(year, rolls_per_year)
-        average_holding_by_period = self._average_holdings_within_year(
-            year, rolls_per_year
+    def _calculate_pseudo_fills(self) -> ListOfFills:
+        return pseudo_fills_from_holding(
+            positions=self.positions,
+            price=self.price,
+            rolls_per_year=self.rolls_per_year,
+            multiply_roll_costs_by=self.multiply_roll_costs_by,
         )
-        price_series = self.price.ffill()
-        last_date_with_positions = self.last_date_with_positions
-        multiply_roll_costs_by = self.multiply_roll_costs_by
-
-        ## We multiply the quantity rather than the actual costs, as the later
-        ##   cost calculation doesn't distinguish between rolls and other trades
-
-        opening_fills_this_year = [
-            Fill(
-                date=date,
-                qty=qty * multiply_roll_costs_by,
-                price=get_row_of_series_before_date(price_series, date),
-                price_requires_slippage_adjustment=True,
-            )
-            for date, qty in zip(date_list, average_holding_by_period)
-            if date <= last_date_with_positions and abs(qty) > 0
-        ]
-
-        closing_fills_this_year = [
-            Fill(
-                date=fill.date,
-                qty=-fill.qty,
-                price=fill.price,
-            )
-            for fill in opening_fills_this_year
-        ]
-
-        fills_this_year = opening_fills_this_year + closing_fills_this_year
-
-        return fills_this_year
-
-    def _average_holdings_within_year(self, year: int, rolls_per_year: int) -> list:
-        first_date = generate_equal_dates_within_year(year - 1, rolls_per_year)[-1]
-        subsequent_dates = generate_equal_dates_within_year(year, rolls_per_year)
-        all_dates = [first_date] + subsequent_dates
-
-        list_of_average_holdings = []
-        for date_index in range(len(subsequent_dates)):
-            end_date = all_dates[date_index + 1]
-            previous_date = all_dates[date_index]
-            avg_holding = self._average_holding_for_period(previous_date, end_date)
-            list_of_average_holdings.append(avg_holding)
-
-        return list_of_average_holdings
-
-    def _average_holding_for_period(
-        self, previous_date: datetime.datetime, end_date: datetime.datetime
-    ):
-        positions = self.positions
-        positions_in_period = positions[previous_date:end_date]
-        avg_position = positions_in_period.abs().mean()
-        if np.isnan(avg_position):
-            return 0.0
-        else:
-            return avg_position
 
     @property
     def last_date_with_positions(self) -> datetime.datetime:
@@ -244,6 +182,110 @@ class pandlCalculationWithCashCostsAndFills(  # type: ignore
         return self._multiply_roll_costs_by
 
 
+def calculate_costs_from_fills_with_cost_object(
+    fills: ListOfFills, value_per_point: float, raw_costs: instrumentCosts
+) -> np.ndarray:
+    """
+    calculate_cost_from_fill_with_cost_object for every fill at once
+
+    :returns: np.ndarray of costs, aligned to fills
+    """
+    return raw_costs.calculate_cost_instrument_currency_for_arrays(
+        blocks_traded=fills.qty,
+        block_price_multiplier=value_per_point,
+        price=fills.price,
+        include_slippage=fills.price_requires_slippage_adjustment,
+    )
+
+
+def pseudo_fills_from_holding(
+    positions: pd.Series,
+    price: pd.Series,
+    rolls_per_year: int,
+    multiply_roll_costs_by: float = 1.0,
+) -> ListOfFills:
+    """
+    Pseudo trades for rolling: on each of rolls_per_year equally spaced dates
+    we close and reopen the average absolute position held since the
+    previous roll date. The opening leg pays slippage, the closing leg
+    doesn't. Each leg's quantity is multiplied by multiply_roll_costs_by.
+
+    :param positions: Tx1 pd.Series, sorted by date
+    :param price: Tx1 pd.Series; fills are at the last price before each roll
+
+    :returns: ListOfFills, opening then closing legs for each year in turn
+    """
+    if rolls_per_year == 0 or len(positions) == 0:
+        return ListOfFills()
+
+    roll_dates = []
+    previous_roll_dates = []
+    for year in years_in_data(positions):
+        roll_dates_this_year = generate_equal_dates_within_year(year, rolls_per_year)
+        last_roll_date_year_before = generate_equal_dates_within_year(
+            year - 1, rolls_per_year
+        )[-1]
+        roll_dates += roll_dates_this_year
+        previous_roll_dates += [last_roll_date_year_before] + roll_dates_this_year[:-1]
+
+    roll_dates = pd.DatetimeIndex(roll_dates)
+    previous_roll_dates = pd.DatetimeIndex(previous_roll_dates)
+
+    average_holdings = _average_abs_position_between_dates(
+        positions, start_dates=previous_roll_dates, end_dates=roll_dates
+    )
+
+    last_date_with_positions = positions.index[-1]
+    rolls_to_use = (roll_dates <= last_date_with_positions) & (
+        np.abs(average_holdings) > 0
+    )
+    roll_dates = roll_dates[rolls_to_use]
+    qty = average_holdings[rolls_to_use] * multiply_roll_costs_by
+    roll_prices = _values_before_dates(price.ffill(), roll_dates)
+
+    # opening then closing legs within each year, in date order
+    year_of_roll = np.tile(roll_dates.year.values, 2)
+    is_closing_leg = np.repeat([False, True], len(roll_dates))
+    order = np.lexsort((is_closing_leg, year_of_roll))
+
+    return ListOfFills.from_arrays(
+        dates=np.tile(roll_dates.values, 2)[order],
+        qty=np.concatenate([qty, -qty])[order],
+        price=np.tile(roll_prices, 2)[order],
+        price_requires_slippage_adjustment=~is_closing_leg[order],
+    )
+
+
+def _average_abs_position_between_dates(
+    positions: pd.Series, start_dates: pd.DatetimeIndex, end_dates: pd.DatetimeIndex
+) -> np.ndarray:
+    # mean of abs(positions)[start:end], inclusive, ignoring NaN; zero if empty
+    abs_positions = np.abs(positions.values.astype(float))
+    has_position = ~np.isnan(abs_positions)
+    cumulative_sum = np.concatenate(
+        [[0.0], np.cumsum(np.where(has_position, abs_positions, 0.0))]
+    )
+    cumulative_count = np.concatenate([[0], np.cumsum(has_position)])
+
+    first_rows = positions.index.searchsorted(start_dates, side="left")
+    end_rows = positions.index.searchsorted(end_dates, side="right")
+
+    total = cumulative_sum[end_rows] - cumulative_sum[first_rows]
+    count = cumulative_count[end_rows] - cumulative_count[first_rows]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        average = total / count
+
+    return np.where(count > 0, average, 0.0)
+
+
+def _values_before_dates(series: pd.Series, dates: pd.DatetimeIndex) -> np.ndarray:
+    # as get_row_of_series_before_date, NaN if there's nothing before the date
+    rows = series.index.searchsorted(dates, side="left") - 1
+    values = series.values.astype(float)[np.maximum(rows, 0)]
+
+    return np.where(rows >= 0, values, np.nan)
+
+
 def calculate_cost_from_fill_with_cost_object(
     fill: Fill, value_per_point: float, raw_costs: instrumentCosts
 ) -> float:
@@ -3,6 +3,7 @@ import pandas as pd
 from quantlib_st.systems.accounts.pandl_calculators.pandl_calculation import (
     pandlCalculation,
     apply_weighting,
+    memoised_series,
 )
 
 curve_types = ["gross", "net", "costs"]
@@ -50,6 +51,7 @@ class pandlCalculationWithGenericCosts(pandlCalculation):
                 % (curve_type, curve_types)
             )
 
+    @memoised_series
     def net_percentage_pandl(self) -> pd.Series:
         gross = self.percentage_pandl()
         costs = self.costs_percentage_pandl()
@@ -57,6 +59,7 @@ class pandlCalculationWithGenericCosts(pandlCalculation):
 
         return net
 
+    @memoised_series
     def net_pandl_in_base_currency(self) -> pd.Series:
         gross = self.pandl_in_base_currency()
         costs = self.costs_pandl_in_base_currency()
@@ -64,6 +67,7 @@ class pandlCalculationWithGenericCosts(pandlCalculation):
 
         return net
 
+    @memoised_series
     def net_pandl_in_instrument_currency(self) -> pd.Series:
         gross = self.pandl_in_instrument_currency()
         costs = self.costs_pandl_in_instrument_currency()
@@ -71,6 +75,7 @@ class pandlCalculationWithGenericCosts(pandlCalculation):
 
         return net
 
+    @memoised_series
     def net_pandl_in_points(self) -> pd.Series:
         gross = self.pandl_in_points()
         costs = self.costs_pandl_in_points()
@@ -78,18 +83,21 @@ class pandlCalculationWithGenericCosts(pandlCalculation):
 
         return net
 
+    @memoised_series
     def costs_percentage_pandl(self) -> pd.Series:
         costs_in_base = self.costs_pandl_in_base_currency()
         costs = self._percentage_pandl_given_pandl(costs_in_base)
 
         return costs
 
+    @memoised_series
     def costs_pandl_in_base_currency(self) -> pd.Series:
         costs_in_instr_ccy = self.costs_pandl_in_instrument_currency()
         costs_in_base = self._base_pandl_given_currency_pandl(costs_in_instr_ccy)
 
         return costs_in_base
 
+    @memoised_series
     def costs_pandl_in_instrument_currency(self) -> pd.Series:
         costs_in_points = self.costs_pandl_in_points()
         costs_in_instr_ccy = self._pandl_in_instrument_ccy_given_points_pandl(
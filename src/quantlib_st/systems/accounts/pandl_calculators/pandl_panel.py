@@ -0,0 +1,522 @@
+"""
+P&L for many instruments at once
+
+pandlCalculationPanel lines every instrument's prices, positions, FX and
+costs up on one index and works out points, currency, base currency and
+percentage P&L, and SR costs, for all of them in a few numpy operations.
+pandl_calculator_for_item gives a calculator for one instrument that reads
+from the panel, with the same values as a pandlCalculationWithSRCosts for
+that instrument alone.
+
+Each instrument keeps track of which rows of the shared index are its own
+(the union of its price and position dates), and its series only contain
+those rows.
+"""
+
+import numpy as np
+import pandas as pd
+
+from quantlib_st.core.dateutils import ROOT_BDAYS_INYEAR, SECONDS_IN_YEAR
+from quantlib_st.estimators.vol import robust_daily_vol_given_price
+from quantlib_st.systems.accounts.pandl_calculators.pandl_calculation import (
+    apply_weighting,
+    memoised_series,
+)
+from quantlib_st.systems.accounts.pandl_calculators.pandl_generic_costs import (
+    pandlCalculationWithGenericCosts,
+)
+from quantlib_st.systems.accounts.pandl_calculators.pandl_SR_cost import (
+    pandlCalculationWithSRCosts,
+)
+
+
+class pandlCalculationPanel(object):
+    def __init__(
+        self,
+        price: dict,
+        positions: dict,
+        SR_cost: dict,
+        average_position: dict,
+        fx: dict = None,
+        capital: pd.Series | float | int | None = None,
+        value_per_point: dict = None,
+        roundpositions: bool = False,
+        delayfill: bool = False,
+        daily_returns_volatility: dict = None,
+    ):
+        """
+        :param price: dict, instrument -> pd.Series of prices
+        :param positions: dict, instrument -> pd.Series of positions, before
+            any delay or rounding
+        :param SR_cost: dict, instrument -> annualised SR cost
+        :param average_position: dict, instrument -> pd.Series, for SR costs
+        :param fx: dict, instrument -> pd.Series of FX rates to base; default 1
+        :param capital: shared by every instrument, as for pandlCalculation
+        :param value_per_point: dict, instrument -> float; default 1
+        :param daily_returns_volatility: dict, instrument -> pd.Series, for SR
+            costs; default from the prices
+        """
+        instrument_list = list(price.keys())
+        if fx is None:
+            fx = {}
+        if value_per_point is None:
+            value_per_point = {}
+
+        self._instrument_list = instrument_list
+        self._price = price
+        self._fx = {
+            instrument_code: fx.get(
+                instrument_code,
+                pd.Series(1.0, index=price[instrument_code].index),
+            )
+            for instrument_code in instrument_list
+        }
+        self._capital = capital
+        self._value_per_point = {
+            instrument_code: value_per_point.get(instrument_code, 1.0)
+            for instrument_code in instrument_list
+        }
+        self._roundpositions = roundpositions
+        self._delayfill = delayfill
+        self._SR_cost = SR_cost
+        self._average_position = average_position
+        self._daily_returns_volatility = daily_returns_volatility
+
+        # positions are delayed and rounded once, here
+        self._positions = {
+            instrument_code: _process_positions(
+                positions[instrument_code],
+                delayfill=delayfill,
+                roundpositions=roundpositions,
+            )
+            for instrument_code in instrument_list
+        }
+
+        self._memo = {}
+
+    @property
+    def instrument_list(self) -> list:
+        return self._instrument_list
+
+    @property
+    def delayfill(self) -> bool:
+        return self._delayfill
+
+    @property
+    def roundpositions(self) -> bool:
+        return self._roundpositions
+
+    def pandl_calculator_for_item(
+        self, instrument_code: str
+    ) -> "pandlCalculationFromPanel":
+        return pandlCalculationFromPanel(self, instrument_code)
+
+    ## per instrument inputs
+    def price_for_item(self, instrument_code: str) -> pd.Series:
+        return self._price[instrument_code]
+
+    def positions_for_item(self, instrument_code: str) -> pd.Series:
+        return self._positions[instrument_code]
+
+    def fx_for_item(self, instrument_code: str) -> pd.Series:
+        return self._fx[instrument_code]
+
+    def value_per_point_for_item(self, instrument_code: str) -> float:
+        return self._value_per_point[instrument_code]
+
+    def SR_cost_for_item(self, instrument_code: str) -> float:
+        return self._SR_cost[instrument_code]
+
+    def average_position_for_item(self, instrument_code: str) -> pd.Series:
+        return self._average_position[instrument_code]
+
+    def daily_returns_volatility_for_item(self, instrument_code: str):
+        if self._daily_returns_volatility is None:
+            return None
+        return self._daily_returns_volatility.get(instrument_code, None)
+
+    @property
+    def capital(self):
+        return self._capital
+
+    ## per instrument outputs
+    def pandl_in_points_for_item(self, instrument_code: str) -> pd.Series:
+        return self._series_for_item("pandl_in_points", instrument_code)
+
+    def pandl_in_instrument_currency_for_item(self, instrument_code: str):
+        return self._series_for_item("pandl_in_instrument_currency", instrument_code)
+
+    def pandl_in_base_currency_for_item(self, instrument_code: str) -> pd.Series:
+        return self._series_for_item("pandl_in_base_currency", instrument_code)
+
+    def percentage_pandl_for_item(self, instrument_code: str) -> pd.Series:
+        return self._series_for_item("percentage_pandl", instrument_code)
+
+    def costs_pandl_in_points_for_item(self, instrument_code: str) -> pd.Series:
+        return self._series_for_item("costs_pandl_in_points", instrument_code)
+
+    def costs_pandl_in_instrument_currency_for_item(self, instrument_code: str):
+        return self._series_for_item(
+            "costs_pandl_in_instrument_currency", instrument_code
+        )
+
+    def costs_pandl_in_base_currency_for_item(self, instrument_code: str):
+        return self._series_for_item("costs_pandl_in_base_currency", instrument_code)
+
+    def costs_percentage_pandl_for_item(self, instrument_code: str) -> pd.Series:
+        return self._series_for_item("costs_percentage_pandl", instrument_code)
+
+    def _series_for_item(self, panel_name: str, instrument_code: str) -> pd.Series:
+        column = self.instrument_list.index(instrument_code)
+        if panel_name.startswith("costs"):
+            rows = self.in_price[:, column]
+        else:
+            rows = self.in_pandl[:, column]
+
+        values = getattr(self, panel_name)()[rows, column]
+
+        return pd.Series(values, index=self.index[rows])
+
+    ## TxN panels, on the shared index
+    def pandl_in_points(self) -> np.ndarray:
+        return self._memoised("pandl_in_points", self._calculate_pandl_in_points)
+
+    def pandl_in_instrument_currency(self) -> np.ndarray:
+        return self._memoised(
+            "pandl_in_instrument_currency",
+            lambda: self.pandl_in_points() * self.value_per_point_row,
+        )
+
+    def pandl_in_base_currency(self) -> np.ndarray:
+        return self._memoised(
+            "pandl_in_base_currency",
+            lambda: self.pandl_in_instrument_currency() * self.fx_panel,
+        )
+
+    def percentage_pandl(self) -> np.ndarray:
+        return self._memoised(
+            "percentage_pandl",
+            lambda: 100.0 * self.pandl_in_base_currency() / self.capital_panel,
+        )
+
+    def costs_pandl_in_points(self) -> np.ndarray:
+        return self._memoised(
+            "costs_pandl_in_points", self._calculate_costs_pandl_in_points
+        )
+
+    def costs_pandl_in_instrument_currency(self) -> np.ndarray:
+        return self._memoised(
+            "costs_pandl_in_instrument_currency",
+            lambda: self.costs_pandl_in_points() * self.value_per_point_row,
+        )
+
+    def costs_pandl_in_base_currency(self) -> np.ndarray:
+        return self._memoised(
+            "costs_pandl_in_base_currency",
+            lambda: self.costs_pandl_in_instrument_currency() * self.fx_panel,
+        )
+
+    def costs_percentage_pandl(self) -> np.ndarray:
+        return self._memoised(
+            "costs_percentage_pandl",
+            lambda: 100.0 * self.costs_pandl_in_base_currency() / self.capital_panel,
+        )
+
+    ## aligned inputs
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        return self._memoised("index", self._calculate_index)
+
+    @property
+    def in_price(self) -> np.ndarray:
+        return self._memoised("in_price", lambda: self._rows_in_index_of(self._price))
+
+    @property
+    def in_positions(self) -> np.ndarray:
+        return self._memoised(
+            "in_positions", lambda: self._rows_in_index_of(self._positions)
+        )
+
+    @property
+    def in_pandl(self) -> np.ndarray:
+        return self._memoised("in_pandl", lambda: self.in_price | self.in_positions)
+
+    @property
+    def price_panel(self) -> np.ndarray:
+        return self._memoised("price_panel", lambda: self._aligned(self._price))
+
+    @property
+    def positions_panel(self) -> np.ndarray:
+        return self._memoised(
+            "positions_panel",
+            lambda: self._aligned(
+                {
+                    instrument_code: positions.groupby(positions.index).last()
+                    for instrument_code, positions in self._positions.items()
+                }
+            ),
+        )
+
+    @property
+    def fx_panel(self) -> np.ndarray:
+        # as fx.reindex(pandl.index, method="ffill")
+        return self._memoised("fx_panel", lambda: self._reindexed_with_ffill(self._fx))
+
+    @property
+    def capital_panel(self) -> np.ndarray:
+        return self._memoised("capital_panel", self._calculate_capital_panel)
+
+    @property
+    def value_per_point_row(self) -> np.ndarray:
+        return np.array(
+            [
+                self._value_per_point[instrument_code]
+                for instrument_code in self.instrument_list
+            ],
+            dtype=float,
+        )
+
+    def _calculate_index(self) -> pd.DatetimeIndex:
+        all_indices = [series.index for series in self._price.values()] + [
+            series.index for series in self._positions.values()
+        ]
+        index = all_indices[0]
+        for other_index in all_indices[1:]:
+            index = index.union(other_index)
+
+        return pd.DatetimeIndex(index)
+
+    def _rows_in_index_of(self, dict_of_series: dict) -> np.ndarray:
+        return np.column_stack(
+            [
+                self.index.isin(dict_of_series[instrument_code].index)
+                for instrument_code in self.instrument_list
+            ]
+        )
+
+    def _aligned(self, dict_of_series: dict) -> np.ndarray:
+        return np.column_stack(
+            [
+                dict_of_series[instrument_code]
+                .reindex(self.index)
+                .to_numpy(dtype=float)
+                for instrument_code in self.instrument_list
+            ]
+        )
+
+    def _reindexed_with_ffill(self, dict_of_series: dict) -> np.ndarray:
+        return np.column_stack(
+            [
+                dict_of_series[instrument_code]
+                .reindex(self.index, method="ffill")
+                .to_numpy(dtype=float)
+                for instrument_code in self.instrument_list
+            ]
+        )
+
+    def _calculate_capital_panel(self) -> np.ndarray:
+        # as pandlCalculation.capital: a fixed capital is a series on the
+        # price index, so there's no capital before the first price
+        capital = self.capital
+        if capital is None:
+            capital = 1.0
+        if isinstance(capital, pd.Series):
+            capital_on_index = capital.reindex(self.index, method="ffill").to_numpy(
+                dtype=float
+            )
+            return np.tile(capital_on_index[:, np.newaxis], len(self.instrument_list))
+
+        after_first_price = np.cumsum(self.in_price, axis=0) > 0
+
+        return np.where(after_first_price, float(capital), np.nan)
+
+    def _calculate_pandl_in_points(self) -> np.ndarray:
+        # as calculate_pandl; rows which aren't an instrument's own carry its
+        # last price and position, so add nothing
+        prices = _ffill_array(self.price_panel)
+        positions = _ffill_array(self.positions_panel)
+
+        pandl = np.full(prices.shape, np.nan)
+        pandl[1:] = positions[:-1] * (prices[1:] - prices[:-1])
+        pandl[np.isnan(pandl)] = 0.0
+
+        return pandl
+
+    def _calculate_costs_pandl_in_points(self) -> np.ndarray:
+        # as calculate_SR_cost_per_period_of_position_data_match_price_index
+        SR_cost_as_annualised_figure = self._reindexed_with_ffill(
+            {
+                instrument_code: self._SR_cost_as_annualised_figure_points(
+                    instrument_code
+                )
+                for instrument_code in self.instrument_list
+            }
+        )
+        in_positions = self.in_positions
+        SR_cost_on_position_dates = _bfill_array(
+            np.where(in_positions, SR_cost_as_annualised_figure, np.nan)
+        )
+
+        position_held = in_positions & ~np.isnan(_ffill_array(self.positions_panel))
+        last_row_with_position_held = _last_row_where(position_held)
+        SR_cost_aligned_to_price = _values_at_rows(
+            SR_cost_on_position_dates, last_row_with_position_held
+        )
+
+        previous_price_row = _last_row_where(self.in_price, strictly_before=True)
+        seconds = self.index.values.astype("datetime64[ns]").astype(np.int64) / 1e9
+        seconds_since_previous_price = np.where(
+            previous_price_row >= 0,
+            seconds[:, np.newaxis] - seconds[np.maximum(previous_price_row, 0)],
+            np.nan,
+        )
+
+        costs = (
+            SR_cost_aligned_to_price * seconds_since_previous_price / SECONDS_IN_YEAR
+        )
+
+        return costs
+
+    def _SR_cost_as_annualised_figure_points(self, instrument_code: str) -> pd.Series:
+        # as pandlCalculationWithSRCosts.SR_cost_as_annualised_figure_points
+        daily_price_volatility = self.daily_returns_volatility_for_item(instrument_code)
+        if daily_price_volatility is None:
+            daily_price_volatility = robust_daily_vol_given_price(
+                self.price_for_item(instrument_code)
+            )
+        annualised_price_vol_points = daily_price_volatility * ROOT_BDAYS_INYEAR
+        average_position_aligned_to_vol = self.average_position_for_item(
+            instrument_code
+        ).reindex(annualised_price_vol_points.index, method="ffill")
+
+        return (
+            -self.SR_cost_for_item(instrument_code)
+            * average_position_aligned_to_vol
+            * annualised_price_vol_points
+        )
+
+    def _memoised(self, name: str, calculate):
+        value = self._memo.get(name, None)
+        if value is None:
+            value = calculate()
+            self._memo[name] = value
+
+        return value
+
+
+class pandlCalculationFromPanel(pandlCalculationWithGenericCosts):
+    """
+    One instrument's P&L, read from a pandlCalculationPanel
+    """
+
+    def __init__(self, panel: pandlCalculationPanel, instrument_code: str):
+        super().__init__(
+            panel.price_for_item(instrument_code),
+            positions=panel.positions_for_item(instrument_code),
+            fx=panel.fx_for_item(instrument_code),
+            capital=panel.capital,
+            value_per_point=panel.value_per_point_for_item(instrument_code),
+        )
+        self._panel = panel
+        self._instrument_code = instrument_code
+
+    def weight(self, weight: pd.Series):
+        ## as pandlCalculationWithSRCosts.weight
+        panel = self.panel
+        instrument_code = self.instrument_code
+
+        return pandlCalculationWithSRCosts(
+            positions=apply_weighting(weight, self.positions),
+            capital=apply_weighting(weight, self.capital),
+            average_position=apply_weighting(
+                weight, panel.average_position_for_item(instrument_code)
+            ),
+            price=self.price,
+            fx=self.fx,
+            SR_cost=panel.SR_cost_for_item(instrument_code),
+            daily_returns_volatility=panel.daily_returns_volatility_for_item(
+                instrument_code
+            ),
+            value_per_point=self.value_per_point,
+            roundpositions=panel.roundpositions,
+            delayfill=panel.delayfill,
+        )
+
+    @memoised_series
+    def pandl_in_points(self) -> pd.Series:
+        return self.panel.pandl_in_points_for_item(self.instrument_code)
+
+    @memoised_series
+    def pandl_in_instrument_currency(self) -> pd.Series:
+        return self.panel.pandl_in_instrument_currency_for_item(self.instrument_code)
+
+    @memoised_series
+    def pandl_in_base_currency(self) -> pd.Series:
+        return self.panel.pandl_in_base_currency_for_item(self.instrument_code)
+
+    @memoised_series
+    def percentage_pandl(self) -> pd.Series:
+        return self.panel.percentage_pandl_for_item(self.instrument_code)
+
+    @memoised_series
+    def costs_pandl_in_points(self) -> pd.Series:
+        return self.panel.costs_pandl_in_points_for_item(self.instrument_code)
+
+    @memoised_series
+    def costs_pandl_in_instrument_currency(self) -> pd.Series:
+        return self.panel.costs_pandl_in_instrument_currency_for_item(
+            self.instrument_code
+        )
+
+    @memoised_series
+    def costs_pandl_in_base_currency(self) -> pd.Series:
+        return self.panel.costs_pandl_in_base_currency_for_item(self.instrument_code)
+
+    @memoised_series
+    def costs_percentage_pandl(self) -> pd.Series:
+        return self.panel.costs_percentage_pandl_for_item(self.instrument_code)
+
+    @property
+    def panel(self) -> pandlCalculationPanel:
+        return self._panel
+
+    @property
+    def instrument_code(self) -> str:
+        return self._instrument_code
+
+
+def _process_positions(
+    positions: pd.Series, delayfill: bool, roundpositions: bool
+) -> pd.Series:
+    # as pandlCalculation._process_positions
+    if delayfill:
+        positions = positions.shift(1)
+    if roundpositions:
+        positions = positions.round()
+
+    return positions
+
+
+def _last_row_where(mask: np.ndarray, strictly_before: bool = False) -> np.ndarray:
+    # for each row and column, the last row at or before (or strictly before)
+    # where mask is True; -1 if there's none
+    rows = np.where(mask, np.arange(mask.shape[0])[:, np.newaxis], -1)
+    last_row = np.maximum.accumulate(rows, axis=0)
+    if strictly_before:
+        last_row = np.vstack([np.full((1, mask.shape[1]), -1), last_row[:-1]])
+
+    return last_row
+
+
+def _values_at_rows(values: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    gathered = np.take_along_axis(values, np.maximum(rows, 0), axis=0)
+
+    return np.where(rows >= 0, gathered, np.nan)
+
+
+def _ffill_array(values: np.ndarray) -> np.ndarray:
+    return _values_at_rows(values, _last_row_where(~np.isnan(values)))
+
+
+def _bfill_array(values: np.ndarray) -> np.ndarray:
+    return _ffill_array(values[::-1])[::-1]
@@ -5,6 +5,7 @@ from quantlib_st.core.constants import arg_not_supplied
 from quantlib_st.systems.accounts.pandl_calculators.pandl_calculation import (
     pandlCalculation,
     apply_weighting,
+    memoised_series,
 )
 
 from quantlib_st.objects.fills import ListOfFills
@@ -70,6 +71,7 @@ class pandlCalculationWithFills(pandlCalculation):
         return fills
 
     @property
+    @memoised_series
     def positions(self) -> pd.Series:
         positions = self._get_passed_positions()
         if positions is arg_not_supplied:
@@ -127,11 +129,9 @@ def unique_trades_df(trade_df: pd.DataFrame) -> pd.DataFrame:
 
 
 def infer_positions_from_fills(fills: ListOfFills) -> pd.Series:
-    date_index = [fill.date for fill in fills]
-    qty_trade = [fill.qty for fill in fills]
-    trade_series = pd.Series(qty_trade, index=date_index)
-    trade_series = trade_series.sort_index()
+    trade_series = fills.as_pd_df(copy=False).qty
     position_series = trade_series.cumsum()
+    position_series.name = None
 
     return position_series
 
@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantlib_st.systems.accounts.account_forecast import pandl_for_instrument_forecast
+from quantlib_st.systems.accounts.curves.account_curve_group import accountCurveGroup
+from quantlib_st.systems.accounts.curves.bootstrap import (
+    DEFAULT_BOOTSTRAP_STATS,
+    block_bootstrap_indices,
+    confidence_intervals_for_each_curve,
+)
+from quantlib_st.systems.accounts.curves.dict_of_account_curves import (
+    dictOfAccountCurves,
+)
+
+
+def _account_curve(seed: int, start: str = "2015-01-01", length: int = 700):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, periods=length, freq="B")
+    price = pd.Series(100 + np.cumsum(rng.normal(size=len(dates))), index=dates)
+    forecast = pd.Series(rng.normal(scale=10, size=len(dates)), index=dates)
+
+    return pandl_for_instrument_forecast(
+        forecast=forecast, price=price, capital=100000.0, value_per_point=10.0
+    )
+
+
+def test_block_bootstrap_indices_are_circular_blocks():
+    indices = block_bootstrap_indices(
+        length=10,
+        number_of_resamples=50,
+        block_length=3,
+        random_generator=np.random.default_rng(0),
+    )
+
+    assert indices.shape == (10, 50)
+    assert indices.min() >= 0 and indices.max() <= 9
+    # within each block of three, each index follows the one before
+    for block_start in range(0, 9, 3):
+        block = indices[block_start : block_start + 3]
+        assert (np.diff(block, axis=0) % 10 == 1).all()
+
+
+def test_confidence_intervals_are_repeatable_with_or_without_a_pool():
+    account_curve = _account_curve(1)
+
+    intervals = account_curve.confidence_intervals(number_of_resamples=300, seed=7)
+    intervals_again = account_curve.confidence_intervals(
+        number_of_resamples=300, seed=7
+    )
+    intervals_with_pool = account_curve.confidence_intervals(
+        number_of_resamples=300, seed=7, max_workers=2
+    )
+    intervals_other_seed = account_curve.confidence_intervals(
+        number_of_resamples=300, seed=8
+    )
+
+    pd.testing.assert_frame_equal(intervals, intervals_again)
+    pd.testing.assert_frame_equal(intervals, intervals_with_pool)
+    assert not intervals.equals(intervals_other_seed)
+
+    assert list(intervals.index) == DEFAULT_BOOTSTRAP_STATS
+    for stat_name in DEFAULT_BOOTSTRAP_STATS:
+        estimate = getattr(account_curve, stat_name)()
+        assert intervals.loc[stat_name, "estimate"] == pytest.approx(estimate)
+        assert intervals.loc[stat_name, "lower"] < estimate
+        assert intervals.loc[stat_name, "upper"] > estimate
+
+
+def test_wider_confidence_gives_wider_intervals():
+    values = _account_curve(2).as_ts.to_numpy()
+    intervals = confidence_intervals_for_each_curve(
+        dict(a=values),
+        returns_scalar=256,
+        stat_names=["sharpe", "average_quant_ratio"],
+        confidence=0.5,
+        seed=3,
+    ).loc["a"]
+    wider_intervals = confidence_intervals_for_each_curve(
+        dict(a=values),
+        returns_scalar=256,
+        stat_names=["sharpe", "average_quant_ratio"],
+        confidence=0.9,
+        seed=3,
+    ).loc["a"]
+
+    assert (wider_intervals.lower < intervals.lower).all()
+    assert (wider_intervals.upper > intervals.upper).all()
+
+
+def test_confidence_intervals_for_each_asset():
+    account_curve_group = accountCurveGroup(
+        dictOfAccountCurves(
+            dict(
+                a=_account_curve(3),
+                b=_account_curve(4, start="2016-03-01", length=500),
+            )
+        ),
+        capital=100000.0,
+    )
+
+    intervals = account_curve_group.confidence_intervals_for_each_asset(
+        number_of_resamples=200, stat_names=["sharpe", "skew"], seed=1
+    )
+    stats = account_curve_group.stats_for_each_asset()
+
+    assert list(intervals.index) == [
+        ("a", "sharpe"),
+        ("a", "skew"),
+        ("b", "sharpe"),
+        ("b", "skew"),
+    ]
+    for asset_name in ["a", "b"]:
+        for stat_name in ["sharpe", "skew"]:
+            assert intervals.loc[(asset_name, stat_name), "estimate"] == pytest.approx(
+                stats.loc[asset_name, stat_name]
+            )
+
+
+def test_intervals_for_a_curve_dont_depend_on_the_other_curves():
+    curves = dict(a=_account_curve(5), b=_account_curve(6))
+    account_curve_group = accountCurveGroup(
+        dictOfAccountCurves(curves), capital=100000.0
+    )
+    reordered_group = accountCurveGroup(
+        dictOfAccountCurves(dict(b=curves["b"], a=curves["a"])), capital=100000.0
+    )
+    kwargs = dict(number_of_resamples=200, stat_names=["sharpe", "skew"], seed=2)
+
+    intervals = account_curve_group.confidence_intervals_for_each_asset(**kwargs)
+    reordered_intervals = reordered_group.confidence_intervals_for_each_asset(**kwargs)
+
+    for asset_name in ["a", "b"]:
+        pd.testing.assert_frame_equal(
+            intervals.loc[asset_name], reordered_intervals.loc[asset_name]
+        )
+        pd.testing.assert_frame_equal(
+            intervals.loc[asset_name],
+            curves[asset_name].percent.confidence_intervals(**kwargs),
+            check_names=False,
+        )
+
+
+def test_unknown_statistics_are_rejected():
+    with pytest.raises(Exception):
+        _account_curve(5).confidence_intervals(stat_names=["not_a_stat"])
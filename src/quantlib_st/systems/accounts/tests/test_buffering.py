@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantlib_st.systems.accounts.account_buffering_subsystem import (
+    apply_buffer,
+    apply_buffer_single_period,
+    apply_buffer_to_panel,
+    buffered_position_panel,
+)
+
+
+def _random_positions_and_buffers(seed: int, length: int = 300):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2020-01-01", periods=length, freq="B")
+    optimal_position = pd.Series(np.cumsum(rng.normal(size=length)) * 3.0, index=dates)
+    buffer_width = np.abs(rng.normal(size=length)) + 0.5
+    pos_buffers = pd.DataFrame(
+        dict(
+            top_pos=optimal_position + buffer_width,
+            bot_pos=optimal_position - buffer_width,
+        )
+    )
+
+    # missing values, including at the start
+    optimal_position.iloc[:3] = np.nan
+    optimal_position.iloc[rng.integers(0, length, size=10)] = np.nan
+    pos_buffers.iloc[rng.integers(0, length, size=10)] = np.nan
+
+    return optimal_position, pos_buffers
+
+
+def _reference_apply_buffer(
+    optimal_position: pd.Series,
+    pos_buffers: pd.DataFrame,
+    trade_to_edge: bool,
+    roundpositions: bool,
+) -> pd.Series:
+    pos_buffers = pos_buffers.ffill()
+    optimal_position = optimal_position.ffill()
+    top_pos = pos_buffers.top_pos
+    bot_pos = pos_buffers.bot_pos
+    if roundpositions:
+        optimal_position = optimal_position.round()
+        top_pos = top_pos.round()
+        bot_pos = bot_pos.round()
+
+    current_position = optimal_position.iloc[0]
+    if np.isnan(current_position):
+        current_position = 0.0
+
+    buffered_position_list = [current_position]
+    for idx in range(len(optimal_position.index))[1:]:
+        current_position = apply_buffer_single_period(
+            current_position,
+            float(optimal_position.iloc[idx]),
+            float(top_pos.iloc[idx]),
+            float(bot_pos.iloc[idx]),
+            trade_to_edge=trade_to_edge,
+        )
+        buffered_position_list.append(current_position)
+
+    return pd.Series(buffered_position_list, index=optimal_position.index)
+
+
+@pytest.mark.parametrize("trade_to_edge", [True, False])
+@pytest.mark.parametrize("roundpositions", [True, False])
+def test_apply_buffer_matches_single_period_loop(trade_to_edge, roundpositions):
+    optimal_position, pos_buffers = _random_positions_and_buffers(seed=1)
+
+    buffered = apply_buffer(
+        optimal_position,
+        pos_buffers,
+        trade_to_edge=trade_to_edge,
+        roundpositions=roundpositions,
+    )
+    expected = _reference_apply_buffer(
+        optimal_position,
+        pos_buffers,
+        trade_to_edge=trade_to_edge,
+        roundpositions=roundpositions,
+    )
+
+    pd.testing.assert_series_equal(buffered, expected, check_names=False)
+
+
+@pytest.mark.parametrize("trade_to_edge", [True, False])
+def test_apply_buffer_to_panel_matches_each_column(trade_to_edge):
+    positions_and_buffers = {
+        "a": _random_positions_and_buffers(seed=2),
+        "b": _random_positions_and_buffers(seed=3),
+        "c": _random_positions_and_buffers(seed=4),
+    }
+    optimal_positions = pd.DataFrame(
+        {code: optimal for code, (optimal, _) in positions_and_buffers.items()}
+    )
+    top_positions = pd.DataFrame(
+        {code: buffers.top_pos for code, (_, buffers) in positions_and_buffers.items()}
+    )
+    bottom_positions = pd.DataFrame(
+        {code: buffers.bot_pos for code, (_, buffers) in positions_and_buffers.items()}
+    )
+
+    buffered = apply_buffer_to_panel(
+        optimal_positions,
+        top_positions,
+        bottom_positions,
+        trade_to_edge=trade_to_edge,
+        roundpositions=True,
+    )
+
+    for code, (optimal, buffers) in positions_and_buffers.items():
+        expected = apply_buffer(
+            optimal, buffers, trade_to_edge=trade_to_edge, roundpositions=True
+        )
+        pd.testing.assert_series_equal(buffered[code], expected, check_names=False)
+
+
+def test_buffered_position_panel_starts_each_instrument_on_its_own_dates():
+    early_optimal, early_buffers = _random_positions_and_buffers(seed=5)
+    late_optimal, late_buffers = _random_positions_and_buffers(seed=6)
+    # start late on a date with a position, and on different days of the week
+    late_optimal = late_optimal.iloc[50:].shift(2, freq="D").ffill()
+    late_buffers = late_buffers.iloc[50:].shift(2, freq="D")
+
+    buffered = buffered_position_panel(
+        dict(early=early_optimal, late=late_optimal),
+        dict(early=early_buffers, late=late_buffers),
+        trade_to_edge=True,
+        roundpositions=True,
+    )
+
+    assert buffered["late"][: late_optimal.index[0]].iloc[:-1].isna().all()
+    for code, optimal, buffers in [
+        ("early", early_optimal, early_buffers),
+        ("late", late_optimal, late_buffers),
+    ]:
+        expected = apply_buffer(
+            optimal, buffers, trade_to_edge=True, roundpositions=True
+        )
+        pd.testing.assert_series_equal(
+            buffered[code].reindex(optimal.index), expected, check_names=False
+        )
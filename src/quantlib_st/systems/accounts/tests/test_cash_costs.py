@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantlib_st.core.dateutils import generate_equal_dates_within_year
+from quantlib_st.core.pandas.find_data import get_row_of_series_before_date
+from quantlib_st.core.pandas.strategy_functions import years_in_data
+from quantlib_st.objects.fills import ListOfFills
+from quantlib_st.objects.instruments import instrumentCosts
+from quantlib_st.systems.accounts.pandl_calculators.pandl_cash_costs import (
+    calculate_cost_from_fill_with_cost_object,
+    pandlCalculationWithCashCostsAndFills,
+    pseudo_fills_from_holding,
+)
+
+RAW_COSTS = instrumentCosts(
+    price_slippage=0.01,
+    value_of_block_commission=2.0,
+    percentage_cost=0.0002,
+    value_of_pertrade_commission=3.0,
+)
+
+
+@pytest.fixture(scope="module")
+def positions_and_price():
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2010-01-04", periods=1500, freq="B")
+    price = pd.Series(100 + np.cumsum(rng.normal(size=len(dates))), index=dates)
+    positions = pd.Series(np.cumsum(rng.normal(size=len(dates))) * 2.5, index=dates)
+    positions.iloc[:20] = np.nan
+    # a year with no data at all
+    in_gap_year = positions.index.year == 2012
+    positions = positions[~in_gap_year]
+    price = price[~in_gap_year]
+
+    return positions, price
+
+
+def _reference_pseudo_fills(positions, price, rolls_per_year, multiply_roll_costs_by):
+    # one Fill at a time, with a slice and mean per roll period
+    fills = []
+    price_series = price.ffill()
+    for year in years_in_data(positions):
+        roll_dates = generate_equal_dates_within_year(year, rolls_per_year)
+        all_dates = [
+            generate_equal_dates_within_year(year - 1, rolls_per_year)[-1]
+        ] + roll_dates
+        opening = []
+        for date_index, date in enumerate(roll_dates):
+            holding = positions[all_dates[date_index] : date].abs().mean()
+            holding = 0.0 if np.isnan(holding) else holding
+            if date <= positions.index[-1] and abs(holding) > 0:
+                opening.append(
+                    (
+                        date,
+                        holding * multiply_roll_costs_by,
+                        get_row_of_series_before_date(price_series, date),
+                    )
+                )
+        fills += [(date, qty, roll_price, True) for date, qty, roll_price in opening]
+        fills += [(date, -qty, roll_price, False) for date, qty, roll_price in opening]
+
+    return fills
+
+
+@pytest.mark.parametrize("rolls_per_year", [1, 4, 12])
+def test_pseudo_fills_match_period_by_period_calculation(
+    positions_and_price, rolls_per_year
+):
+    positions, price = positions_and_price
+
+    pseudo_fills = pseudo_fills_from_holding(
+        positions, price, rolls_per_year=rolls_per_year, multiply_roll_costs_by=1.5
+    )
+    expected = _reference_pseudo_fills(
+        positions, price, rolls_per_year=rolls_per_year, multiply_roll_costs_by=1.5
+    )
+
+    assert len(pseudo_fills) == len(expected)
+    assert list(pd.DatetimeIndex(pseudo_fills.dates)) == [
+        pd.Timestamp(fill[0]) for fill in expected
+    ]
+    np.testing.assert_allclose(pseudo_fills.qty, [fill[1] for fill in expected])
+    np.testing.assert_array_equal(pseudo_fills.price, [fill[2] for fill in expected])
+    assert pseudo_fills.price_requires_slippage_adjustment.tolist() == [
+        fill[3] for fill in expected
+    ]
+
+
+def test_no_pseudo_fills_without_rolls(positions_and_price):
+    positions, price = positions_and_price
+
+    assert len(pseudo_fills_from_holding(positions, price, rolls_per_year=0)) == 0
+
+
+def test_array_costs_match_cost_per_fill(positions_and_price):
+    positions, price = positions_and_price
+    calculator = pandlCalculationWithCashCostsAndFills(
+        price,
+        positions=positions,
+        raw_costs=RAW_COSTS,
+        rolls_per_year=4,
+        capital=1e6,
+        value_per_point=50.0,
+        roundpositions=False,
+    )
+    list_of_fills = calculator.list_of_all_fills()
+    assert isinstance(list_of_fills, ListOfFills)
+
+    costs = calculator.costs_from_trading_in_instrument_currency_as_array()
+    expected = [
+        -calculate_cost_from_fill_with_cost_object(
+            fill, value_per_point=50.0, raw_costs=RAW_COSTS
+        )
+        for fill in list_of_fills
+    ]
+
+    np.testing.assert_allclose(costs, expected, rtol=1e-12)
+
+
+def test_array_commission_takes_largest_of_each_kind():
+    # per trade, per block, percentage, and percentage with no price
+    blocks_traded = np.array([0.5, -4.0, 1.0, 2.0])
+    price = np.array([100.0, 100.0, 50000.0, np.nan])
+    include_slippage = np.array([False, False, False, True])
+
+    costs = RAW_COSTS.calculate_cost_instrument_currency_for_arrays(
+        blocks_traded,
+        block_price_multiplier=1.0,
+        price=price,
+        include_slippage=include_slippage,
+    )
+    expected = [
+        RAW_COSTS.calculate_cost_instrument_currency(
+            blocks,
+            block_price_multiplier=1.0,
+            price=fill_price,
+            include_slippage=slippage,
+        )
+        for blocks, fill_price, slippage in zip(blocks_traded, price, include_slippage)
+    ]
+
+    np.testing.assert_allclose(costs, expected)
+    np.testing.assert_allclose(costs, [3.0, 8.0, 10.0, 4.02])
@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import skew, ttest_1samp
+
+from quantlib_st.core.pandas.strategy_functions import drawdown
+from quantlib_st.systems.accounts.account_forecast import pandl_for_instrument_forecast
+from quantlib_st.systems.accounts.curves.account_curve_group import accountCurveGroup
+from quantlib_st.systems.accounts.curves.curve_stats import (
+    COLUMN_STATS_LIST,
+    STATS_LIST,
+    curveStatistics,
+)
+from quantlib_st.systems.accounts.curves.dict_of_account_curves import (
+    dictOfAccountCurves,
+)
+from quantlib_st.systems.accounts.curves.stats_dict import statsDict
+
+
+@pytest.fixture(scope="module")
+def account_curve():
+    rng = np.random.default_rng(3)
+    dates = pd.date_range("2015-01-01", periods=800, freq="B")
+    price = pd.Series(100 + np.cumsum(rng.normal(size=len(dates))), index=dates)
+    forecast = pd.Series(rng.normal(scale=10, size=len(dates)), index=dates)
+    forecast.iloc[:30] = np.nan
+
+    return pandl_for_instrument_forecast(
+        forecast=forecast, price=price, capital=100000.0, value_per_point=10.0
+    )
+
+
+def _reference_stats(x: pd.Series, returns_scalar: float) -> dict:
+    # the statistics as pandas methods, one at a time
+    vals = x.dropna().values
+    losses = vals[vals < 0]
+    gains = vals[vals > 0]
+    ann_mean = x.sum() / (len(x) / returns_scalar)
+    ann_std = x.std() * returns_scalar**0.5
+    dd = drawdown(x.cumsum().ffill())
+    worst_drawdown = np.nanmin(dd.values)
+    avg_drawdown = np.nanmean(dd.values)
+    valid_dd = dd.dropna()
+    t_test = ttest_1samp(vals, 0.0)
+
+    return dict(
+        min=np.nanmin(x),
+        max=np.nanmax(x),
+        median=x.median(),
+        mean=x.mean(),
+        std=x.std(),
+        skew=skew(vals),
+        ann_mean=ann_mean,
+        ann_std=ann_std,
+        sharpe=ann_mean / ann_std,
+        sortino=ann_mean / (np.std(losses) * returns_scalar**0.5),
+        avg_drawdown=avg_drawdown,
+        worst_drawdown=worst_drawdown,
+        time_in_drawdown=(valid_dd < 0).sum() / len(valid_dd),
+        calmar=ann_mean / -worst_drawdown,
+        avg_return_to_drawdown=ann_mean / -avg_drawdown,
+        avg_loss=np.mean(losses),
+        avg_gain=np.mean(gains),
+        gaintolossratio=np.mean(gains) / -np.mean(losses),
+        profitfactor=np.sum(gains) / -np.sum(losses),
+        hitrate=len(gains) / (len(gains) + len(losses)),
+        t_stat=t_test[0],
+        p_value=t_test[1],
+    )
+
+
+def test_stats_bundle_matches_pandas_calculations(account_curve):
+    bundle = account_curve.stats_bundle()
+    expected = _reference_stats(account_curve.as_ts, account_curve.returns_scalar)
+
+    for stat_name, expected_value in expected.items():
+        assert getattr(bundle, stat_name) == pytest.approx(
+            expected_value, rel=1e-12
+        ), stat_name
+        assert getattr(account_curve, stat_name)() == pytest.approx(
+            expected_value, rel=1e-12
+        ), stat_name
+
+
+def test_stats_with_missing_values_match_pandas_calculations(account_curve):
+    returns = account_curve.as_ts.copy()
+    returns.iloc[:10] = np.nan
+    returns.iloc[100:120] = np.nan
+
+    bundle = curveStatistics(returns.values, returns_scalar=256.0).bundle()
+    expected = _reference_stats(returns, returns_scalar=256.0)
+
+    for stat_name, expected_value in expected.items():
+        assert getattr(bundle, stat_name) == pytest.approx(
+            expected_value, rel=1e-12
+        ), stat_name
+
+
+def test_stats_are_in_the_usual_order(account_curve):
+    build_stats, _ = account_curve.stats()
+
+    assert [stat_name for stat_name, _ in build_stats] == STATS_LIST
+    assert dict(build_stats)["sharpe"] == "{0:.4g}".format(account_curve.sharpe())
+
+
+def test_curve_and_drawdown_before_the_first_value():
+    values = np.array([np.nan, np.nan, 1.0, np.nan, -3.0, 1.0])
+    stats = curveStatistics(values, returns_scalar=256.0)
+    series = pd.Series(values)
+
+    np.testing.assert_array_equal(stats.curve, series.cumsum().ffill().values)
+    np.testing.assert_array_equal(
+        stats.drawdown, drawdown(series.cumsum().ffill()).values
+    )
+    assert stats.time_in_drawdown() == 0.5
+
+
+@pytest.fixture(scope="module")
+def account_curve_group():
+    rng = np.random.default_rng(4)
+    account_curves = {}
+    for asset_number, start in enumerate(["2014-01-01", "2015-06-03", "2016-02-10"]):
+        dates = pd.date_range(start, periods=600 + 50 * asset_number, freq="B")
+        price = pd.Series(100 + np.cumsum(rng.normal(size=len(dates))), index=dates)
+        forecast = pd.Series(rng.normal(scale=10, size=len(dates)), index=dates)
+        forecast.iloc[:40] = np.nan
+        account_curves["asset%d" % asset_number] = pandl_for_instrument_forecast(
+            forecast=forecast, price=price, capital=100000.0, value_per_point=5.0
+        )
+
+    return accountCurveGroup(dictOfAccountCurves(account_curves), capital=100000.0)
+
+
+@pytest.mark.parametrize("freq", ["daily", "weekly"])
+def test_stats_for_each_asset_match_each_curve(account_curve_group, freq):
+    stats = account_curve_group.stats_for_each_asset(freq=freq)
+    stats_dict = statsDict(account_curve_group, item="sharpe", freq=freq)
+
+    assert list(stats.index) == account_curve_group.asset_columns
+    assert list(stats.columns) == COLUMN_STATS_LIST
+    for asset_name in account_curve_group.asset_columns:
+        account_curve = stats_dict.account_curve_for_asset(asset_name, freq_str=freq)
+        for stat_name in COLUMN_STATS_LIST:
+            assert stats.loc[asset_name, stat_name] == pytest.approx(
+                getattr(account_curve, stat_name)(), rel=1e-9
+            ), (asset_name, stat_name)
+
+
+def test_stats_dict_uses_stats_for_each_asset(account_curve_group):
+    stats_dict = account_curve_group.get_stats("sharpe")
+    stats = account_curve_group.stats_for_each_asset()
+
+    assert stats_dict == stats.sharpe.to_dict()
+
+    lengths = account_curve_group.length_in_months_for_each_asset()
+    for asset_name in account_curve_group.asset_columns:
+        assert (
+            lengths[asset_name]
+            == stats_dict.account_curve_for_asset(asset_name).length_in_months
+        )
+
+    time_weights = lengths / lengths.mean()
+    assert stats_dict.mean() == pytest.approx(np.nanmean(stats.sharpe * time_weights))
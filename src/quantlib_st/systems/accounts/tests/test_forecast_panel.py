@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantlib_st.config.configdata import Config
+from quantlib_st.sysdata.sim.csv_futures_sim_test_data import CsvFuturesSimTestData
+from quantlib_st.systems.accounts.account_forecast import (
+    pandl_for_instrument_forecast,
+    pandl_for_instrument_forecasts,
+)
+from quantlib_st.systems.accounts.accounts_stage import Account
+from quantlib_st.systems.accounts.pandl_calculators.pandl_panel import (
+    pandlCalculationFromPanel,
+)
+from quantlib_st.systems.basesystem import System
+from quantlib_st.systems.forecast_combine import ForecastCombine
+from quantlib_st.systems.forecast_scale_cap import ForecastScaleCap
+from quantlib_st.systems.forecasting import Rules
+from quantlib_st.systems.rawdata import RawData
+from quantlib_st.systems.stage import SystemStage
+
+
+def _price_and_forecasts():
+    rng = np.random.default_rng(5)
+    dates = pd.date_range("2016-01-01", periods=700, freq="B")
+    price = pd.Series(100 + np.cumsum(rng.normal(size=len(dates))), index=dates)
+    fx = pd.Series(1.0 + 0.1 * rng.random(size=len(dates)), index=dates)
+
+    forecasts = {}
+    for rule_number in range(4):
+        forecast = pd.Series(rng.normal(scale=10, size=len(dates)), index=dates).clip(
+            -20, 20
+        )
+        forecast.iloc[: 20 * (rule_number + 1)] = np.nan
+        forecasts["rule%d" % rule_number] = forecast
+    # a forecast on fewer dates than the price
+    forecasts["weekly"] = forecasts["rule0"].iloc[::5]
+
+    return price, fx, forecasts
+
+
+@pytest.mark.parametrize("delayfill", [True, False])
+@pytest.mark.parametrize("roundpositions", [True, False])
+def test_forecasts_together_match_each_forecast(delayfill, roundpositions):
+    price, fx, forecasts = _price_and_forecasts()
+    SR_cost = {rule: 0.005 * (number + 1) for number, rule in enumerate(forecasts)}
+    kwargs = dict(
+        price=price,
+        capital=100000.0,
+        fx=fx,
+        value_per_point=25.0,
+        delayfill=delayfill,
+        roundpositions=roundpositions,
+    )
+
+    account_curves = pandl_for_instrument_forecasts(
+        forecasts, SR_cost=SR_cost, **kwargs
+    )
+
+    assert list(account_curves.keys()) == list(forecasts.keys())
+    for rule, forecast in forecasts.items():
+        expected = pandl_for_instrument_forecast(
+            forecast, SR_cost=SR_cost[rule], **kwargs
+        )
+        account_curve = account_curves[rule]
+        for curve in ["gross", "net", "costs"]:
+            pd.testing.assert_series_equal(
+                getattr(account_curve, curve).percent.as_ts,
+                getattr(expected, curve).percent.as_ts,
+                check_names=False,
+                rtol=1e-10,
+            )
+        assert account_curve.sharpe() == pytest.approx(expected.sharpe(), rel=1e-10)
+
+
+def test_weighted_forecast_from_the_panel():
+    price, _, forecasts = _price_and_forecasts()
+    weight = pd.Series(0.25, index=price.index[::10])
+
+    account_curves = pandl_for_instrument_forecasts(forecasts, price, SR_cost=0.01)
+    expected = pandl_for_instrument_forecast(forecasts["rule1"], price, SR_cost=0.01)
+
+    pd.testing.assert_series_equal(
+        account_curves["rule1"].weight(weight).as_ts,
+        expected.weight(weight).as_ts,
+        check_names=False,
+        rtol=1e-10,
+    )
+
+
+class _positionSizeInputs(SystemStage):
+    # just what accountForecast needs, as there's no positionSize stage here
+    @property
+    def name(self):
+        return "positionSize"
+
+    def get_vol_target_dict(self) -> dict:
+        return dict(notional_trading_capital=100000.0, percentage_vol_target=16.0)
+
+    def get_fx_rate(self, instrument_code: str) -> pd.Series:
+        price = self.parent.rawdata.get_daily_prices(instrument_code)
+
+        return pd.Series(1.0, index=price.index)
+
+
+def _system_with_different_rules(use_pandl_panel: bool) -> System:
+    config = Config("systems.provided.config.test_forecast_config.yaml")
+    config.forecast_weights = dict(
+        EDOLLAR=dict(ewmac8=0.5, ewmac16=0.5), US10=dict(ewmac8=1.0)
+    )
+    config.use_pandl_panel = use_pandl_panel
+
+    return System(
+        [
+            Account(),
+            ForecastScaleCap(),
+            RawData(),
+            Rules(),
+            ForecastCombine(),
+            _positionSizeInputs(),
+        ],
+        CsvFuturesSimTestData(),
+        config,
+    )
+
+
+def test_stage_forecasts_from_panel_with_different_rules_for_each_instrument():
+    panel_system = _system_with_different_rules(True)
+    single_system = _system_with_different_rules(False)
+
+    for instrument_code in ["EDOLLAR", "US10"]:
+        for rule_variation_name in ["ewmac8", "ewmac16"]:
+            account_curve = panel_system.accounts.pandl_for_instrument_forecast(
+                instrument_code, rule_variation_name
+            )
+            expected = single_system.accounts.pandl_for_instrument_forecast(
+                instrument_code, rule_variation_name
+            )
+            pd.testing.assert_series_equal(
+                account_curve.percent.as_ts,
+                expected.percent.as_ts,
+                check_names=False,
+                rtol=1e-10,
+            )
+
+    # US10 doesn't trade ewmac16, so that isn't in its panel
+    assert isinstance(
+        panel_system.accounts.pandl_for_instrument_forecast(
+            "EDOLLAR", "ewmac16"
+        ).pandl_calculator_with_costs,
+        pandlCalculationFromPanel,
+    )
+    assert panel_system.accounts.pandl_for_trading_rule_unweighted(
+        "ewmac16"
+    ).sharpe() == pytest.approx(
+        single_system.accounts.pandl_for_trading_rule_unweighted("ewmac16").sharpe(),
+        rel=1e-10,
+    )
+    assert panel_system.accounts.pandl_for_instrument_rules_unweighted(
+        "US10", trading_rule_list=["ewmac8", "ewmac16"]
+    ).sharpe() == pytest.approx(
+        single_system.accounts.pandl_for_instrument_rules_unweighted(
+            "US10", trading_rule_list=["ewmac8", "ewmac16"]
+        ).sharpe(),
+        rel=1e-10,
+    )
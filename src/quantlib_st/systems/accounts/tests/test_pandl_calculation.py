@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantlib_st.core.dateutils import Frequency, from_config_frequency_pandas_resample
+
+from quantlib_st.systems.accounts.account_forecast import pandl_for_instrument_forecast
+from quantlib_st.systems.accounts.pandl_calculators import pandl_calculation
+from quantlib_st.systems.accounts.pandl_calculators.pandl_generic_costs import (
+    COSTS_CURVE,
+    GROSS_CURVE,
+    NET_CURVE,
+)
+
+
+def _account_curve():
+    rng = np.random.default_rng(7)
+    dates = pd.date_range("2018-01-01", periods=500, freq="B")
+    price = pd.Series(100 + np.cumsum(rng.normal(size=len(dates))), index=dates)
+    forecast = pd.Series(rng.normal(scale=10, size=len(dates)), index=dates)
+
+    return pandl_for_instrument_forecast(
+        forecast=forecast, price=price, capital=100000.0, value_per_point=10.0
+    )
+
+
+def test_views_of_an_account_curve_share_one_pandl_calculation(monkeypatch):
+    calls = []
+    calculate_pandl = pandl_calculation.calculate_pandl
+
+    def _counting_calculate_pandl(*args, **kwargs):
+        calls.append(1)
+        return calculate_pandl(*args, **kwargs)
+
+    monkeypatch.setattr(pandl_calculation, "calculate_pandl", _counting_calculate_pandl)
+
+    account_curve = _account_curve()
+    views = [
+        account_curve.gross,
+        account_curve.net,
+        account_curve.costs,
+        account_curve.percent,
+        account_curve.weekly,
+        account_curve.percent.gross.weekly,
+    ]
+
+    assert len(calls) == 1
+    assert all(len(view) > 0 for view in views)
+
+    calculator = account_curve.pandl_calculator_with_costs
+    assert calculator.pandl_in_base_currency() is calculator.pandl_in_base_currency()
+    assert calculator.positions is calculator.positions
+
+
+def test_weighted_calculator_starts_afresh():
+    calculator = _account_curve().pandl_calculator_with_costs
+    unweighted_pandl = calculator.net_pandl_in_base_currency()
+    weight = pd.Series(0.5, index=calculator.price.index)
+
+    weighted_pandl = calculator.weight(weight).net_pandl_in_base_currency()
+    expected = (
+        _account_curve()
+        .pandl_calculator_with_costs.weight(weight)
+        .net_pandl_in_base_currency()
+    )
+
+    pd.testing.assert_series_equal(weighted_pandl, expected)
+    assert not weighted_pandl.equals(unweighted_pandl)
+    assert calculator.net_pandl_in_base_currency() is unweighted_pandl
+
+
+@pytest.mark.filterwarnings("ignore::FutureWarning")
+def test_every_frequency_is_summed_from_one_series_per_curve_type(monkeypatch):
+    calculator = _account_curve().pandl_calculator_with_costs
+    calls = []
+    as_pd_series = calculator.as_pd_series
+
+    def _counting_as_pd_series(**kwargs):
+        calls.append(kwargs)
+        return as_pd_series(**kwargs)
+
+    monkeypatch.setattr(calculator, "as_pd_series", _counting_as_pd_series)
+
+    for curve_type in [GROSS_CURVE, NET_CURVE, COSTS_CURVE]:
+        for frequency in [
+            Frequency.BDay,
+            Frequency.Week,
+            Frequency.Month,
+            Frequency.Year,
+        ]:
+            at_frequency = calculator.as_pd_series_for_frequency(
+                frequency=frequency, curve_type=curve_type, percent=True
+            )
+            expected = as_pd_series(curve_type=curve_type, percent=True).resample(
+                from_config_frequency_pandas_resample(frequency)
+            )
+            pd.testing.assert_series_equal(at_frequency, expected.sum(), rtol=1e-12)
+
+    assert len(calls) == 3
@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantlib_st.systems.accounts.pandl_calculators.pandl_panel import (
+    pandlCalculationPanel,
+)
+from quantlib_st.systems.accounts.pandl_calculators.pandl_SR_cost import (
+    pandlCalculationWithSRCosts,
+)
+
+PANDL_METHODS = [
+    "pandl_in_points",
+    "pandl_in_instrument_currency",
+    "pandl_in_base_currency",
+    "percentage_pandl",
+    "costs_pandl_in_points",
+    "costs_pandl_in_base_currency",
+    "costs_percentage_pandl",
+    "net_pandl_in_base_currency",
+    "net_percentage_pandl",
+]
+
+
+def _random_instrument(seed: int, start: str, length: int, freq: str = "B"):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, periods=length, freq=freq)
+    price = pd.Series(100.0 + np.cumsum(rng.normal(size=length)), index=dates)
+    price.iloc[rng.integers(0, length, size=5)] = np.nan
+
+    # positions on their own, partly overlapping, dates
+    position_dates = dates[5:-5].shift(1, freq="h")
+    positions = pd.Series(
+        np.cumsum(rng.normal(size=len(position_dates))) * 2.0, index=position_dates
+    )
+    positions.iloc[rng.integers(0, len(positions), size=5)] = np.nan
+    average_position = positions.abs().rolling(20, min_periods=1).mean()
+
+    fx = pd.Series(1.0 + 0.1 * rng.random(size=length // 2), index=dates[::2])
+
+    return dict(
+        price=price,
+        positions=positions,
+        average_position=average_position,
+        fx=fx,
+        value_per_point=float(rng.integers(1, 50)),
+        SR_cost=0.01 * (seed + 1),
+    )
+
+
+def _instruments():
+    return dict(
+        a=_random_instrument(1, "2020-01-01", 300),
+        b=_random_instrument(2, "2020-03-05", 200, freq="D"),
+        c=_random_instrument(3, "2019-06-01", 400),
+    )
+
+
+def _panel(instruments: dict, capital, with_fx: bool, **kwargs):
+    return pandlCalculationPanel(
+        price={code: data["price"] for code, data in instruments.items()},
+        positions={code: data["positions"] for code, data in instruments.items()},
+        SR_cost={code: data["SR_cost"] for code, data in instruments.items()},
+        average_position={
+            code: data["average_position"] for code, data in instruments.items()
+        },
+        fx=(
+            {code: data["fx"] for code, data in instruments.items()}
+            if with_fx
+            else None
+        ),
+        capital=capital,
+        value_per_point={
+            code: data["value_per_point"] for code, data in instruments.items()
+        },
+        **kwargs,
+    )
+
+
+def _calculator_on_its_own(data: dict, capital, with_fx: bool, **kwargs):
+    return pandlCalculationWithSRCosts(
+        data["price"],
+        positions=data["positions"],
+        fx=data["fx"] if with_fx else None,
+        capital=capital,
+        value_per_point=data["value_per_point"],
+        SR_cost=data["SR_cost"],
+        average_position=data["average_position"],
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("delayfill,roundpositions", [(True, True), (False, False)])
+@pytest.mark.parametrize("with_fx", [True, False])
+def test_panel_matches_each_instrument_on_its_own(delayfill, roundpositions, with_fx):
+    instruments = _instruments()
+    capital = 1e5
+    panel = _panel(
+        instruments,
+        capital=capital,
+        with_fx=with_fx,
+        delayfill=delayfill,
+        roundpositions=roundpositions,
+    )
+
+    for code, data in instruments.items():
+        from_panel = panel.pandl_calculator_for_item(code)
+        on_its_own = _calculator_on_its_own(
+            data,
+            capital=capital,
+            with_fx=with_fx,
+            delayfill=delayfill,
+            roundpositions=roundpositions,
+        )
+        for method_name in PANDL_METHODS:
+            pd.testing.assert_series_equal(
+                getattr(from_panel, method_name)(),
+                getattr(on_its_own, method_name)(),
+                check_names=False,
+                check_freq=False,
+                rtol=1e-10,
+            )
+
+
+def test_panel_with_capital_series_and_weighting():
+    instruments = _instruments()
+    capital = pd.Series(
+        np.linspace(1e5, 2e5, 100),
+        index=pd.date_range("2019-09-01", periods=100, freq="W"),
+    )
+    panel = _panel(instruments, capital=capital, with_fx=True, delayfill=True)
+
+    weight = pd.Series(0.5, index=capital.index)
+    for code, data in instruments.items():
+        from_panel = panel.pandl_calculator_for_item(code)
+        on_its_own = _calculator_on_its_own(
+            data, capital=capital, with_fx=True, delayfill=True
+        )
+        pd.testing.assert_series_equal(
+            from_panel.net_percentage_pandl(),
+            on_its_own.net_percentage_pandl(),
+            check_names=False,
+            check_freq=False,
+            rtol=1e-10,
+        )
+        assert from_panel.length_in_months == on_its_own.length_in_months
+        pd.testing.assert_series_equal(
+            from_panel.weight(weight).net_pandl_in_base_currency(),
+            on_its_own.weight(weight).net_pandl_in_base_currency(),
+            check_names=False,
+            check_freq=False,
+        )
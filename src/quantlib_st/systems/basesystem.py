@@ -1,3 +1,5 @@
+from contextlib import contextmanager
+from functools import partial
 from typing import Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -8,6 +10,8 @@ if TYPE_CHECKING:
     # from quantlib_st.systems.forecast_combine import ForecastCombine
     from quantlib_st.systems.forecast_scale_cap import ForecastScaleCap
 
+import pandas as pd
+
 from quantlib_st.config.configdata import Config
 from quantlib_st.config.instruments import (
     get_duplicate_list_of_instruments_to_remove_from_config,
@@ -18,6 +22,15 @@ from quantlib_st.config.instruments import (
 from quantlib_st.sysdata.sim.sim_data import simData
 from quantlib_st.logging.logger import *
 from quantlib_st.systems.system_cache import systemCache, base_system_cache
+from quantlib_st.systems.tools.cache_profiler import SELF_TIME
+from quantlib_st.systems.tools.parallel import (
+    PROCESS_EXECUTOR,
+    THREAD_EXECUTOR,
+    call_method_in_worker_and_return_cache_updates,
+    call_system_method_with_list_of_args,
+    get_pool_executor,
+    initialise_worker_with_system,
+)
 
 from quantlib_st.systems.tools.autogroup import (
     calculate_autogroup_weights_given_parameters,
@@ -96,6 +109,7 @@ class System(object):
         self.data.system_init(self)
         self._setup_stages(stage_list)
         self._cache = systemCache(self)
+        self._last_cache_profiler = None
 
     def _setup_stages(self, stage_list: list):
         stage_names = []
@@ -162,6 +176,148 @@ class System(object):
     def stage_names(self):
         return self._stage_names
 
+    @contextmanager
+    def profile_cache(self, by_instrument: bool = False):
+        """
+        Record cache stats only for the work inside the block
+
+        >>> with system.profile_cache():
+        ...     system.forecastScaleCap.get_capped_forecast("EDOLLAR", "ewmac8")
+        >>> system.cache_profile_report()
+
+        :param by_instrument: break stats down by instrument as well
+        """
+        with self.cache.profiling(by_instrument=by_instrument) as profiler:
+            self._last_cache_profiler = profiler
+            yield profiler
+
+    def cache_profile_report(self, sort_by: str = SELF_TIME) -> pd.DataFrame:
+        """
+        Stats for each cached stage method: calls, hits, misses, total and self
+        time in seconds (self time excludes calculating other cached items), and
+        total size of results in bytes
+
+        Uses the profiler that is running, or if none the one from the last
+        profile_cache block
+
+        :param sort_by: column to sort by, descending
+        :returns: pd.DataFrame
+        """
+        profiler = self.cache.profiler
+        if profiler is None:
+            profiler = self._last_cache_profiler
+
+        if profiler is None:
+            raise Exception(
+                "No cache profile available: use system.profile_cache() or system.cache.start_profiling() first"
+            )
+
+        report = profiler.as_df()
+
+        return report.sort_values(sort_by, ascending=False)
+
+    def precompute(
+        self,
+        method_path: str,
+        instruments: Optional[list] = None,
+        keys: Optional[list] = None,
+        executor: str = PROCESS_EXECUTOR,
+        max_workers: Optional[int] = None,
+    ) -> dict:
+        """
+        Evaluate a stage method for many instruments at once in a pool, and
+        store the results in the cache as if they'd been called one by one
+
+        :param method_path: eg "rawdata.daily_returns_volatility"
+        :type method_path: str
+
+        :param instruments: instruments to evaluate (default all in the system)
+        :type instruments: list of str, or None
+
+        :param keys: optional second argument, eg rule variation names. If passed
+          we evaluate every instrument x key pair
+        :type keys: list or None
+
+        :param executor: "process" or "thread"
+        :type executor: str
+
+        :param max_workers: size of pool (default: as many as there are cores)
+        :type max_workers: int or None
+
+        :returns: dict, keys are instrument_code or (instrument_code, key)
+
+        With the process executor only pickable cache items come back from the
+        workers; use threads for things like account curves
+        """
+        if instruments is None:
+            instruments = self.get_instrument_list()
+
+        # one task per instrument, so that anything shared between keys for an
+        # instrument (eg vol used by many rules) is only calculated once
+        if keys is None:
+            args_by_instrument = [
+                [(instrument_code,)] for instrument_code in instruments
+            ]
+        else:
+            args_by_instrument = [
+                [(instrument_code, key) for key in keys]
+                for instrument_code in instruments
+            ]
+
+        self.log.debug(
+            "Precomputing %s for %d instruments using %s pool"
+            % (method_path, len(instruments), executor)
+        )
+
+        if executor == PROCESS_EXECUTOR and not self.cache.are_we_caching():
+            self.log.warning(
+                "Caching is off, so results from other processes would be lost: using threads instead"
+            )
+            executor = THREAD_EXECUTOR
+
+        call_method = partial(call_system_method_with_list_of_args, self, method_path)
+        if executor == PROCESS_EXECUTOR:
+            self._precompute_in_processes(
+                method_path,
+                args_by_instrument=args_by_instrument,
+                max_workers=max_workers,
+            )
+            # everything is in the cache now, so this is just a lookup
+            list_of_results = [call_method(args) for args in args_by_instrument]
+        else:
+            with get_pool_executor(executor=executor, max_workers=max_workers) as pool:
+                list_of_results = list(pool.map(call_method, args_by_instrument))
+
+        all_results = {}
+        for results in list_of_results:
+            all_results.update(results)
+
+        if keys is None:
+            all_results = dict(
+                [(args[0], value) for args, value in all_results.items()]
+            )
+
+        return all_results
+
+    def _precompute_in_processes(
+        self,
+        method_path: str,
+        args_by_instrument: list,
+        max_workers: Optional[int] = None,
+    ):
+        with get_pool_executor(
+            executor=PROCESS_EXECUTOR,
+            max_workers=max_workers,
+            initializer=initialise_worker_with_system,
+            initargs=(self,),
+        ) as pool:
+            for new_cache_items, dependency_graph_as_dict in pool.map(
+                partial(call_method_in_worker_and_return_cache_updates, method_path),
+                args_by_instrument,
+            ):
+                self.cache.merge_items(new_cache_items)
+                self.cache.dependency_graph.merge(dependency_graph_as_dict)
+
     # note we have to use this special cache here, or we get recursion problems
     @base_system_cache()
     def get_instrument_list(
@@ -3,7 +3,7 @@ from copy import copy
 import pandas as pd
 
 from quantlib_st.core.exceptions import missingData
-from systems.forecast_mapping import map_forecast_value
+from quantlib_st.systems.forecast_mapping import map_forecast_value
 from quantlib_st.core.genutils import str2Bool, list_difference
 from quantlib_st.core.objects import resolve_function
 from quantlib_st.core.pandas.pdutils import (
@@ -11,22 +11,22 @@ from quantlib_st.core.pandas.pdutils import (
     from_dict_of_values_to_df,
     from_scalar_values_to_ts,
 )
-from core.pandas.frequency import reindex_last_monthly_include_first_date
-from syscore.pandas.strategy_functions import (
+from quantlib_st.core.pandas.frequency import reindex_last_monthly_include_first_date
+from quantlib_st.core.pandas.strategy_functions import (
     weights_sum_to_one,
     fix_weights_vs_position_or_forecast,
 )
-from syscore.pandas.list_of_df import listOfDataFrames
+from quantlib_st.core.pandas.list_of_df import listOfDataFrames
 
 from quantlib_st.config.configdata import Config
 
-from sysquant.estimators.correlations import CorrelationList
-from sysquant.optimisation.pre_processing import returnsPreProcessor
-from sysquant.returns import (
+from quantlib_st.correlation.correlation_over_time import CorrelationList
+from quantlib_st.optimisation.pre_processing import returnsPreProcessor
+from quantlib_st.optimisation.returns import (
     dictOfReturnsForOptimisationWithCosts,
     returnsForOptimisationWithCosts,
 )
-from sysquant.estimators.turnover import (
+from quantlib_st.estimators.turnover import (
     turnoverDataAcrossTradingRules,
     turnoverDataForTradingRule,
 )
@@ -34,7 +34,8 @@ from sysquant.estimators.turnover import (
 from quantlib_st.systems.stage import SystemStage
 from quantlib_st.systems.system_cache import diagnostic, dont_cache, input, output
 from quantlib_st.systems.forecasting import Rules
-from systems.forecast_scale_cap import ForecastScaleCap
+from quantlib_st.systems.forecast_scale_cap import ForecastScaleCap
+from quantlib_st.systems.tools.instrument_groups import instrumentGroupingIndex
 from quantlib_st.systems.tools.autogroup import (
     calculate_autogroup_weights_given_parameters,
     config_is_auto_group,
@@ -443,15 +444,22 @@ class ForecastCombine(SystemStage):
         :param rule_variation_list: list of str
         :return: pd.DataFrame
         """
-        forecasts = [
-            self._get_capped_individual_forecast(instrument_code, rule_variation_name)
-            for rule_variation_name in rule_variation_list
-        ]
-
-        if not forecasts:
+        if not rule_variation_list:
             return pd.DataFrame(index=pd.DatetimeIndex([]))
 
-        forecasts = pd.concat(forecasts, axis=1)
+        if self.forecast_scale_cap_stage.use_capped_forecast_cube():
+            # one slice of the cube rather than a Series per rule
+            forecasts = self.forecast_scale_cap_stage.get_capped_forecasts_for_instrument_from_cube(
+                instrument_code, rule_variation_list
+            )
+        else:
+            forecasts = [
+                self._get_capped_individual_forecast(
+                    instrument_code, rule_variation_name
+                )
+                for rule_variation_name in rule_variation_list
+            ]
+            forecasts = pd.concat(forecasts, axis=1)
 
         forecasts.columns = rule_variation_list
 
@@ -611,9 +619,41 @@ class ForecastCombine(SystemStage):
 
         :returns: TxK pd.DataFrame containing weights, columns are trading rule variation names, T covers all
         """
+        if self._weights_are_fully_pooled():
+            codes_to_use = self.has_same_cheap_rules_as_code(instrument_code)
+            return self.calculation_of_raw_estimated_monthly_forecast_weights_for_group(
+                codes_to_use
+            )
 
         self.log.info("Calculating raw forecast weights for %s" % instrument_code)
 
+        return self._calculation_of_raw_estimated_monthly_forecast_weights(
+            instrument_code
+        )
+
+    @diagnostic(not_pickable=True, protected=True)
+    def calculation_of_raw_estimated_monthly_forecast_weights_for_group(
+        self, codes_to_use: list
+    ):
+        """
+        With both returns and costs pooled, every instrument in a group gets
+        the same weights, so we do one optimisation and share it
+
+        :param codes_to_use: instruments with the same cheap rules
+        :type list:
+        """
+        self.log.info(
+            "Calculating pooled raw forecast weights for %s" % ", ".join(codes_to_use)
+        )
+
+        return self._calculation_of_raw_estimated_monthly_forecast_weights(
+            codes_to_use[0]
+        )
+
+    @dont_cache
+    def _calculation_of_raw_estimated_monthly_forecast_weights(
+        self, instrument_code: str
+    ):
         config = self.config
         # Get some useful stuff from the config
         weighting_params = copy(config.forecast_weight_estimate)
@@ -632,6 +672,17 @@ class ForecastCombine(SystemStage):
 
         return weight_func
 
+    @dont_cache
+    def _weights_are_fully_pooled(self) -> bool:
+        pool_gross_returns = str2Bool(
+            self.config.forecast_weight_estimate.get("pool_gross_returns", False)
+        )
+        use_pooled_costs = str2Bool(
+            self.config.forecast_cost_estimates.get("use_pooled_costs", False)
+        )
+
+        return pool_gross_returns and use_pooled_costs
+
     @diagnostic(not_pickable=True)
     def returns_pre_processor_for_code(self, instrument_code) -> returnsPreProcessor:
         # Because we might be pooling, we get a stack of p&l data
@@ -714,23 +765,26 @@ class ForecastCombine(SystemStage):
 
         """
 
-        my_rules = self.cheap_trading_rules(instrument_code)
-        instrument_list = self.parent.get_instrument_list()
-
-        def _rule_list_matches(list_of_rules, other_list_of_rules):
-            list_of_rules.sort()
-            other_list_of_rules.sort()
-            return list_of_rules == other_list_of_rules
-
-        matching_instruments = [
-            other_code
-            for other_code in instrument_list
-            if _rule_list_matches(my_rules, self.cheap_trading_rules(other_code))
-        ]
+        return self.cheap_rule_grouping_index().instruments_with_same_rules_as(
+            instrument_code
+        )
 
-        matching_instruments.sort()
+    @diagnostic()
+    def cheap_rule_grouping_index(self) -> instrumentGroupingIndex:
+        """
+        Instruments grouped by their set of cheap trading rules; built once
+        and used by every pooled estimate
 
-        return matching_instruments
+        :returns: instrumentGroupingIndex
+        """
+        return instrumentGroupingIndex.from_dict_of_rule_lists(
+            dict(
+                [
+                    (instrument_code, self.cheap_trading_rules(instrument_code))
+                    for instrument_code in self.parent.get_instrument_list()
+                ]
+            )
+        )
 
     def expensive_trading_rules_post_processing(self, instrument_code: str) -> list:
         all_rule_names = self.get_trading_rule_list(instrument_code)
@@ -1140,7 +1194,7 @@ class ForecastCombine(SystemStage):
         div_mult_params = copy(self.parent.config.forecast_div_mult_estimate)
 
         # an example of an idm calculation function is
-        # sysquant.estimators.diversification_multipliers.diversification_multiplier_from_list
+        # estimators.diversification_multipliers.diversification_multiplier_from_list
         idm_func = resolve_function(div_mult_params.pop("func"))
 
         correlation_list = self.get_forecast_correlation_matrices(instrument_code)
@@ -1232,24 +1286,27 @@ class ForecastCombine(SystemStage):
         ['BUND']
         """
 
-        my_rules = self.get_trading_rule_list(instrument_code)
-        instrument_list = self.parent.get_instrument_list()
+        return self.rule_grouping_index().instruments_with_same_rules_as(
+            instrument_code
+        )
 
-        def _matches(xlist, ylist):
-            xlist.sort()
-            ylist.sort()
-            return xlist == ylist
+    @diagnostic()
+    def rule_grouping_index(self) -> instrumentGroupingIndex:
+        """
+        Instruments grouped by their set of trading rules; built once and
+        used by every pooled estimate
 
-        matching_instruments = sorted(
-            [
-                other_code
-                for other_code in instrument_list
-                if _matches(my_rules, self.get_trading_rule_list(other_code))
-            ]
+        :returns: instrumentGroupingIndex
+        """
+        return instrumentGroupingIndex.from_dict_of_rule_lists(
+            dict(
+                [
+                    (instrument_code, self.get_trading_rule_list(instrument_code))
+                    for instrument_code in self.parent.get_instrument_list()
+                ]
+            )
         )
 
-        return matching_instruments
-
     @diagnostic(protected=True, not_pickable=True)
     def get_forecast_correlation_matrices_from_instrument_code_list(
         self, codes_to_use: list
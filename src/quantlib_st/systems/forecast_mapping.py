@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+
+def map_forecast_value(
+    raw_forecast: pd.Series,
+    threshold: float = 0.0,
+    capped_value: float = 20.0,
+    a_param: float = 1.0,
+    b_param: float = 1.0,
+) -> pd.Series:
+    """
+    Non linear mapping of a forecast: zero inside the threshold, then linear
+    with slope b_param, and capped_value * a_param beyond the cap
+
+    >>> import datetime
+    >>> x = pd.Series([0.5, 1.5, -3.0, 25.0, np.nan], index=pd.date_range(datetime.datetime(2000,1,1), periods=5))
+    >>> map_forecast_value(x, threshold=1.0, capped_value=20.0, a_param=1.0, b_param=2.0)
+    2000-01-01     0.0
+    2000-01-02     1.0
+    2000-01-03    -4.0
+    2000-01-04    20.0
+    2000-01-05     NaN
+    Freq: D, dtype: float64
+    """
+    values = raw_forecast.to_numpy(dtype=float)
+    abs_values = np.abs(values)
+
+    mapped_values = np.select(
+        [
+            abs_values < threshold,
+            abs_values <= capped_value,
+            abs_values > capped_value,
+        ],
+        [
+            0.0,
+            b_param * (values - np.sign(values) * threshold),
+            np.sign(values) * capped_value * a_param,
+        ],
+        default=np.nan,
+    )
+
+    return pd.Series(mapped_values, index=raw_forecast.index)
@@ -66,6 +66,11 @@ class ForecastScaleCap(SystemStage):
             instrument_code=instrument_code,
         )
 
+        if self.use_capped_forecast_cube():
+            return self._get_capped_forecast_from_cube(
+                instrument_code, rule_variation_name
+            )
+
         scaled_forecast = self.get_scaled_forecast(instrument_code, rule_variation_name)
         upper_cap = self.get_forecast_cap()
         lower_floor = self.get_forecast_floor()
@@ -76,6 +81,133 @@ class ForecastScaleCap(SystemStage):
 
         return capped_scaled_forecast
 
+    @diagnostic()
+    def get_capped_forecast_cube(
+        self, instrument_list: list = None, rule_list: list = None
+    ) -> pd.DataFrame:
+        """
+        Return the capped, scaled forecast for every instrument and rule at once
+
+        Raw forecasts and scalars are lined up into T x N x R arrays, and scaled
+        and capped in one pass rather than a Series at a time. Values are the
+        same as get_capped_forecast.
+
+        :param instrument_list: default all instruments in the system
+        :param rule_list: default all rules in the rules stage
+
+        :returns: T x (N*R) pd.DataFrame, index union of the raw forecast dates,
+            columns MultiIndex (instrument_code, rule_variation_name) in that
+            order, so cube.to_numpy().reshape(T, N, R) is the array. NaN where
+            an instrument has no forecast on a date
+        """
+        if instrument_list is None:
+            instrument_list = self.parent.get_instrument_list()
+        if rule_list is None:
+            rule_list = list(self.rules_stage.trading_rules().keys())
+
+        raw_forecast_dict = {
+            (instrument_code, rule_variation_name): self.get_raw_forecast(
+                instrument_code, rule_variation_name
+            )
+            for instrument_code in instrument_list
+            for rule_variation_name in rule_list
+        }
+        raw_forecast_array, index = _stack_series_into_cube(
+            raw_forecast_dict, instrument_list=instrument_list, rule_list=rule_list
+        )
+
+        if self._use_estimated_weights():
+            # scalars are time series, aligned with each forecast
+            scalar_dict = {
+                (instrument_code, rule_variation_name): self.get_forecast_scalar(
+                    instrument_code, rule_variation_name
+                )
+                for instrument_code in instrument_list
+                for rule_variation_name in rule_list
+            }
+            scalar_array, _ = _stack_series_into_cube(
+                scalar_dict,
+                instrument_list=instrument_list,
+                rule_list=rule_list,
+                index=index,
+                ffill=True,
+            )
+        else:
+            # N x R, broadcast over time
+            scalar_array = np.array(
+                [
+                    [
+                        self._get_forecast_scalar_fixed(
+                            instrument_code, rule_variation_name
+                        )
+                        for rule_variation_name in rule_list
+                    ]
+                    for instrument_code in instrument_list
+                ],
+                dtype=float,
+            )
+
+        capped_forecast_array = scale_and_cap_forecast_array(
+            raw_forecast_array,
+            scalar_array,
+            upper_cap=self.get_forecast_cap(),
+            lower_floor=self.get_forecast_floor(),
+        )
+
+        columns = pd.MultiIndex.from_product(
+            [instrument_list, rule_list],
+            names=["instrument_code", "rule_variation_name"],
+        )
+        capped_forecast_cube = pd.DataFrame(
+            capped_forecast_array.reshape(len(index), len(columns)),
+            index=index,
+            columns=columns,
+        )
+
+        return capped_forecast_cube
+
+    @dont_cache
+    def get_capped_forecasts_for_instrument_from_cube(
+        self, instrument_code: str, rule_variation_list: list
+    ) -> pd.DataFrame:
+        """
+        Capped forecasts for one instrument, sliced out of get_capped_forecast_cube
+
+        :returns: TxR pd.DataFrame, columns rule_variation_list, on the union of
+            the dates of those raw forecasts (as concatenating get_capped_forecast)
+        """
+        capped_forecast_cube = self.get_capped_forecast_cube()
+        raw_forecast_index = _union_of_indexes(
+            [
+                self.get_raw_forecast(instrument_code, rule_variation_name).index
+                for rule_variation_name in rule_variation_list
+            ]
+        )
+
+        # the cube covers all instruments, so can have dates these forecasts don't
+        capped_forecasts = capped_forecast_cube[instrument_code].reindex(
+            index=raw_forecast_index, columns=rule_variation_list
+        )
+        capped_forecasts.columns = list(rule_variation_list)
+
+        return capped_forecasts
+
+    @dont_cache
+    def _get_capped_forecast_from_cube(
+        self, instrument_code: str, rule_variation_name: str
+    ) -> pd.Series:
+        capped_forecasts = self.get_capped_forecasts_for_instrument_from_cube(
+            instrument_code, [rule_variation_name]
+        )
+        capped_forecast = capped_forecasts[rule_variation_name]
+        capped_forecast.name = None
+
+        return capped_forecast
+
+    @dont_cache
+    def use_capped_forecast_cube(self) -> bool:
+        return str2Bool(self.config.use_capped_forecast_cube)
+
     @diagnostic()
     def get_scaled_forecast(self, instrument_code, rule_variation_name):
         """
@@ -502,6 +634,95 @@ class ForecastScaleCap(SystemStage):
         return forecast_floor
 
 
+def scale_and_cap_forecast_array(
+    raw_forecast_array: np.ndarray,
+    scalar_array: np.ndarray,
+    upper_cap: float,
+    lower_floor: float,
+) -> np.ndarray:
+    """
+    Scale and cap in place in one output buffer, without an intermediate
+
+    :param raw_forecast_array: T x N x R
+    :param scalar_array: anything that broadcasts against it, eg N x R
+    :returns: T x N x R, NaN where the raw forecast is NaN
+    """
+    capped_forecast_array = np.multiply(raw_forecast_array, scalar_array)
+    np.clip(capped_forecast_array, lower_floor, upper_cap, out=capped_forecast_array)
+
+    return capped_forecast_array
+
+
+def _stack_series_into_cube(
+    series_dict: dict,
+    instrument_list: list,
+    rule_list: list,
+    index: pd.Index = None,
+    ffill: bool = False,
+) -> tuple:
+    """
+    :param series_dict: dict, (instrument_code, rule_variation_name) -> pd.Series
+    :param index: dates to align to; default union of the series indexes
+    :param ffill: carry values forward onto dates of index a series doesn't
+        have, eg for forecast scalars
+    :returns: tuple: T x N x R np.ndarray with NaN where a series has no value,
+        and the index
+    """
+    if index is None:
+        index = _union_of_indexes([series.index for series in series_dict.values()])
+
+    cube = np.full((len(index), len(instrument_list), len(rule_list)), np.nan)
+
+    # nearly all series share a few indexes, so only look up positions once each
+    positions_by_index_id = {}
+    for instrument_idx, instrument_code in enumerate(instrument_list):
+        for rule_idx, rule_variation_name in enumerate(rule_list):
+            series = series_dict[(instrument_code, rule_variation_name)]
+            series_index = series.index
+            positions = positions_by_index_id.get(id(series_index), None)
+            if positions is None:
+                positions = _positions_in_index(series_index, index, ffill=ffill)
+                positions_by_index_id[id(series_index)] = positions
+
+            if positions is None:
+                # some dates aren't in index, or need filling
+                series = series.reindex(index, method="ffill" if ffill else None)
+                positions = slice(None)
+
+            cube[positions, instrument_idx, rule_idx] = series.to_numpy(
+                dtype=float, na_value=np.nan
+            )
+
+    return cube, index
+
+
+def _positions_in_index(series_index: pd.Index, index: pd.Index, ffill: bool):
+    # None if the series has to be reindexed instead
+    if series_index.equals(index):
+        return slice(None)
+    if ffill:
+        return None
+
+    positions = index.get_indexer(series_index)
+    if (positions < 0).any():
+        return None
+
+    return positions
+
+
+def _union_of_indexes(list_of_indexes: list) -> pd.Index:
+    if len(list_of_indexes) == 0:
+        return pd.DatetimeIndex([])
+
+    index = list_of_indexes[0]
+    for other_index in list_of_indexes[1:]:
+        if other_index is index or other_index.equals(index):
+            continue
+        index = index.union(other_index)
+
+    return index
+
+
 def _get_instrument_code_depending_on_pooling_status(
     instrument_code: str, forecast_scalar_config: dict
 ) -> str:
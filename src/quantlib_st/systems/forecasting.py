@@ -1,8 +1,27 @@
+import time
+from functools import partial
+from typing import Optional
+
+import numpy as np
 import pandas as pd
 
+from quantlib_st.config.configdata import Config
+from quantlib_st.core.genutils import str2Bool
 from quantlib_st.systems.stage import SystemStage
-from quantlib_st.systems.system_cache import output, dont_cache
-from quantlib_st.systems.trading_rules import TradingRule
+from quantlib_st.core.objects import resolve_data_method
+from quantlib_st.systems.system_cache import cacheRef, output, diagnostic, dont_cache
+from quantlib_st.systems.trading_rules import (
+    TradingRule,
+    compiledRulePlan,
+    DEFAULT_PRICE_SOURCE,
+)
+from quantlib_st.systems.tools.parallel import (
+    PROCESS_EXECUTOR,
+    call_method_in_worker_and_return_results_and_cache_updates,
+    call_system_method_with_list_of_args,
+    get_pool_executor,
+    initialise_worker_with_system,
+)
 
 
 class Rules(SystemStage):
@@ -27,6 +46,13 @@ class Rules(SystemStage):
     KEY INPUT: Depends on trading rule(s) data argument
     KEY OUTPUT: system.rules.get_raw_forecast(instrument_code, rule_variation_name)
                 system.rules.trading_rules()
+                system.rules.get_all_raw_forecasts() to fill the cache in a pool
+
+    If config.use_panel_rules is True, rules whose function is decorated with
+    @panel_capable are called once for all instruments, see get_raw_forecast
+
+    If config.use_rule_families is True, variations of rules whose function is
+    decorated with @rule_family are calculated together for each instrument
 
     Name: rules
     """
@@ -57,6 +83,20 @@ class Rules(SystemStage):
         # ... store the ones we've been passed for now
         self._passed_trading_rules = trading_rules
 
+        # rule name -> names of rules that can be calculated with it
+        self._rule_families = None
+
+        # rules bound to the system, see compiled_rule_plan
+        self._compiled_rule_plan = None
+
+    def __getstate__(self):
+        # the plan holds bound methods and read only dicts, which don't pickle;
+        # it's rebuilt on first use
+        state = self.__dict__.copy()
+        state["_compiled_rule_plan"] = None
+
+        return state
+
     @property
     def name(self):  # type: ignore
         return "rules"
@@ -82,25 +122,361 @@ class Rules(SystemStage):
 
         This forecast will need scaling and capping later
 
+        If we're using panel rules and the rule is panel capable, we calculate
+        the forecast for every instrument that isn't in the cache yet in one
+        call, and put the others in the cache. Otherwise if we're using rule
+        families we calculate every variation in this rule's family that isn't
+        in the cache yet for this instrument, and put the others in the cache
+
         KEY OUTPUT
 
         """
 
-        system = self.parent
-
         self.log.debug(
             "Calculating raw forecast %s for %s"
             % (instrument_code, rule_variation_name),
             instrument_code=instrument_code,
         )
-        # this will process all the rules, if not already done
+        if self._use_panel_for_rule(rule_variation_name):
+            result = self._get_raw_forecast_from_panel(
+                instrument_code, rule_variation_name
+            )
+        elif self._use_family_for_rule(rule_variation_name):
+            result = self._get_raw_forecast_from_family(
+                instrument_code, rule_variation_name
+            )
+        else:
+            # this will process and compile all the rules, if not already done
+            compiled_rule = self.compiled_rule_plan()[rule_variation_name]
+            result = compiled_rule.call(instrument_code)
+        result = pd.Series(result)
+
+        return result
+
+    def get_all_raw_forecasts(
+        self,
+        instrument_list: Optional[list] = None,
+        rule_list: Optional[list] = None,
+        executor: str = PROCESS_EXECUTOR,
+        max_workers: Optional[int] = None,
+    ) -> "rawForecastGrid":
+        """
+        Calculate the raw forecast for every instrument x rule in a pool, and
+        store them in the cache where get_raw_forecast will find them
+
+        Each instrument is one task. Within it each rule goes through
+        get_raw_forecast, so panel and family rules are calculated as they
+        would be one at a time, and is timed; a rule that fails doesn't stop
+        the others.
+
+        :param instrument_list: default all instruments in the system
+        :param rule_list: default all rules
+        :param executor: "process" or "thread"
+        :param max_workers: size of pool (default: as many as there are cores)
+
+        :returns: rawForecastGrid, with the time each forecast took and failures
+        """
+        system = self.parent
+        if not system.cache.are_we_caching():
+            raise Exception(
+                "get_all_raw_forecasts puts the forecasts in the cache, so caching must be on"
+            )
+
+        if instrument_list is None:
+            instrument_list = system.get_instrument_list()
+        if rule_list is None:
+            rule_list = list(self.trading_rules().keys())
+
+        method_path = "%s._calculate_raw_forecasts_for_instrument" % self.name
+        args_by_instrument = [
+            [(instrument_code, tuple(rule_list))] for instrument_code in instrument_list
+        ]
+
+        if executor == PROCESS_EXECUTOR:
+            pool = get_pool_executor(
+                executor=executor,
+                max_workers=max_workers,
+                initializer=initialise_worker_with_system,
+                initargs=(system,),
+            )
+            list_of_results = []
+            with pool:
+                for results, new_cache_items, dependency_graph_as_dict in pool.map(
+                    partial(
+                        call_method_in_worker_and_return_results_and_cache_updates,
+                        method_path,
+                    ),
+                    args_by_instrument,
+                ):
+                    system.cache.merge_items(new_cache_items)
+                    system.cache.dependency_graph.merge(dependency_graph_as_dict)
+                    list_of_results.append(results)
+        else:
+            with get_pool_executor(executor=executor, max_workers=max_workers) as pool:
+                list_of_results = list(
+                    pool.map(
+                        partial(
+                            call_system_method_with_list_of_args, system, method_path
+                        ),
+                        args_by_instrument,
+                    )
+                )
+
+        timings = pd.DataFrame(np.nan, index=instrument_list, columns=rule_list)
+        failures = {}
+        for results in list_of_results:
+            for (instrument_code, _), results_for_instrument in results.items():
+                for rule_name, rule_result in results_for_instrument.items():
+                    seconds, error_message = rule_result
+                    timings.loc[instrument_code, rule_name] = seconds
+                    if error_message is not None:
+                        failures[(instrument_code, rule_name)] = error_message
+
+        return rawForecastGrid(timings=timings, failures=failures)
+
+    @dont_cache
+    def _calculate_raw_forecasts_for_instrument(
+        self, instrument_code: str, rule_list: tuple
+    ) -> dict:
+        """
+        Used by get_all_raw_forecasts; forecasts go in the cache
+
+        :returns: dict, rule name -> (seconds taken to calculate the forecast
+            or NaN if it was already in the cache, error message or None)
+        """
+        cache = self.parent.cache
+
+        results = {}
+        for rule_name in rule_list:
+            cache_ref = self._raw_forecast_cache_ref(instrument_code, rule_name)
+            if cache_ref in cache:
+                # including variations calculated along with an earlier rule
+                results[rule_name] = (np.nan, None)
+                continue
+
+            try:
+                start_time = time.perf_counter()
+                self.get_raw_forecast(instrument_code, rule_name)
+                seconds = time.perf_counter() - start_time
+
+                results[rule_name] = (seconds, None)
+            except Exception as e:
+                self.log.warning(
+                    "Raw forecast %s for %s failed: %s"
+                    % (rule_name, instrument_code, str(e)),
+                    instrument_code=instrument_code,
+                )
+                results[rule_name] = (np.nan, "%s: %s" % (type(e).__name__, str(e)))
+
+        return results
+
+    @property
+    def config(self) -> Config:
+        return self.parent.config
+
+    @dont_cache
+    def use_panel_rules(self) -> bool:
+        return str2Bool(self.config.use_panel_rules)
+
+    def _use_panel_for_rule(self, rule_variation_name: str) -> bool:
+        if not self.use_panel_rules():
+            return False
+
+        # without a cache there's nowhere to put the other instruments' forecasts
+        if not self.parent.cache.are_we_caching():
+            return False
+
+        trading_rule = self.trading_rules()[rule_variation_name]
+
+        return trading_rule.panel_capable
+
+    def _get_raw_forecast_from_panel(
+        self, instrument_code: str, rule_variation_name: str
+    ) -> pd.Series:
+        system = self.parent
+        cache = system.cache
+        trading_rule = self.trading_rules()[rule_variation_name]
+        compiled_rule = self.compiled_rule_plan()[rule_variation_name]
+
+        data_by_instrument = {
+            instrument_code: compiled_rule.get_data_for_instrument(instrument_code)
+        }
+        other_instruments = [
+            other_code
+            for other_code in system.get_instrument_list()
+            if other_code != instrument_code
+            and self._raw_forecast_cache_ref(other_code, rule_variation_name)
+            not in cache
+        ]
+        for other_code in other_instruments:
+            try:
+                with cache.tracking_calculation_of(
+                    self._raw_forecast_cache_ref(other_code, rule_variation_name)
+                ):
+                    data_by_instrument[other_code] = (
+                        compiled_rule.get_data_for_instrument(other_code)
+                    )
+            except Exception as e:
+                # it can fail again on its own when someone asks for it
+                self.log.warning(
+                    "Leaving %s out of panel for %s: %s"
+                    % (other_code, rule_variation_name, str(e)),
+                    instrument_code=other_code,
+                )
+
+        self.log.debug(
+            "Calculating raw forecast %s for %d instruments at once"
+            % (rule_variation_name, len(data_by_instrument)),
+        )
+        forecasts = trading_rule.call_panel_with_data(data_by_instrument)
+
+        for other_code, forecast in forecasts.items():
+            if other_code == instrument_code:
+                continue
+            cache.set_item_in_cache(
+                pd.Series(forecast),
+                self._raw_forecast_cache_ref(other_code, rule_variation_name),
+            )
+
+        return forecasts[instrument_code]
+
+    @dont_cache
+    def use_rule_families(self) -> bool:
+        return str2Bool(self.config.use_rule_families)
+
+    def _use_family_for_rule(self, rule_variation_name: str) -> bool:
+        if not self.use_rule_families():
+            return False
+
+        if not self.parent.cache.are_we_caching():
+            return False
+
+        family = self.rule_families()[rule_variation_name]
+
+        return len(family) > 1
+
+    def _get_raw_forecast_from_family(
+        self, instrument_code: str, rule_variation_name: str
+    ) -> pd.Series:
+        system = self.parent
+        cache = system.cache
         trading_rule_dict = self.trading_rules()
         trading_rule = trading_rule_dict[rule_variation_name]
 
-        result = trading_rule.call(system, instrument_code)
-        result = pd.Series(result)
+        rule_names_to_calculate = [rule_variation_name] + [
+            other_rule_name
+            for other_rule_name in self.rule_families()[rule_variation_name]
+            if other_rule_name != rule_variation_name
+            and self._raw_forecast_cache_ref(instrument_code, other_rule_name)
+            not in cache
+        ]
 
-        return result
+        list_of_data_for_call = self.compiled_rule_plan()[
+            rule_variation_name
+        ].get_data_for_instrument(instrument_code)
+        list_of_forecasts = trading_rule.call_family_with_data(
+            list_of_data_for_call,
+            [trading_rule_dict[rule_name] for rule_name in rule_names_to_calculate],
+        )
+
+        # all the family used the same inputs as this rule
+        this_cache_ref = self._raw_forecast_cache_ref(
+            instrument_code, rule_variation_name
+        )
+        inputs_used = cache.dependency_graph.children_of(this_cache_ref)
+
+        for other_rule_name, forecast in zip(
+            rule_names_to_calculate[1:], list_of_forecasts[1:]
+        ):
+            other_cache_ref = self._raw_forecast_cache_ref(
+                instrument_code, other_rule_name
+            )
+            cache.dependency_graph.add_item(other_cache_ref)
+            for input_cache_ref in inputs_used:
+                cache.dependency_graph.add_dependency(other_cache_ref, input_cache_ref)
+
+            cache.set_item_in_cache(pd.Series(forecast), other_cache_ref)
+
+        return list_of_forecasts[0]
+
+    @dont_cache
+    def compiled_rule_plan(self) -> compiledRulePlan:
+        """
+        The trading rules bound to this system: built once, so calling a rule
+        doesn't resolve its function or data methods, or copy its arguments
+
+        Use .as_df() to see what each rule will call
+
+        :returns: compiledRulePlan
+        """
+        if self._compiled_rule_plan is None:
+            self._compiled_rule_plan = compiledRulePlan(
+                self.trading_rules(), self.parent
+            )
+
+        return self._compiled_rule_plan
+
+    @dont_cache
+    def rule_families(self) -> dict:
+        """
+        For each rule, the names of the rules (including itself) in the same
+        family: variations of a rule function decorated with @rule_family
+        that use the same data
+
+        :returns: dict, rule name -> list of rule names
+        """
+        if self._rule_families is not None:
+            return self._rule_families
+
+        trading_rule_dict = self.trading_rules()
+        rule_families = {}
+        for rule_name, trading_rule in trading_rule_dict.items():
+            rule_families[rule_name] = [
+                other_rule_name
+                for other_rule_name, other_rule in trading_rule_dict.items()
+                if other_rule_name == rule_name
+                or trading_rule.in_same_family_as(other_rule)
+            ]
+
+        self._rule_families = rule_families
+
+        return rule_families
+
+    @diagnostic()
+    def get_ewma(
+        self,
+        instrument_code: str,
+        span: int,
+        price_source: str = DEFAULT_PRICE_SOURCE,
+    ) -> pd.Series:
+        """
+        Exponentially weighted moving average of a price, cached for each
+        instrument, price source and span, so rules that use it as data and
+        share spans only smooth once. Family functions such as ewmac_family
+        don't go through it. Rules can use it as data, eg
+
+        data: ["rules.get_ewma", "rules.get_ewma"]
+        other_args: {_span: 16, __span: 64}
+
+        :param span: EWMA span in days
+        :param price_source: str pointing to the price method, as in rule data
+        :returns: pd.Series
+        """
+        price_method = resolve_data_method(self.parent, price_source)
+        price = price_method(instrument_code)
+
+        return price.ewm(span=span, min_periods=1).mean()
+
+    def _raw_forecast_cache_ref(
+        self, instrument_code: str, rule_variation_name: str
+    ) -> cacheRef:
+        # the same reference the @output decorator uses for get_raw_forecast
+        return cacheRef(
+            self.name,
+            "get_raw_forecast",
+            instrument_code=instrument_code,
+            keyname=rule_variation_name,
+        )
 
     @dont_cache
     def trading_rules(self):
@@ -162,6 +538,42 @@ class Rules(SystemStage):
         return forecasting_config_rules
 
 
+class rawForecastGrid(object):
+    """
+    What happened when we calculated a grid of raw forecasts, see
+    Rules.get_all_raw_forecasts. The forecasts themselves are in the cache.
+    """
+
+    def __init__(self, timings: pd.DataFrame, failures: dict):
+        self._timings = timings
+        self._failures = failures
+
+    def __repr__(self):
+        return "rawForecastGrid %d instruments x %d rules, %d failures" % (
+            len(self.timings.index),
+            len(self.timings.columns),
+            len(self.failures),
+        )
+
+    @property
+    def timings(self) -> pd.DataFrame:
+        """
+        Seconds each rule took to call, instruments x rules. NaN if the
+        forecast was already in the cache or failed
+        """
+        return self._timings
+
+    @property
+    def failures(self) -> dict:
+        """
+        dict, (instrument_code, rule name) -> error message
+        """
+        return self._failures
+
+    def all_succeeded(self) -> bool:
+        return len(self.failures) == 0
+
+
 def process_trading_rules(passed_rules) -> dict:
     """
 
@@ -1,6 +1,67 @@
 import numpy as np
+import pandas as pd
 
+from quantlib_st.core.maths import rolling_max_and_min_for_lookbacks
+from quantlib_st.systems.trading_rules import panel_capable, rule_family
 
+
+def breakout_family(price, list_of_other_args):
+    """
+    Calculate several breakout variations at once, see breakout
+
+    The rolling max and min for every lookback come from one sparse table built
+    from the price, rather than two rolling passes per lookback.
+
+    :param price: The price or other series to use (assumed Tx1)
+    :type price: pd.Series
+
+    :param list_of_other_args: list of dicts with optional keys lookback and smooth
+
+    :returns: pd.DataFrame -- T x number of variations, unscaled, uncapped forecasts
+    """
+    list_of_lookbacks = [
+        other_args.get("lookback", 10) for other_args in list_of_other_args
+    ]
+    list_of_smooths = [
+        other_args.get("smooth", None) for other_args in list_of_other_args
+    ]
+    list_of_smooths = [
+        max(int(lookback / 4.0), 1) if smooth is None else smooth
+        for lookback, smooth in zip(list_of_lookbacks, list_of_smooths)
+    ]
+    for lookback, smooth in zip(list_of_lookbacks, list_of_smooths):
+        assert smooth < lookback
+
+    list_of_min_periods = [
+        int(min(len(price), np.ceil(lookback / 2.0))) for lookback in list_of_lookbacks
+    ]
+
+    price_values = price.to_numpy(dtype=float)
+    roll_max, roll_min = rolling_max_and_min_for_lookbacks(
+        price_values, list_of_lookbacks, list_of_min_periods
+    )
+    roll_mean = (roll_max + roll_min) / 2.0
+
+    # gives a nice natural scaling
+    with np.errstate(divide="ignore", invalid="ignore"):
+        output = 40.0 * (
+            (price_values[:, np.newaxis] - roll_mean) / (roll_max - roll_min)
+        )
+    output = pd.DataFrame(output, index=price.index)
+
+    smoothed_output = pd.concat(
+        [
+            output[column].ewm(span=smooth, min_periods=np.ceil(smooth / 2.0)).mean()
+            for column, smooth in enumerate(list_of_smooths)
+        ],
+        axis=1,
+    )
+
+    return smoothed_output
+
+
+@panel_capable
+@rule_family(breakout_family)
 def breakout(price, lookback=10, smooth=None):
     """
     :param price: The price or other series to use (assumed Tx1)
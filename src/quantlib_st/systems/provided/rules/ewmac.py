@@ -1,4 +1,60 @@
+import pandas as pd
+
 from quantlib_st.estimators.vol import robust_vol_calc
+from quantlib_st.systems.trading_rules import panel_capable, rule_family
+
+
+def ewmac_family(price, vol, list_of_other_args):
+    """
+    Calculate several ewmac variations at once, see ewmac
+
+    Each distinct span is only smoothed once. In the usual set of variations
+    (2/8, 4/16, 8/32 ... 64/256) each slow span is the next variation's fast
+    span, so this does about half the EWMA work of calling ewmac for each.
+
+    :param price: The price or other series to use (assumed Tx1)
+    :type price: pd.Series
+
+    :param vol: The daily price unit volatility (NOT % vol)
+    :type vol: pd.Series aligned to price
+
+    :param list_of_other_args: list of dicts with keys Lfast and Lslow
+
+    :returns: pd.DataFrame -- one column of unscaled, uncapped forecasts per
+        element of list_of_other_args
+    """
+    list_of_span_pairs = [
+        (other_args["Lfast"], other_args["Lslow"]) for other_args in list_of_other_args
+    ]
+
+    return _ewmac_for_list_of_span_pairs(price, vol, list_of_span_pairs)
+
+
+def ewmac_forecast_with_defaults_no_vol_family(price, vol, list_of_other_args):
+    """
+    As ewmac_family, filling in the defaults of ewmac_forecast_with_defaults_no_vol
+    """
+    list_of_span_pairs = [
+        (other_args.get("Lfast", 16), other_args.get("Lslow", 32))
+        for other_args in list_of_other_args
+    ]
+
+    return _ewmac_for_list_of_span_pairs(price, vol, list_of_span_pairs)
+
+
+def _ewmac_for_list_of_span_pairs(price, vol, list_of_span_pairs: list):
+    all_spans = set([span for span_pair in list_of_span_pairs for span in span_pair])
+    ewma_by_span = dict(
+        [(span, price.ewm(span=span, min_periods=1).mean()) for span in all_spans]
+    )
+    vol = vol.ffill()
+
+    list_of_forecasts = [
+        (ewma_by_span[Lfast] - ewma_by_span[Lslow]) / vol
+        for Lfast, Lslow in list_of_span_pairs
+    ]
+
+    return pd.concat(list_of_forecasts, axis=1, keys=range(len(list_of_forecasts)))
 
 
 def ewmac_forecast_with_defaults(price, Lfast=32, Lslow=128):
@@ -40,6 +96,8 @@ def ewmac_forecast_with_defaults(price, Lfast=32, Lslow=128):
     return ans
 
 
+@panel_capable
+@rule_family(ewmac_forecast_with_defaults_no_vol_family)
 def ewmac_forecast_with_defaults_no_vol(price, vol, Lfast=16, Lslow=32):
     """
     ONLY USED FOR EXAMPLES
@@ -76,6 +134,8 @@ def ewmac_forecast_with_defaults_no_vol(price, vol, Lfast=16, Lslow=32):
     return ans
 
 
+@panel_capable
+@rule_family(ewmac_family)
 def ewmac(price, vol, Lfast, Lslow):
     """
     Calculate the ewmac trading rule forecast, given a price, volatility and EWMA speeds Lfast and Lslow
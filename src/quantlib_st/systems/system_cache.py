@@ -16,8 +16,13 @@ from quantlib_st.core.fileutils import resolve_path_and_filename_for_package
 
 import pickle
 import bz2
+import threading
+from contextlib import contextmanager
 from functools import wraps
 
+from quantlib_st.core.pandas.pdutils import make_read_only, read_only_view
+from quantlib_st.systems.tools.cache_profiler import cacheProfiler
+
 """
 This is used for items which affect an entire system, not just one instrument
 """
@@ -142,16 +147,244 @@ class cacheElement(object):
         return not self._not_pickable
 
 
+class cacheDependencyGraph(object):
+    """
+    Records which cached items were used to build which
+
+    Edges go from a parent cacheRef to the child cacheRefs it asked for while
+    it was being calculated, eg get_capped_forecast -> get_raw_forecast
+
+    Edges are kept when items are deleted from the cache, since recalculating
+    an item would just record the same edges again
+    """
+
+    def __init__(self):
+        self._children = {}
+        self._parents = {}
+        self._local = threading.local()
+
+    def __repr__(self):
+        return "cacheDependencyGraph with %d items" % len(self.all_cache_refs())
+
+    # thread locals can't be pickled, eg when a system is sent to another process
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_local"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def add_dependency(self, parent_cache_ref, child_cache_ref):
+        self._children.setdefault(parent_cache_ref, set()).add(child_cache_ref)
+        self._parents.setdefault(child_cache_ref, set()).add(parent_cache_ref)
+
+    def add_item(self, cache_ref):
+        self._children.setdefault(cache_ref, set())
+        self._parents.setdefault(cache_ref, set())
+
+    def record_call(self, cache_ref):
+        """
+        Record that cache_ref is being asked for; if we're inside the
+        calculation of another item, it becomes a child of that item
+        """
+        self.add_item(cache_ref)
+        calling_cache_ref = self.currently_calculating()
+        if calling_cache_ref is not None:
+            self.add_dependency(calling_cache_ref, cache_ref)
+
+    def start_calculating(self, cache_ref):
+        self._stack.append(cache_ref)
+
+    def finish_calculating(self):
+        self._stack.pop()
+
+    def currently_calculating(self):
+        stack = self._stack
+        if len(stack) == 0:
+            return None
+
+        return stack[-1]
+
+    @property
+    def _stack(self) -> list:
+        # one stack per thread, so this works with System.precompute
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        return stack
+
+    def all_cache_refs(self) -> listOfCacheRefs:
+        return listOfCacheRefs(list(self._children.keys()))
+
+    def children_of(self, cache_ref) -> listOfCacheRefs:
+        return listOfCacheRefs(list(self._children.get(cache_ref, set())))
+
+    def parents_of(self, cache_ref) -> listOfCacheRefs:
+        return listOfCacheRefs(list(self._parents.get(cache_ref, set())))
+
+    def downstream_of(self, cache_ref_list) -> listOfCacheRefs:
+        """
+        Everything that was built, directly or indirectly, from cache_ref_list
+
+        Doesn't include the items in cache_ref_list themselves
+        """
+        return self._closure(cache_ref_list, self._parents)
+
+    def upstream_of(self, cache_ref_list) -> listOfCacheRefs:
+        """
+        Everything that was used, directly or indirectly, to build cache_ref_list
+
+        Doesn't include the items in cache_ref_list themselves
+        """
+        return self._closure(cache_ref_list, self._children)
+
+    def _closure(self, cache_ref_list, edges: dict) -> listOfCacheRefs:
+        if isinstance(cache_ref_list, cacheRef):
+            cache_ref_list = [cache_ref_list]
+
+        starting_refs = set(cache_ref_list)
+        found = set()
+        to_visit = list(starting_refs)
+        while len(to_visit) > 0:
+            next_ref = to_visit.pop()
+            for connected_ref in edges.get(next_ref, set()):
+                if connected_ref not in found:
+                    found.add(connected_ref)
+                    to_visit.append(connected_ref)
+
+        return listOfCacheRefs(list(found.difference(starting_refs)))
+
+    def as_dict(self) -> dict:
+        """
+        :returns: dict, keys are cacheRef, values are list of child cacheRef
+        """
+        return dict(
+            [
+                (cache_ref, list(children))
+                for cache_ref, children in self._children.items()
+            ]
+        )
+
+    def merge(self, graph_as_dict: dict):
+        """
+        Add the edges from as_dict() of another graph, eg built in another process
+        """
+        for parent_cache_ref, list_of_children in graph_as_dict.items():
+            self.add_item(parent_cache_ref)
+            for child_cache_ref in list_of_children:
+                self.add_item(child_cache_ref)
+                self.add_dependency(parent_cache_ref, child_cache_ref)
+
+    def generations(self) -> list:
+        """
+        Group items so that everything in a generation only depends on items in
+        earlier generations. Items within a generation can be calculated
+        concurrently.
+
+        :returns: list of listOfCacheRefs, leaves first
+        """
+        number_of_children_left = dict(
+            [
+                (cache_ref, len(children))
+                for cache_ref, children in self._children.items()
+            ]
+        )
+        current_generation = [
+            cache_ref
+            for cache_ref, count in number_of_children_left.items()
+            if count == 0
+        ]
+
+        all_generations = []
+        while len(current_generation) > 0:
+            all_generations.append(listOfCacheRefs(current_generation))
+            next_generation = []
+            for cache_ref in current_generation:
+                for parent_cache_ref in self._parents.get(cache_ref, set()):
+                    number_of_children_left[parent_cache_ref] -= 1
+                    if number_of_children_left[parent_cache_ref] == 0:
+                        next_generation.append(parent_cache_ref)
+
+            current_generation = next_generation
+
+        return all_generations
+
+
 class systemCache(dict):
     def __init__(self, parent_system):
         super().__init__()
         self._parent = parent_system  # so we can access the instrument list
+        self._dependency_graph = cacheDependencyGraph()
+        self._profiler = None
         self.set_caching_on()
+        self.set_read_only_off()
 
     @property
     def parent(self):
         return self._parent
 
+    @property
+    def dependency_graph(self) -> cacheDependencyGraph:
+        return self._dependency_graph
+
+    @property
+    def profiler(self) -> cacheProfiler | None:
+        return self._profiler
+
+    def start_profiling(self, by_instrument: bool = False) -> cacheProfiler:
+        """
+        Start recording calls, hits, misses, time and result size for each
+        cached method. Replaces any existing profile.
+
+        Only works when caching is on
+
+        :param by_instrument: break stats down by instrument as well
+        :returns: cacheProfiler
+        """
+        self._profiler = cacheProfiler(by_instrument=by_instrument)
+
+        return self._profiler
+
+    def stop_profiling(self) -> cacheProfiler | None:
+        """
+        Stop recording; the stats so far are returned
+        """
+        profiler = self._profiler
+        self._profiler = None
+
+        return profiler
+
+    @contextmanager
+    def profiling(self, by_instrument: bool = False):
+        """
+        with system.cache.profiling() as profiler:
+            system.forecastScaleCap.get_capped_forecast("EDOLLAR", "ewmac8")
+
+        profiler.as_df()
+        """
+        profiler = self.start_profiling(by_instrument=by_instrument)
+        try:
+            yield profiler
+        finally:
+            self.stop_profiling()
+
+    @contextmanager
+    def tracking_calculation_of(self, cache_ref):
+        """
+        Cached items used inside the block are recorded in the dependency graph
+        as inputs to cache_ref. For items which are calculated along with another
+        item and put in the cache directly, eg by Rules in panel mode
+        """
+        self.dependency_graph.add_item(cache_ref)
+        self.dependency_graph.start_calculating(cache_ref)
+        try:
+            yield
+        finally:
+            self.dependency_graph.finish_calculating()
+
     def set_caching_on(self):
         self._caching_on = True
 
@@ -161,6 +394,23 @@ class systemCache(dict):
     def are_we_caching(self):
         return self._caching_on
 
+    def set_read_only_on(self):
+        """
+        From now on the data of pd.Series and pd.DataFrame put in the cache is
+        marked read only, and each lookup returns a view on it rather than the
+        object itself. Nothing is copied, but anything that tries to modify a
+        cached value in place raises a ValueError instead of corrupting the cache.
+
+        Items already in the cache are left alone.
+        """
+        self._read_only = True
+
+    def set_read_only_off(self):
+        self._read_only = False
+
+    def are_we_read_only(self):
+        return self._read_only
+
     def __repr__(self):
         if self.are_we_caching():
             list_of_elements = ", ".join(
@@ -265,6 +515,42 @@ class systemCache(dict):
         for itemname in cache_from_pickled.keys():
             self[itemname] = cache_from_pickled[itemname]
 
+    def pickable_items_not_in(self, existing_cache_refs) -> dict:
+        """
+        Return pickable items in the cache which aren't in existing_cache_refs
+
+        Used to send back results calculated in another process
+
+        :param existing_cache_refs: cache refs to exclude
+        :type existing_cache_refs: set of cacheRef
+
+        :returns: dict of cacheRef: cacheElement
+        """
+
+        new_items = dict(
+            [
+                (cache_ref, self[cache_ref])
+                for cache_ref in self._get_pickable_items()
+                if cache_ref not in existing_cache_refs
+            ]
+        )
+
+        return new_items
+
+    def merge_items(self, cache_items: dict, overwrite: bool = False):
+        """
+        Merge cache elements (eg calculated in another process) into the cache
+
+        :param cache_items: dict of cacheRef: cacheElement
+        :param overwrite: replace items we already have?
+
+        :returns: None
+        """
+
+        for cache_ref, cache_element in cache_items.items():
+            if overwrite or cache_ref not in self:
+                self[cache_ref] = cache_element
+
     def _get_protected_items(self):
         """
         Return items in the cache which are protected
@@ -441,6 +727,46 @@ class systemCache(dict):
             cache_ref_list, delete_protected=delete_protected
         )
 
+    def delete_items_downstream_of(
+        self, cache_ref_list, delete_protected=False, include_items=True
+    ):
+        """
+        Delete everything in the cache that was built, directly or indirectly,
+        from the items in cache_ref_list
+
+        Unlike delete_items_for_instrument this leaves anything that doesn't
+        depend on the changed items alone
+
+        :param cache_ref_list: changed item(s)
+        :type cache_ref_list: cacheRef or list of cacheRef
+
+        :param deleted_protected: Delete everything, even stuff in self.protected?
+        :type delete_protected: bool
+
+        :param include_items: Also delete the items in cache_ref_list themselves?
+        :type include_items: bool
+
+        :returns: listOfCacheRefs that were in the cache and have been deleted
+        """
+        if isinstance(cache_ref_list, cacheRef):
+            cache_ref_list = [cache_ref_list]
+
+        cache_refs_to_delete = self.dependency_graph.downstream_of(cache_ref_list)
+        if include_items:
+            cache_refs_to_delete = cache_refs_to_delete + list(cache_ref_list)
+
+        cache_refs_to_delete = [
+            cache_ref for cache_ref in cache_refs_to_delete if cache_ref in self
+        ]
+        if not delete_protected:
+            cache_refs_to_delete = self.cache_ref_list_with_protected_removed(
+                cache_refs_to_delete
+            )
+
+        self._delete_elements_in_cache_ref_list_dangerous(cache_refs_to_delete)
+
+        return listOfCacheRefs(cache_refs_to_delete)
+
     def delete_elements_in_cache_ref_list(self, cache_ref_list, delete_protected=False):
         """
         Delete everything in the cache
@@ -500,6 +826,8 @@ class systemCache(dict):
 
         :returns: nothing
         """
+        if self.are_we_read_only():
+            value = make_read_only(value)
 
         self[cache_ref] = cacheElement(
             value, protected=protected, not_pickable=not_pickable
@@ -520,6 +848,9 @@ class systemCache(dict):
         if cache_element is MISSING_FROM_CACHE:
             return MISSING_FROM_CACHE
 
+        if self.are_we_read_only():
+            return read_only_view(cache_element.value())
+
         return cache_element.value()
 
     def get_instrument_list(self):
@@ -534,6 +865,7 @@ class systemCache(dict):
         not_pickable=False,
         instrument_classify=True,
         use_arg_names=True,
+        track_dependencies=True,
         **kwargs,
     ):
         """
@@ -555,6 +887,8 @@ class systemCache(dict):
         :param protected: status flag; only set if the value is missing from the dict
         :param nopickle: status flag; only set if the value is missing from the dict
 
+        :param track_dependencies: if True we record this item in the dependency graph, as a child of any item being calculated
+
         :returns: contents of cache or result of calling function
 
 
@@ -575,15 +909,57 @@ class systemCache(dict):
             **kwargs,
         )
 
+        if track_dependencies:
+            self.dependency_graph.record_call(cache_ref)
+
         value = self._get_item_from_cache(cache_ref)
+        profiler = self.profiler
+
+        if value is not MISSING_FROM_CACHE and profiler is not None:
+            profiler.record_hit(cache_ref)
 
         if value is MISSING_FROM_CACHE:
             # call the function. Note in the original function 'this_stage' was
             # 'self'
-            value = func(this_stage, *args, **kwargs)
+            value = self._calculate_value(
+                func,
+                this_stage,
+                *args,
+                cache_ref=cache_ref,
+                track_dependencies=track_dependencies,
+                **kwargs,
+            )
             self.set_item_in_cache(
                 value, cache_ref, protected=protected, not_pickable=not_pickable
             )
+            if self.are_we_read_only():
+                value = read_only_view(value)
+
+        return value
+
+    def _calculate_value(
+        self, func, this_stage, *args, cache_ref, track_dependencies=True, **kwargs
+    ):
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start_calculating()
+
+        # anything cached that func asks for becomes a child of cache_ref
+        if track_dependencies:
+            self.dependency_graph.start_calculating(cache_ref)
+
+        try:
+            value = func(this_stage, *args, **kwargs)
+        except BaseException:
+            if profiler is not None:
+                profiler.abandon_calculating()
+            raise
+        finally:
+            if track_dependencies:
+                self.dependency_graph.finish_calculating()
+
+        if profiler is not None:
+            profiler.finish_calculating(cache_ref, value)
 
         return value
 
@@ -776,6 +1152,7 @@ def base_system_cache(protected=False, not_pickable=False):
                 not_pickable=not_pickable,
                 instrument_classify=False,
                 use_arg_names=False,
+                track_dependencies=False,
                 **kwargs,
             )
 
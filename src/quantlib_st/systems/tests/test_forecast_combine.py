@@ -0,0 +1,69 @@
+import pytest
+
+from quantlib_st.config.configdata import Config
+from quantlib_st.sysdata.sim.csv_futures_sim_test_data import CsvFuturesSimTestData
+from quantlib_st.systems.accounts.accounts_stage import Account
+from quantlib_st.systems.basesystem import System
+from quantlib_st.systems.forecast_combine import ForecastCombine
+from quantlib_st.systems.forecast_scale_cap import ForecastScaleCap
+from quantlib_st.systems.forecasting import Rules
+from quantlib_st.systems.rawdata import RawData
+
+
+def _system_with_forecast_weights(forecast_weights=None) -> System:
+    config = Config("systems.provided.config.test_forecast_config.yaml")
+    if forecast_weights is not None:
+        config.forecast_weights = forecast_weights
+
+    return System(
+        [Account(), ForecastScaleCap(), RawData(), Rules(), ForecastCombine()],
+        CsvFuturesSimTestData(),
+        config,
+    )
+
+
+def test_has_same_rules_as_code_uses_grouping_index():
+    system = _system_with_forecast_weights()
+
+    assert system.combForecast.has_same_rules_as_code("EDOLLAR") == [
+        "EDOLLAR",
+        "US10",
+    ]
+    assert system.accounts.has_same_rules_as_code("US10") == ["EDOLLAR", "US10"]
+
+    index = system.combForecast.rule_grouping_index()
+    assert index.list_of_groups() == [["EDOLLAR", "US10"]]
+
+
+def test_instruments_with_different_rules_are_not_pooled():
+    system = _system_with_forecast_weights(
+        dict(
+            EDOLLAR=dict(ewmac8=0.5, ewmac16=0.5),
+            US10=dict(ewmac8=1.0),
+        )
+    )
+
+    assert system.combForecast.has_same_rules_as_code("EDOLLAR") == ["EDOLLAR"]
+    assert system.combForecast.has_same_rules_as_code("US10") == ["US10"]
+    assert len(system.combForecast.rule_grouping_index()) == 2
+
+    with pytest.raises(Exception):
+        system.combForecast.rule_grouping_index().instruments_with_same_rules_as(
+            "NOT_AN_INSTRUMENT"
+        )
+
+
+def test_estimated_forecast_diversification_multiplier():
+    system = _system_with_forecast_weights()
+    system.config.use_forecast_div_mult_estimates = True
+
+    correlation_list = system.combForecast.get_forecast_correlation_matrices("EDOLLAR")
+    assert correlation_list.column_names == ["ewmac16", "ewmac8"]
+    # pooled, so both instruments share the estimate
+    assert correlation_list is system.combForecast.get_forecast_correlation_matrices(
+        "US10"
+    )
+
+    fdm = system.combForecast.get_forecast_diversification_multiplier("EDOLLAR")
+    assert (fdm >= 1.0).all()
+    assert (fdm <= 2.5).all()
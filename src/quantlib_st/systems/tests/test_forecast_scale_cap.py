@@ -1,3 +1,5 @@
+import numpy as np
+import pandas as pd
 import pytest
 
 from quantlib_st.config.configdata import Config
@@ -6,6 +8,7 @@ from quantlib_st.sysdata.sim.csv_futures_sim_test_data import CsvFuturesSimTestD
 
 from quantlib_st.systems.basesystem import System
 from quantlib_st.systems.forecasting import Rules
+from quantlib_st.systems.forecast_scale_cap import _stack_series_into_cube
 from quantlib_st.systems.provided.futures_chapter15.basesystem import futures_system
 
 
@@ -86,3 +89,72 @@ def test_get_forecast_scalar(system):
 
     ans = system_other_loc.forecastScaleCap.get_forecast_scalar("EDOLLAR", "ewmac8")
     assert (ans == 11.0).all()
+
+
+def _system_for_cube(use_capped_forecast_cube: bool, use_estimates: bool) -> System:
+    config = Config("systems.provided.config.test_forecast_config.yaml")
+    config.forecast_cap = 3.0
+    config.use_capped_forecast_cube = use_capped_forecast_cube
+    config.use_forecast_scale_estimates = use_estimates
+
+    return futures_system(
+        trading_rules=Rules(), data=CsvFuturesSimTestData(), config=config
+    )
+
+
+@pytest.mark.parametrize("use_estimates", [False, True])
+def test_capped_forecast_cube_matches_get_capped_forecast(use_estimates):
+    cube_system = _system_for_cube(True, use_estimates)
+    single_system = _system_for_cube(False, use_estimates)
+
+    cube = cube_system.forecastScaleCap.get_capped_forecast_cube()
+    assert list(cube.columns) == [
+        ("EDOLLAR", "ewmac8"),
+        ("EDOLLAR", "ewmac16"),
+        ("US10", "ewmac8"),
+        ("US10", "ewmac16"),
+    ]
+    as_array = cube.to_numpy().reshape(len(cube.index), 2, 2)
+    assert np.nanmax(np.abs(as_array)) == 3.0
+
+    for instrument_code in ["EDOLLAR", "US10"]:
+        for rule_variation_name in ["ewmac8", "ewmac16"]:
+            expected = single_system.forecastScaleCap.get_capped_forecast(
+                instrument_code, rule_variation_name
+            )
+            pd.testing.assert_series_equal(
+                cube_system.forecastScaleCap.get_capped_forecast(
+                    instrument_code, rule_variation_name
+                ),
+                expected,
+            )
+
+
+def test_stack_series_into_cube_with_dates_not_in_index():
+    index = pd.date_range("2020-01-01", periods=4, freq="D")
+    series_dict = {
+        ("A", "rule"): pd.Series([1.0, 2.0], index=index[[0, 2]]),
+        # the last date isn't in the index, so mustn't end up in its last row
+        ("B", "rule"): pd.Series(
+            [3.0, 4.0], index=[index[1], index[-1] + pd.Timedelta(days=1)]
+        ),
+    }
+
+    cube, _ = _stack_series_into_cube(
+        series_dict, instrument_list=["A", "B"], rule_list=["rule"], index=index
+    )
+    np.testing.assert_array_equal(
+        cube[:, :, 0],
+        [[1.0, np.nan], [np.nan, 3.0], [2.0, np.nan], [np.nan, np.nan]],
+    )
+
+    cube, _ = _stack_series_into_cube(
+        series_dict,
+        instrument_list=["A", "B"],
+        rule_list=["rule"],
+        index=index,
+        ffill=True,
+    )
+    np.testing.assert_array_equal(
+        cube[:, :, 0], [[1.0, np.nan], [1.0, 3.0], [2.0, 3.0], [2.0, 3.0]]
+    )
@@ -1,9 +1,18 @@
+import pickle
+
+import pandas as pd
 import pytest
 
 from quantlib_st.sysdata.sim.csv_futures_sim_test_data import CsvFuturesSimTestData
 from quantlib_st.config.configdata import Config
 from quantlib_st.systems.provided.futures_chapter15.basesystem import futures_system
 from quantlib_st.systems.basesystem import System
+from quantlib_st.systems.provided.rules.breakout import breakout
+from quantlib_st.systems.system_cache import cacheRef
+from quantlib_st.systems.trading_rules import (
+    TradingRule,
+    create_variations_oneparameter,
+)
 
 
 @pytest.fixture
@@ -36,3 +45,222 @@ def test_get_raw_forecast_minimal(system: System):
 
     ans = system.rules.get_raw_forecast("EDOLLAR", "rule1")
     assert abs(ans.iloc[-1] - (-19.617574)) < 0.00001
+
+
+PANEL_RULES = dict(
+    ewmac=dict(
+        function="systems.provided.rules.ewmac.ewmac",
+        data=["rawdata.get_daily_prices", "rawdata.daily_returns_volatility"],
+        other_args=dict(Lfast=8, Lslow=32),
+    ),
+    breakout=dict(
+        function="systems.provided.rules.breakout.breakout",
+        data=["rawdata.get_daily_prices"],
+        other_args=dict(lookback=20),
+    ),
+    carry="systems.provided.rules.carry.carry",
+)
+
+
+def _system_with_panel_rules(use_panel_rules: bool) -> System:
+    config = Config("systems.provided.config.test_account_config.yaml")
+    config.use_panel_rules = use_panel_rules
+
+    return futures_system(
+        trading_rules=PANEL_RULES, data=CsvFuturesSimTestData(), config=config
+    )
+
+
+def test_panel_rules_match_single_instrument():
+    panel_system = _system_with_panel_rules(True)
+    single_system = _system_with_panel_rules(False)
+
+    # the first call fills in the other instruments
+    panel_system.rules.get_raw_forecast("US10", "ewmac")
+    other_ref = panel_system.rules._raw_forecast_cache_ref("EDOLLAR", "ewmac")
+    assert other_ref in panel_system.cache
+
+    for instrument_code in single_system.get_instrument_list():
+        for rule_name in PANEL_RULES.keys():
+            pd.testing.assert_series_equal(
+                panel_system.rules.get_raw_forecast(instrument_code, rule_name),
+                single_system.rules.get_raw_forecast(instrument_code, rule_name),
+                check_names=False,
+                check_freq=False,
+            )
+
+    # the inputs of forecasts filled in by the panel are still tracked
+    assert cacheRef(
+        "rawdata", "daily_returns_volatility", "EDOLLAR"
+    ) in panel_system.cache.dependency_graph.children_of(other_ref)
+
+
+EWMAC_VARIATIONS = dict(
+    [
+        (
+            "ewmac%d" % Lfast,
+            dict(
+                function="systems.provided.rules.ewmac.ewmac",
+                data=[
+                    "rawdata.get_daily_prices",
+                    "rawdata.daily_returns_volatility",
+                ],
+                other_args=dict(Lfast=Lfast, Lslow=Lfast * 4),
+            ),
+        )
+        for Lfast in [2, 8, 32]
+    ]
+)
+
+
+def test_rule_family_matches_single_variations():
+    ewmac_rules = EWMAC_VARIATIONS
+    systems = {}
+    for use_rule_families in [True, False]:
+        config = Config("systems.provided.config.test_account_config.yaml")
+        config.use_rule_families = use_rule_families
+        systems[use_rule_families] = futures_system(
+            trading_rules=ewmac_rules, data=CsvFuturesSimTestData(), config=config
+        )
+
+    family_system = systems[True]
+    assert family_system.rules.rule_families()["ewmac8"] == list(ewmac_rules.keys())
+
+    family_system.rules.get_raw_forecast("EDOLLAR", "ewmac8")
+    assert family_system.rules._raw_forecast_cache_ref("EDOLLAR", "ewmac32") in (
+        family_system.cache
+    )
+
+    for rule_name in ewmac_rules.keys():
+        pd.testing.assert_series_equal(
+            family_system.rules.get_raw_forecast("EDOLLAR", rule_name),
+            systems[False].rules.get_raw_forecast("EDOLLAR", rule_name),
+            check_names=False,
+        )
+
+
+def test_get_ewma(system: System):
+    price = system.rawdata.get_daily_prices("EDOLLAR")
+    ewma = system.rules.get_ewma("EDOLLAR", 16, price_source="rawdata.get_daily_prices")
+
+    pd.testing.assert_series_equal(ewma, price.ewm(span=16, min_periods=1).mean())
+
+
+def test_breakout_family_populates_all_variations():
+    breakout_rules = create_variations_oneparameter(
+        TradingRule(
+            "systems.provided.rules.breakout.breakout",
+            data=["rawdata.get_daily_prices"],
+        ),
+        [10, 20, 40, 80, 160, 320],
+        "lookback",
+    )
+    config = Config("systems.provided.config.test_account_config.yaml")
+    config.use_rule_families = True
+    system = futures_system(
+        trading_rules=breakout_rules, data=CsvFuturesSimTestData(), config=config
+    )
+    price = system.rawdata.get_daily_prices("US10")
+
+    system.rules.get_raw_forecast("US10", "lookback_10")
+    for rule_name, trading_rule in breakout_rules.items():
+        assert system.rules._raw_forecast_cache_ref("US10", rule_name) in system.cache
+        pd.testing.assert_series_equal(
+            system.rules.get_raw_forecast("US10", rule_name),
+            breakout(price, **trading_rule.other_args),
+            check_names=False,
+        )
+
+
+GRID_RULES = dict(
+    ewmac=PANEL_RULES["ewmac"],
+    breakout=PANEL_RULES["breakout"],
+    broken=dict(
+        function="systems.provided.rules.breakout.breakout",
+        data=["rawdata.no_such_data_method"],
+    ),
+)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_get_all_raw_forecasts(executor):
+    config = Config("systems.provided.config.test_account_config.yaml")
+    grid_system = futures_system(
+        trading_rules=GRID_RULES, data=CsvFuturesSimTestData(), config=config
+    )
+    single_system = futures_system(
+        trading_rules=GRID_RULES, data=CsvFuturesSimTestData(), config=config
+    )
+
+    grid = grid_system.rules.get_all_raw_forecasts(executor=executor, max_workers=2)
+
+    assert set(grid.failures.keys()) == {("EDOLLAR", "broken"), ("US10", "broken")}
+    assert grid.timings.loc[:, "broken"].isna().all()
+    assert (grid.timings.loc[:, ["ewmac", "breakout"]] >= 0).all().all()
+
+    for instrument_code in ["EDOLLAR", "US10"]:
+        for rule_name in ["ewmac", "breakout"]:
+            cache_ref = grid_system.rules._raw_forecast_cache_ref(
+                instrument_code, rule_name
+            )
+            assert cache_ref in grid_system.cache
+            pd.testing.assert_series_equal(
+                grid_system.rules.get_raw_forecast(instrument_code, rule_name),
+                single_system.rules.get_raw_forecast(instrument_code, rule_name),
+            )
+
+    # vol is recorded as an input
+    vol_ref = cacheRef("rawdata", "daily_returns_volatility", instrument_code="US10")
+    ewmac_ref = grid_system.rules._raw_forecast_cache_ref("US10", "ewmac")
+    assert vol_ref in grid_system.cache.dependency_graph.children_of(ewmac_ref)
+
+    # second time around everything is already in the cache
+    grid = grid_system.rules.get_all_raw_forecasts(
+        rule_list=["ewmac"], executor=executor
+    )
+    assert grid.timings.isna().all().all()
+    assert grid.all_succeeded()
+
+
+def test_get_all_raw_forecasts_uses_rule_families():
+    config = Config("systems.provided.config.test_account_config.yaml")
+    config.use_rule_families = True
+    system = futures_system(
+        trading_rules=EWMAC_VARIATIONS, data=CsvFuturesSimTestData(), config=config
+    )
+
+    grid = system.rules.get_all_raw_forecasts(executor="thread", max_workers=1)
+
+    # the other variations were calculated along with the first
+    assert (grid.timings.loc[:, "ewmac2"] >= 0).all()
+    assert grid.timings.loc[:, ["ewmac8", "ewmac32"]].isna().all().all()
+    assert grid.all_succeeded()
+    for rule_name in EWMAC_VARIATIONS.keys():
+        assert system.rules._raw_forecast_cache_ref("US10", rule_name) in system.cache
+
+
+def test_compiled_rule_plan():
+    system = _system_with_panel_rules(False)
+
+    plan = system.rules.compiled_rule_plan()
+    assert system.rules.compiled_rule_plan() is plan
+    assert plan.rule_names == ["ewmac", "breakout", "carry"]
+
+    plan_as_df = plan.as_df()
+    assert plan_as_df.loc["ewmac", "kwargs"] == dict(Lfast=8, Lslow=32)
+    assert plan_as_df.loc["ewmac", "panel_capable"]
+    assert "daily_returns_volatility" in plan_as_df.loc["ewmac", "data"]
+
+    for rule_name in plan.rule_names:
+        trading_rule = system.rules.trading_rules()[rule_name]
+        pd.testing.assert_series_equal(
+            plan[rule_name].call("US10"), trading_rule.call(system, "US10")
+        )
+
+    # the plan isn't pickled, but is rebuilt after
+    unpickled_system = pickle.loads(pickle.dumps(system))
+    assert unpickled_system.rules._compiled_rule_plan is None
+    pd.testing.assert_series_equal(
+        unpickled_system.rules.compiled_rule_plan()["breakout"].call("US10"),
+        plan["breakout"].call("US10"),
+    )
@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantlib_st.config.configdata import Config
+
+from quantlib_st.sysdata.sim.csv_futures_sim_test_data import CsvFuturesSimTestData
+
+from quantlib_st.systems.basesystem import System
+from quantlib_st.systems.forecasting import Rules
+from quantlib_st.systems.provided.futures_chapter15.basesystem import futures_system
+from quantlib_st.systems.system_cache import cacheRef
+
+
+@pytest.fixture
+def system() -> System:
+    system = futures_system(
+        trading_rules=Rules(),
+        data=CsvFuturesSimTestData(),
+        config=Config("systems.provided.config.test_forecast_config.yaml"),
+    )
+    return system
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_precompute_fills_cache(system, executor):
+    results = system.precompute(
+        "rules.get_raw_forecast",
+        keys=["ewmac8", "ewmac16"],
+        executor=executor,
+        max_workers=2,
+    )
+
+    assert sorted(results.keys()) == [
+        ("EDOLLAR", "ewmac16"),
+        ("EDOLLAR", "ewmac8"),
+        ("US10", "ewmac16"),
+        ("US10", "ewmac8"),
+    ]
+
+    cached_items = system.cache.get_itemnames_for_stage("rules")
+    assert cached_items == ["get_raw_forecast"]
+    assert (
+        len(system.cache.get_cacherefs_for_stage("rules").filter_by_keyname("ewmac8"))
+        == 2
+    )
+
+    # dependencies calculated in workers are also merged back
+    assert "daily_returns_volatility" in system.cache.get_itemnames_for_stage("rawdata")
+
+    ans = system.rules.get_raw_forecast("EDOLLAR", "ewmac8")
+    assert ans.equals(results[("EDOLLAR", "ewmac8")])
+    assert abs(ans.loc["2015-12-11"] - 0.191395) < 1e-6
+
+
+def test_precompute_single_argument(system):
+    results = system.precompute(
+        "rawdata.daily_returns_volatility", instruments=["US10"], executor="thread"
+    )
+
+    assert list(results.keys()) == ["US10"]
+    assert results["US10"].equals(system.rawdata.daily_returns_volatility("US10"))
+
+
+def test_precompute_bad_executor(system):
+    with pytest.raises(Exception):
+        system.precompute("rawdata.daily_returns_volatility", executor="gpu")
+
+
+def test_dependency_graph_records_stage_calls(system):
+    system.forecastScaleCap.get_capped_forecast("EDOLLAR", "ewmac8")
+    graph = system.cache.dependency_graph
+
+    raw_forecast = cacheRef("rules", "get_raw_forecast", "EDOLLAR", keyname="ewmac8")
+    vol = cacheRef("rawdata", "daily_returns_volatility", "EDOLLAR")
+
+    assert graph.children_of(raw_forecast) == [vol]
+    assert raw_forecast in graph.upstream_of(
+        cacheRef("forecastScaleCap", "get_capped_forecast", "EDOLLAR", keyname="ewmac8")
+    )
+
+    # instrument list is cached by the base system, not recorded
+    assert graph.all_cache_refs().filter_by_itemname("get_instrument_list") == []
+
+    generations = graph.generations()
+    assert sum([len(generation) for generation in generations]) == len(
+        graph.all_cache_refs()
+    )
+    assert generations[-1].unique_list_of_item_names() == ["get_capped_forecast"]
+
+
+def test_delete_items_downstream_of(system):
+    system.forecastScaleCap.get_capped_forecast("EDOLLAR", "ewmac8")
+    system.forecastScaleCap.get_capped_forecast("US10", "ewmac8")
+
+    vol = cacheRef("rawdata", "daily_returns_volatility", "EDOLLAR")
+    deleted = system.cache.delete_items_downstream_of(vol)
+
+    assert sorted(deleted.unique_list_of_item_names()) == [
+        "_get_forecast_scalar_fixed_as_series",
+        "daily_returns_volatility",
+        "get_capped_forecast",
+        "get_raw_forecast",
+        "get_scaled_forecast",
+    ]
+    assert deleted.unique_list_of_instrument_codes() == ["EDOLLAR"]
+
+    # upstream and other instruments untouched
+    remaining = system.cache.get_items_with_data()
+    assert cacheRef("rawdata", "daily_returns", "EDOLLAR") in remaining
+    assert len(remaining.filter_by_instrument_code("US10")) == 6
+
+
+def test_cache_profile_report(system):
+    with system.profile_cache():
+        system.forecastScaleCap.get_capped_forecast("EDOLLAR", "ewmac8")
+        system.forecastScaleCap.get_capped_forecast("EDOLLAR", "ewmac8")
+
+    # not recording outside the block
+    system.forecastScaleCap.get_capped_forecast("US10", "ewmac8")
+    assert system.cache.profiler is None
+
+    report = system.cache_profile_report()
+    capped = report.loc[("forecastScaleCap", "get_capped_forecast")]
+    assert capped["calls"] == 2
+    assert capped["hits"] == 1
+    assert capped["misses"] == 1
+    assert capped["size_bytes"] > 0
+    assert capped["self_time"] <= capped["total_time"]
+
+    raw = report.loc[("rules", "get_raw_forecast")]
+    assert raw["misses"] == 1
+
+    # self times don't double count time spent in children
+    stage_self_time = report.drop("base_system", level="stage")["self_time"].sum()
+    assert stage_self_time <= capped["total_time"]
+    assert capped["self_time"] < capped["total_time"]
+
+
+def test_cache_profile_report_by_instrument(system):
+    with system.profile_cache(by_instrument=True):
+        system.rules.get_raw_forecast("EDOLLAR", "ewmac8")
+        system.rules.get_raw_forecast("US10", "ewmac8")
+
+    report = system.cache_profile_report()
+    assert report.index.names == ["stage", "method", "instrument_code"]
+    assert report.loc[("rules", "get_raw_forecast", "US10"), "misses"] == 1
+
+
+def test_read_only_cache(system):
+    expected = system.forecastScaleCap.get_capped_forecast("EDOLLAR", "ewmac8")
+    system.cache.delete_all_items()
+
+    system.cache.set_read_only_on()
+    forecast = system.forecastScaleCap.get_capped_forecast("EDOLLAR", "ewmac8")
+    pd.testing.assert_series_equal(forecast, expected)
+
+    vol = system.rawdata.daily_returns_volatility("EDOLLAR")
+    with pytest.raises(ValueError):
+        vol.iloc[0] = 0.0
+
+    # views share the cached data, but not the object
+    vol_again = system.rawdata.daily_returns_volatility("EDOLLAR")
+    assert vol_again is not vol
+    assert np.shares_memory(vol_again.to_numpy(), vol.to_numpy())
@@ -0,0 +1,140 @@
+"""
+Opt-in instrumentation for the system cache
+
+Counts calls, hits and misses for each cached stage method, and on a miss how
+long the calculation took and how big the result was. Time is split into total
+and 'self' time, which excludes time spent calculating other cached items.
+"""
+
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+CALLS = "calls"
+HITS = "hits"
+MISSES = "misses"
+TOTAL_TIME = "total_time"
+SELF_TIME = "self_time"
+SIZE_BYTES = "size_bytes"
+
+LIST_OF_STATS = [CALLS, HITS, MISSES, TOTAL_TIME, SELF_TIME, SIZE_BYTES]
+
+
+class cacheProfiler(object):
+    def __init__(self, by_instrument: bool = False):
+        self._by_instrument = by_instrument
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def __repr__(self):
+        return "cacheProfiler with %d items" % len(self._stats)
+
+    # locks can't be pickled, eg when a system is sent to another process.
+    # Anything a worker process records stays in that process.
+    def __getstate__(self):
+        return dict(_by_instrument=self._by_instrument, _stats=self._stats)
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def by_instrument(self) -> bool:
+        return self._by_instrument
+
+    def record_hit(self, cache_ref):
+        with self._lock:
+            stats = self._stats_for_cache_ref(cache_ref)
+            stats[CALLS] += 1
+            stats[HITS] += 1
+
+    def start_calculating(self):
+        # [start time, time spent in children]
+        self._stack.append([time.perf_counter(), 0.0])
+
+    def finish_calculating(self, cache_ref, value):
+        start_time, time_in_children = self._stack.pop()
+        total_time = time.perf_counter() - start_time
+        self_time = total_time - time_in_children
+
+        # our parent (if any) shouldn't count this as its own time
+        if len(self._stack) > 0:
+            self._stack[-1][1] += total_time
+
+        size_bytes = size_of_value_in_bytes(value)
+
+        with self._lock:
+            stats = self._stats_for_cache_ref(cache_ref)
+            stats[CALLS] += 1
+            stats[MISSES] += 1
+            stats[TOTAL_TIME] += total_time
+            stats[SELF_TIME] += self_time
+            stats[SIZE_BYTES] += size_bytes
+
+    def abandon_calculating(self):
+        # function raised an exception, nothing to record
+        self._stack.pop()
+
+    def as_df(self) -> pd.DataFrame:
+        """
+        :returns: pd.DataFrame, one row per stage and method (and instrument if
+            by_instrument), columns are LIST_OF_STATS
+        """
+        index_names = ["stage", "method"]
+        if self.by_instrument:
+            index_names.append("instrument_code")
+
+        with self._lock:
+            keys = list(self._stats.keys())
+            rows = [self._stats[key] for key in keys]
+
+        if len(keys) == 0:
+            index = pd.MultiIndex.from_tuples([], names=index_names)
+        else:
+            index = pd.MultiIndex.from_tuples(keys, names=index_names)
+
+        stats_df = pd.DataFrame(rows, index=index, columns=LIST_OF_STATS)
+
+        return stats_df
+
+    def _stats_for_cache_ref(self, cache_ref) -> dict:
+        key = self._key_for_cache_ref(cache_ref)
+        stats = self._stats.get(key, None)
+        if stats is None:
+            stats = self._stats[key] = dict(
+                [(stat_name, 0) for stat_name in LIST_OF_STATS]
+            )
+
+        return stats
+
+    def _key_for_cache_ref(self, cache_ref) -> tuple:
+        if self.by_instrument:
+            return (cache_ref.stage_name, cache_ref.itemname, cache_ref.instrument_code)
+
+        return (cache_ref.stage_name, cache_ref.itemname)
+
+    @property
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        return stack
+
+
+def size_of_value_in_bytes(value) -> int:
+    """
+    Rough size of a cached value; exact for numpy and pandas objects, shallow for
+    anything else
+    """
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        return int(np.sum(value.memory_usage(index=True)))
+    elif isinstance(value, np.ndarray):
+        return int(value.nbytes)
+
+    return sys.getsizeof(value)
@@ -0,0 +1,62 @@
+class instrumentGroupingIndex(dict):
+    """
+    Instruments grouped by their set of trading rules, for pooling
+
+    dict, frozenset of rule names -> sorted list of instrument codes. Built
+    once from every instrument's rule list, so finding the instruments that
+    share a rule set is a dict lookup rather than comparing each instrument
+    with every other.
+
+    >>> index = instrumentGroupingIndex.from_dict_of_rule_lists(
+    ...     dict(US10=["ewmac8", "carry"], EDOLLAR=["carry", "ewmac8"], BUND=["carry"])
+    ... )
+    >>> index.instruments_with_same_rules_as("US10")
+    ['EDOLLAR', 'US10']
+    >>> index.instruments_with_same_rules_as("BUND")
+    ['BUND']
+    """
+
+    def __init__(self, groups: dict, rules_by_instrument: dict):
+        super().__init__(groups)
+        self._rules_by_instrument = rules_by_instrument
+
+    @classmethod
+    def from_dict_of_rule_lists(cls, dict_of_rule_lists: dict):
+        """
+        :param dict_of_rule_lists: instrument code -> list of rule names
+        """
+        rules_by_instrument = {
+            instrument_code: frozenset(rule_list)
+            for instrument_code, rule_list in dict_of_rule_lists.items()
+        }
+
+        groups = {}
+        for instrument_code, rule_set in rules_by_instrument.items():
+            groups.setdefault(rule_set, []).append(instrument_code)
+
+        groups = {
+            rule_set: sorted(instrument_list)
+            for rule_set, instrument_list in groups.items()
+        }
+
+        return cls(groups, rules_by_instrument=rules_by_instrument)
+
+    def rules_for_instrument(self, instrument_code: str) -> frozenset:
+        return self._rules_by_instrument[instrument_code]
+
+    def instruments_with_same_rules_as(self, instrument_code: str) -> list:
+        """
+        :returns: sorted list of str, including instrument_code itself
+        """
+        if instrument_code not in self._rules_by_instrument:
+            raise Exception(
+                "%s isn't in the instrument grouping index" % instrument_code
+            )
+
+        return list(self[self.rules_for_instrument(instrument_code)])
+
+    def list_of_groups(self) -> list:
+        """
+        :returns: list of sorted lists of instrument codes, one per rule set
+        """
+        return [list(instrument_list) for instrument_list in self.values()]
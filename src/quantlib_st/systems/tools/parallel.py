@@ -0,0 +1,110 @@
+"""
+Helpers for evaluating system stage methods in a pool of workers
+
+Threads share the parent system (and so its cache) directly. Processes get their
+own copy of the system once per worker, and send back whatever they added to
+their copy of the cache so it can be merged into the parent.
+"""
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from quantlib_st.core.objects import resolve_data_method
+
+PROCESS_EXECUTOR = "process"
+THREAD_EXECUTOR = "thread"
+LIST_OF_EXECUTORS = [PROCESS_EXECUTOR, THREAD_EXECUTOR]
+
+# set inside each worker process by initialise_worker_with_system
+_worker_system = None
+
+
+def get_pool_executor(
+    executor: str = PROCESS_EXECUTOR,
+    max_workers: int | None = None,
+    initializer=None,
+    initargs: tuple = (),
+) -> Executor:
+    if executor == PROCESS_EXECUTOR:
+        return ProcessPoolExecutor(
+            max_workers=max_workers, initializer=initializer, initargs=initargs
+        )
+    elif executor == THREAD_EXECUTOR:
+        return ThreadPoolExecutor(
+            max_workers=max_workers, initializer=initializer, initargs=initargs
+        )
+
+    raise Exception(
+        "Executor %s not recognised, must be one of %s"
+        % (executor, str(LIST_OF_EXECUTORS))
+    )
+
+
+def initialise_worker_with_system(system):
+    """
+    Called once when each worker process starts, so we don't send the system
+    with every task
+    """
+    global _worker_system
+    _worker_system = system
+
+
+def get_worker_system():
+    if _worker_system is None:
+        raise Exception("Worker process has not been initialised with a system")
+
+    return _worker_system
+
+
+def call_system_method_with_list_of_args(
+    system, method_path: str, list_of_args: list
+) -> dict:
+    """
+    Call system.method_path(*args) for each tuple of args
+
+    :returns: dict, keys are tuples of args, values are results
+    """
+    method = resolve_data_method(system, method_path)
+    results = {tuple(args): method(*args) for args in list_of_args}
+
+    return results
+
+
+def call_method_in_worker_and_return_cache_updates(
+    method_path: str, list_of_args: list
+) -> tuple:
+    """
+    Runs inside a worker process
+
+    :returns: tuple: dict of cacheRef: cacheElement, for pickable items added
+        to the worker cache by this call; and the worker dependency graph as a dict
+    """
+    _, new_cache_items, dependency_graph_as_dict = (
+        call_method_in_worker_and_return_results_and_cache_updates(
+            method_path, list_of_args
+        )
+    )
+
+    return new_cache_items, dependency_graph_as_dict
+
+
+def call_method_in_worker_and_return_results_and_cache_updates(
+    method_path: str, list_of_args: list
+) -> tuple:
+    """
+    Runs inside a worker process. Use when the results themselves are small,
+    eg timings, since they are pickled as well as anything added to the cache
+
+    :returns: tuple: results as call_system_method_with_list_of_args; and the
+        cache updates as call_method_in_worker_and_return_cache_updates
+    """
+    system = get_worker_system()
+    existing_cache_refs = set(system.cache.keys())
+
+    results = call_system_method_with_list_of_args(
+        system, method_path=method_path, list_of_args=list_of_args
+    )
+
+    new_cache_items = system.cache.pickable_items_not_in(existing_cache_refs)
+    dependency_graph_as_dict = system.cache.dependency_graph.as_dict()
+
+    return results, new_cache_items, dependency_graph_as_dict
@@ -1,4 +1,5 @@
 from copy import copy
+from types import MappingProxyType
 from typing import (
     Optional,
     Any,
@@ -41,6 +42,40 @@ TradingRuleSpec = Union[
 ]
 
 
+def panel_capable(func: Callable) -> Callable:
+    """
+    Decorator for rule functions which give the same answer if each data argument
+    is a T x N pd.DataFrame, one column per instrument, as when called with each
+    column in turn as a pd.Series; returning a T x N pd.DataFrame. Usually true
+    of rules built from pandas operations that work column by column.
+
+    See Rules.get_raw_forecast and the use_panel_rules config option
+    """
+    func.panel_capable = True  # type: ignore
+
+    return func
+
+
+def rule_family(family_function: Callable) -> Callable:
+    """
+    Decorator for rule functions with a family_function, which calculates
+    several variations of the rule at once more cheaply than one at a time.
+
+    family_function(*data, list_of_other_args=[dict(...), ...]) returns a
+    pd.DataFrame with one column per element of list_of_other_args, in the same
+    order, each column the same as calling the rule function with those
+    other_args.
+
+    See Rules.get_raw_forecast and the use_rule_families config option
+    """
+
+    def decorate(func: Callable) -> Callable:
+        func.family_function = family_function  # type: ignore
+        return func
+
+    return decorate
+
+
 class TradingRule(object):
     """
     Container for trading rules
@@ -117,6 +152,28 @@ class TradingRule(object):
     def data_args(self) -> List[Dict[str, Any]]:
         return self._data_args
 
+    @property
+    def panel_capable(self) -> bool:
+        return getattr(self.function, "panel_capable", False)
+
+    @property
+    def family_function(self) -> Optional[Callable]:
+        return getattr(self.function, "family_function", None)
+
+    def in_same_family_as(self, other_rule: "TradingRule") -> bool:
+        """
+        Variations of the same rule function using the same data can be
+        calculated together by the family_function
+        """
+        if self.family_function is None:
+            return False
+
+        return (
+            self.function is other_rule.function
+            and self.data == other_rule.data
+            and self.data_args == other_rule.data_args
+        )
+
     def __repr__(self):
         return _repr_trading_rule(self)
 
@@ -128,6 +185,16 @@ class TradingRule(object):
         """
 
         list_of_data_for_call = self._get_data_from_system(system, instrument_code)
+        result = self.call_with_data(list_of_data_for_call)
+
+        return result
+
+    def call_with_data(self, list_of_data_for_call: list) -> pd.Series:
+        """
+        Call a trading rule with data we already have
+
+        :param list_of_data_for_call: as returned by get_data_for_instrument
+        """
         result = self._call_with_data(list_of_data_for_call)
 
         # Check for all zeros
@@ -135,6 +202,85 @@ class TradingRule(object):
 
         return result
 
+    def compile(self, system: "System") -> "compiledTradingRule":
+        """
+        Bind the rule to a system, so calling it doesn't need to look anything up
+
+        :returns: compiledTradingRule
+        """
+        return compiledTradingRule(self, system)
+
+    def get_data_for_instrument(self, system: "System", instrument_code: str) -> list:
+        """
+        The data the rule is called with for an instrument
+
+        :returns: list, one element per data argument
+        """
+        return self._get_data_from_system(system, instrument_code)
+
+    def call_panel_with_data(
+        self, data_by_instrument: Dict[str, list]
+    ) -> Dict[str, pd.Series]:
+        """
+        Call a panel capable rule once for several instruments
+
+        :param data_by_instrument: dict, instrument_code -> list of data, as
+            returned by get_data_for_instrument. All data must be pd.Series
+        :returns: dict, instrument_code -> forecast pd.Series
+        """
+        if not self.panel_capable:
+            raise Exception("Trading rule %s isn't panel capable" % str(self.function))
+
+        instrument_list = list(data_by_instrument.keys())
+        list_of_panel_data = _stack_data_into_panels(data_by_instrument)
+        panel_result = self._call_with_data(
+            list_of_panel_data, result_type=pd.DataFrame
+        )
+
+        forecasts = dict(
+            [
+                (
+                    instrument_code,
+                    _forecast_for_instrument_from_panel_result(
+                        panel_result,
+                        instrument_code=instrument_code,
+                        list_of_data_for_call=data_by_instrument[instrument_code],
+                    ),
+                )
+                for instrument_code in instrument_list
+            ]
+        )
+
+        return forecasts
+
+    def call_family_with_data(
+        self, list_of_data_for_call: list, list_of_rules: List["TradingRule"]
+    ) -> List[pd.Series]:
+        """
+        Call the family_function once for several variations in our family
+
+        :param list_of_data_for_call: as returned by get_data_for_instrument
+        :param list_of_rules: TradingRules in the same family
+        :returns: list of forecasts, one per rule
+        """
+        family_function = self.family_function
+        if family_function is None:
+            raise Exception("Trading rule %s has no family" % str(self.function))
+
+        list_of_other_args = [rule.other_args for rule in list_of_rules]
+        family_result = family_function(
+            *list_of_data_for_call, list_of_other_args=list_of_other_args
+        )
+        assert isinstance(family_result, pd.DataFrame)
+
+        list_of_forecasts = []
+        for column_number in range(len(list_of_rules)):
+            forecast = family_result.iloc[:, column_number]
+            forecast.name = None
+            list_of_forecasts.append(replace_all_zeros_with_nan(forecast))
+
+        return list_of_forecasts
+
     def _get_data_from_system(self, system: "System", instrument_code: str):
         """
         Prepare the data for a function call
@@ -189,7 +335,9 @@ class TradingRule(object):
 
         return list_of_data_for_call
 
-    def _call_with_data(self, list_of_data_for_call: list) -> pd.Series:
+    def _call_with_data(
+        self, list_of_data_for_call: list, result_type: type = pd.Series
+    ) -> pd.Series:
         other_args = self.other_args
         func = self._function
         if not callable(func):
@@ -197,11 +345,193 @@ class TradingRule(object):
                 "Trading rule function is not callable or could not be resolved"
             )
         result = func(*list_of_data_for_call, **(other_args or {}))
-        assert isinstance(result, pd.Series)
+        assert isinstance(result, result_type)
 
         return result
 
 
+def _stack_data_into_panels(data_by_instrument: Dict[str, list]) -> list:
+    # one T x N DataFrame per data argument, on the union of the instruments' indices
+    instrument_list = list(data_by_instrument.keys())
+    list_of_lists_of_data = [
+        data_by_instrument[instrument_code] for instrument_code in instrument_list
+    ]
+
+    list_of_panel_data = []
+    for data_for_each_instrument in zip(*list_of_lists_of_data):
+        for data in data_for_each_instrument:
+            if not isinstance(data, pd.Series):
+                raise Exception(
+                    "Panel capable rules can only be passed pd.Series data, not %s"
+                    % str(type(data))
+                )
+
+        panel_data = pd.concat(data_for_each_instrument, axis=1, keys=instrument_list)
+        list_of_panel_data.append(panel_data)
+
+    return list_of_panel_data
+
+
+def _forecast_for_instrument_from_panel_result(
+    panel_result: pd.DataFrame, instrument_code: str, list_of_data_for_call: list
+) -> pd.Series:
+    # Back to the dates the instrument's own data covers, dropping the rows
+    # that are only there because of other instruments
+    index = list_of_data_for_call[0].index
+    for data in list_of_data_for_call[1:]:
+        index = index.union(data.index)
+
+    forecast = panel_result[instrument_code].reindex(index)
+    forecast.name = None
+    forecast = replace_all_zeros_with_nan(forecast)
+
+    return forecast
+
+
+class compiledTradingRule(object):
+    """
+    A TradingRule bound to a system: the function, a bound method for each data
+    item and the keyword arguments are all resolved once, so calling it for an
+    instrument is just the data calls and the function call
+    """
+
+    def __init__(self, trading_rule: TradingRule, system: "System"):
+        function = trading_rule.function
+        if not callable(function):
+            raise Exception(
+                "Trading rule function is not callable or could not be resolved"
+            )
+
+        self._trading_rule = trading_rule
+        self._function = function
+        self._data_getters = tuple(
+            (
+                resolve_data_method(system, data_string),
+                MappingProxyType(dict(data_arguments)),
+            )
+            for data_string, data_arguments in zip(
+                trading_rule.data, trading_rule.data_args
+            )
+        )
+        self._kwargs = MappingProxyType(dict(trading_rule.other_args or {}))
+
+    def __repr__(self):
+        return "compiled %s" % _repr_trading_rule(self.trading_rule)
+
+    @property
+    def trading_rule(self) -> TradingRule:
+        return self._trading_rule
+
+    @property
+    def function(self) -> Callable:
+        return self._function
+
+    @property
+    def data_getters(self) -> tuple:
+        """
+        :returns: tuple of (bound data method, read only dict of its arguments)
+        """
+        return self._data_getters
+
+    @property
+    def kwargs(self) -> MappingProxyType:
+        return self._kwargs
+
+    def get_data_for_instrument(self, instrument_code: str) -> list:
+        return [
+            data_method(instrument_code, **data_arguments)
+            for data_method, data_arguments in self._data_getters
+        ]
+
+    def call(self, instrument_code: str) -> pd.Series:
+        """
+        Same as TradingRule.call with the system we were compiled with
+        """
+        result = self._function(
+            *[
+                data_method(instrument_code, **data_arguments)
+                for data_method, data_arguments in self._data_getters
+            ],
+            **self._kwargs,
+        )
+        assert isinstance(result, pd.Series)
+
+        return replace_all_zeros_with_nan(result)
+
+
+class compiledRulePlan(object):
+    """
+    Every trading rule in a system, compiled; see Rules.compiled_rule_plan
+
+    Each rule is compiled the first time it's used, so a rule with a bad data
+    reference only fails when it's called, as it would without the plan
+    """
+
+    def __init__(self, trading_rule_dict: Dict[str, TradingRule], system: "System"):
+        self._trading_rule_dict = trading_rule_dict
+        self._system = system
+        self._compiled_rules = {}
+
+    def __getitem__(self, rule_name: str) -> compiledTradingRule:
+        compiled_rule = self._compiled_rules.get(rule_name, None)
+        if compiled_rule is None:
+            compiled_rule = self._trading_rule_dict[rule_name].compile(self._system)
+            self._compiled_rules[rule_name] = compiled_rule
+
+        return compiled_rule
+
+    def __contains__(self, rule_name: str) -> bool:
+        return rule_name in self._trading_rule_dict
+
+    def __len__(self):
+        return len(self._trading_rule_dict)
+
+    def __repr__(self):
+        return "compiledRulePlan with %d rules: %s" % (
+            len(self),
+            ", ".join(self.rule_names),
+        )
+
+    @property
+    def rule_names(self) -> list:
+        return list(self._trading_rule_dict.keys())
+
+    def as_df(self) -> pd.DataFrame:
+        """
+        What each rule will do when called
+
+        :returns: pd.DataFrame, one row per rule with the function, data
+            methods and their arguments, keyword arguments, and whether the
+            rule is panel capable or part of a family
+        """
+        rows = []
+        for rule_name in self.rule_names:
+            compiled_rule = self[rule_name]
+            function = compiled_rule.function
+            rows.append(
+                dict(
+                    function=_describe_callable(function),
+                    data=", ".join(
+                        "%s(%s)"
+                        % (_describe_callable(data_method), dict(data_arguments))
+                        for data_method, data_arguments in compiled_rule.data_getters
+                    ),
+                    kwargs=dict(compiled_rule.kwargs),
+                    panel_capable=compiled_rule.trading_rule.panel_capable,
+                    family=compiled_rule.trading_rule.family_function is not None,
+                )
+            )
+
+        return pd.DataFrame(rows, index=self.rule_names)
+
+
+def _describe_callable(function: Callable) -> str:
+    return "%s.%s" % (
+        getattr(function, "__module__", ""),
+        getattr(function, "__qualname__", str(function)),
+    )
+
+
 def _repr_trading_rule(rule: TradingRule):
     data = rule.data or []
     data_args = rule.data_args or []
@@ -0,0 +1,60 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import quantlib_st
+from quantlib_st.cli.main import main, subcommands_to_register
+
+HEAVY_MODULES = ["pandas", "numpy", "scipy"]
+SRC_PATH = Path(quantlib_st.__file__).resolve().parents[1]
+
+CHECK_IMPORTS = """
+import sys
+from quantlib_st.cli.main import main
+try:
+    main({argv!r})
+except SystemExit:
+    pass
+print("imported:" + ",".join(name for name in {heavy!r} if name in sys.modules), file=sys.stderr)
+"""
+
+
+@pytest.mark.parametrize(
+    "argv", [["--help"], ["costs", "--help"], ["corr", "--help"], ["costs"]]
+)
+def test_parsing_arguments_does_not_import_heavy_modules(argv):
+    completed = subprocess.run(
+        [sys.executable, "-c", CHECK_IMPORTS.format(argv=argv, heavy=HEAVY_MODULES)],
+        cwd=SRC_PATH,
+        capture_output=True,
+        text=True,
+    )
+    last_line = completed.stderr.strip().splitlines()[-1]
+
+    assert last_line == "imported:"
+
+
+def test_subcommands_to_register():
+    assert subcommands_to_register(["corr", "--frequency", "W"]) == ["corr"]
+    assert subcommands_to_register(["-v"]) == ["corr", "costs"]
+    assert subcommands_to_register(["bogus"]) == ["corr", "costs"]
+
+
+def test_unknown_subcommand_lists_all(capsys):
+    with pytest.raises(SystemExit):
+        main(["bogus"])
+
+    assert "choose from 'corr', 'costs'" in capsys.readouterr().err
+
+
+def test_lazy_package_attributes():
+    import quantlib_st.objects
+
+    assert "systems" in dir(quantlib_st)
+    assert quantlib_st.sysdata.dataBlob.__name__ == "dataBlob"
+    assert quantlib_st.objects.futuresAdjustedPrices.__name__ == "futuresAdjustedPrices"
+
+    with pytest.raises(AttributeError):
+        quantlib_st.not_a_subpackage
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantlib_st.core.dateutils import Frequency, from_config_frequency_pandas_resample
+from quantlib_st.core.pandas.frequency import sum_over_periods, sum_within_calendar_days
+
+
+@pytest.mark.filterwarnings("ignore::FutureWarning")
+@pytest.mark.parametrize("seed", [1, 2, 3])
+@pytest.mark.parametrize(
+    "frequency",
+    [Frequency.Day, Frequency.BDay, Frequency.Week, Frequency.Month, Frequency.Year],
+)
+@pytest.mark.parametrize("tz", [None, "Asia/Singapore", "US/Eastern"])
+def test_sum_over_periods_matches_resample(seed, frequency, tz):
+    rng = np.random.default_rng(seed)
+    # intraday, including weekends, with gaps and missing values
+    hours = np.sort(rng.integers(0, 1500 * 24, size=400))
+    index = pd.Timestamp("2019-12-28") + pd.to_timedelta(hours, unit="h")
+    if tz is not None:
+        # days are local ones
+        index = index.tz_localize("UTC").tz_convert(tz)
+    x = pd.Series(rng.normal(size=len(index)), index=index)
+    x.iloc[rng.integers(0, len(x), size=40)] = np.nan
+
+    summed = sum_over_periods(sum_within_calendar_days(x), frequency)
+    expected = x.resample(from_config_frequency_pandas_resample(frequency)).sum()
+
+    pd.testing.assert_series_equal(summed, expected, rtol=1e-12)
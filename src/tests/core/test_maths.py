@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantlib_st.core.maths import rolling_max_and_min_for_lookbacks
+
+
+@pytest.mark.parametrize("length", [1, 5, 9, 300])
+def test_rolling_max_and_min_for_lookbacks_matches_pandas(length):
+    np.random.seed(length)
+    values = np.random.randn(length).cumsum()
+    values[np.random.rand(length) < 0.1] = np.nan
+    list_of_lookbacks = [1, 3, 4, 10, 40, 160]
+    list_of_min_periods = [
+        int(min(length, np.ceil(lookback / 2.0))) for lookback in list_of_lookbacks
+    ]
+
+    roll_max, roll_min = rolling_max_and_min_for_lookbacks(
+        values, list_of_lookbacks, list_of_min_periods
+    )
+
+    series = pd.Series(values)
+    for column, (lookback, min_periods) in enumerate(
+        zip(list_of_lookbacks, list_of_min_periods)
+    ):
+        rolling = series.rolling(lookback, min_periods=min_periods)
+        np.testing.assert_array_equal(roll_max[:, column], rolling.max().values)
+        np.testing.assert_array_equal(roll_min[:, column], rolling.min().values)
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantlib_st.correlation.correlation_over_time import (
+    CorrelationList,
+    compute_correlation_over_time,
+)
+from quantlib_st.estimators.diversification_multipliers import (
+    diversification_multiplier_for_each_date,
+    diversification_multiplier_from_list,
+)
+
+COLUMNS = ["a", "b", "c"]
+
+
+@pytest.fixture
+def correlation_list() -> CorrelationList:
+    index = pd.date_range("2015-01-01", "2019-12-31", freq="W")
+    rng = np.random.default_rng(0)
+    common = rng.standard_normal(len(index))
+    returns = pd.DataFrame(
+        {
+            column: common * loading + rng.standard_normal(len(index))
+            for column, loading in zip(COLUMNS, [0.2, 0.8, 1.5])
+        },
+        index=index,
+    )
+
+    return compute_correlation_over_time(
+        returns, date_method="expanding", ew_lookback=50, min_periods=10
+    )
+
+
+@pytest.fixture
+def weight_df() -> pd.DataFrame:
+    index = pd.bdate_range("2015-01-05", "2019-12-31")
+    weights = np.column_stack(
+        [
+            np.linspace(0.2, 0.6, len(index)),
+            np.full(len(index), 0.3),
+            np.linspace(0.5, 0.1, len(index)),
+        ]
+    )
+    weights[:10] = 0.0
+
+    return pd.DataFrame(weights, index=index, columns=COLUMNS)
+
+
+def test_multiplier_matches_one_date_at_a_time(correlation_list, weight_df):
+    expected = []
+    for relevant_date, weights in weight_df.iterrows():
+        period_index = (
+            correlation_list.fit_dates.index_of_most_recent_period_before_relevant_date(
+                relevant_date
+            )
+        )
+        corr = correlation_list.corr_list[period_index].values
+        weights = weights.values
+        if not weights.any():
+            expected.append(1.0)
+        else:
+            expected.append(min(1.0 / np.sqrt(weights @ corr @ weights), 2.5))
+
+    div_mult = diversification_multiplier_for_each_date(
+        correlation_list, weight_df, dm_max=2.5
+    )
+
+    np.testing.assert_allclose(div_mult, expected)
+
+
+def test_multiplier_is_smoothed_and_capped(correlation_list, weight_df):
+    div_mult = diversification_multiplier_from_list(
+        correlation_list, weight_df, ewma_span=125, dm_max=1.1
+    )
+
+    assert div_mult.index.equals(weight_df.index)
+    assert (div_mult <= 1.1).all()
+    assert (div_mult >= 1.0).all()
+
+
+def test_dates_before_first_fit_period_raise(correlation_list, weight_df):
+    early_weights = weight_df.copy()
+    early_weights.index = early_weights.index - pd.DateOffset(years=1)
+
+    with pytest.raises(Exception):
+        diversification_multiplier_from_list(correlation_list, early_weights)
+
+
+def test_dates_before_first_fit_period_use_first_correlations(correlation_list):
+    first_period_start = correlation_list.fit_dates[0].period_start
+    index = pd.bdate_range(end=first_period_start, periods=5)
+    weight_df = pd.DataFrame(1.0 / 3, index=index, columns=COLUMNS)
+
+    div_mult = diversification_multiplier_for_each_date(
+        correlation_list, weight_df, use_first_period_for_earlier_dates=True
+    )
+
+    first_corr = correlation_list.corr_list[0].values
+    weights = weight_df.values[0]
+    np.testing.assert_allclose(div_mult, 1.0 / np.sqrt(weights @ first_corr @ weights))
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantlib_st.core.pandas.list_of_df import listOfDataFrames
+from quantlib_st.correlation.correlation_over_time import compute_correlation_over_time
+from quantlib_st.estimators.pooled_correlation import pooled_correlation_estimator
+
+
+@pytest.fixture
+def data() -> listOfDataFrames:
+    rng = np.random.default_rng(1)
+    list_of_df = []
+    for start, end in [
+        ("2010-01-01", "2020-06-30"),
+        ("2012-03-01", "2020-06-30"),
+        ("2015-01-01", "2019-12-31"),
+    ]:
+        index = pd.bdate_range(start, end)
+        values = rng.standard_normal((len(index), 3)).cumsum(axis=0)
+        values[:, 1] += values[:, 0]
+        df = pd.DataFrame(values, index=index, columns=["a", "b", "c"])
+        df.iloc[:300, 2] = np.nan
+        list_of_df.append(df)
+
+    return listOfDataFrames(list_of_df)
+
+
+@pytest.mark.parametrize("using_exponent", [True, False])
+@pytest.mark.parametrize("date_method", ["expanding", "rolling", "in_sample"])
+def test_same_correlations_as_stacking_the_data(data, using_exponent, date_method):
+    kwargs = dict(
+        date_method=date_method,
+        using_exponent=using_exponent,
+        ew_lookback=50,
+        min_periods=20,
+        rollyears=3,
+        floor_at_zero=False,
+    )
+    stacked_data = (
+        data.reindex_to_common_columns()
+        .resample("W")
+        .ffill()
+        .stacked_df_with_added_time_from_list()
+    )
+    expected = compute_correlation_over_time(stacked_data, **kwargs)
+
+    correlation_list = pooled_correlation_estimator(
+        data, frequency="W", cleaning=False, **kwargs
+    )
+
+    assert correlation_list.column_names == ["a", "b", "c"]
+    assert [fit_period.fit_end for fit_period in correlation_list.fit_dates] == [
+        fit_period.fit_end for fit_period in expected.fit_dates
+    ]
+    np.testing.assert_allclose(
+        correlation_list.stacked_values(), expected.stacked_values(), atol=1e-10
+    )
+
+
+def test_cleaning_fills_correlations_we_cannot_estimate(data):
+    data[0].iloc[:, 2] = np.nan
+    data[1].iloc[:, 2] = np.nan
+    data[2].iloc[:, 2] = np.nan
+
+    correlation_list = pooled_correlation_estimator(data, cleaning=True)
+
+    last_corr = correlation_list.corr_list[-1].values
+    assert not np.isnan(last_corr).any()
+    assert last_corr[0, 2] == pytest.approx(0.99)
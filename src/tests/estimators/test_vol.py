@@ -38,3 +38,15 @@ def test_mixed_vol_calc_basic():
     assert isinstance(vol, pd.Series)
     assert vol.index.equals(returns.index)
     assert (vol.dropna() >= 1e-10).all()
+
+
+def test_robust_vol_calc_read_only_input():
+    rng = pd.date_range("2020-01-01", periods=150, freq="B")
+    np.random.seed(2)
+    returns = pd.Series(0.001 * np.random.randn(len(rng)), index=rng)
+    returns.iloc[10:20] = 0.0
+    returns.to_numpy().flags.writeable = False
+
+    vol = robust_vol_calc(returns, days=10, min_periods=5, vol_abs_min=1e-4)
+
+    assert (vol.dropna() >= 1e-4).all()
@@ -0,0 +1,90 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantlib_st.objects.fills import Fill, ListOfFills, missing_order
+from quantlib_st.systems.accounts.pandl_calculators.pandl_using_fills import (
+    infer_positions_from_fills,
+)
+
+
+def test_list_of_fills_drops_empty_fills_and_gives_fill_views():
+    fills = ListOfFills(
+        [
+            Fill(datetime.datetime(2020, 1, 3), 2, 101.0),
+            missing_order,
+            Fill(datetime.datetime(2020, 1, 2), -1, 100.0, True),
+            Fill(datetime.datetime(2020, 1, 6), 0, 102.0),
+        ]
+    )
+
+    assert len(fills) == 2
+    assert list(fills) == [
+        Fill(pd.Timestamp("2020-01-03"), 2.0, 101.0, False),
+        Fill(pd.Timestamp("2020-01-02"), -1.0, 100.0, True),
+    ]
+    assert fills[1].price_requires_slippage_adjustment
+    assert fills.as_pd_df().index.tolist() == [
+        pd.Timestamp("2020-01-02"),
+        pd.Timestamp("2020-01-03"),
+    ]
+
+
+def test_from_position_series_and_prices():
+    dates = pd.date_range("2020-01-01", periods=6, freq="B")
+    positions = pd.Series([np.nan, 1.0, 1.0, 3.0, 0.0, 0.0], index=dates)
+    price = pd.Series([10.0, 11.0, np.nan, 13.0, 14.0, 15.0], index=dates)
+
+    fills = ListOfFills.from_position_series_and_prices(positions, price)
+
+    assert list(fills.dates) == list(dates[[3, 4]].values)
+    np.testing.assert_array_equal(fills.qty, [2.0, -3.0])
+    np.testing.assert_array_equal(fills.price, [13.0, 14.0])
+    assert fills.price_requires_slippage_adjustment.all()
+
+    # already in date order, so the dataframe can be a view on the fills
+    df = fills.as_pd_df(copy=False)
+    assert np.shares_memory(df.to_numpy(), fills.qty)
+
+    # by default it's a copy which can be changed
+    df = fills.as_pd_df()
+    assert not np.shares_memory(df.to_numpy(), fills.qty)
+    df["qty"] *= 2
+    df.iloc[0, 1] = 0.0
+    np.testing.assert_array_equal(fills.qty, [2.0, -3.0])
+    np.testing.assert_array_equal(fills.price, [13.0, 14.0])
+
+    inferred_positions = infer_positions_from_fills(fills)
+    assert inferred_positions.tolist() == [2.0, -1.0]
+
+
+def test_concatenate_with_lists_of_fills():
+    dates = pd.date_range("2020-01-01", periods=3, freq="B")
+    fills = ListOfFills.from_arrays(dates, qty=[1.0, 0.0, 2.0], price=[5.0, 6.0, 7.0])
+    pseudo_fills = [Fill(dates[1], 3.0, 6.0, True)]
+
+    combined = fills + pseudo_fills
+
+    assert isinstance(combined, ListOfFills)
+    assert len(combined) == 3
+    np.testing.assert_array_equal(combined.qty, [1.0, 2.0, 3.0])
+    assert not combined.is_sorted()
+    assert combined.as_pd_df().qty.tolist() == [1.0, 3.0, 2.0]
+    assert (pseudo_fills + fills).as_pd_df().qty.tolist() == [1.0, 3.0, 2.0]
+
+
+def test_fills_keep_their_time_zone():
+    dates = pd.date_range("2020-01-02 09:30", periods=3, freq="D", tz="US/Eastern")
+    fills = ListOfFills([Fill(date, 1.0, 100.0) for date in dates])
+
+    assert fills[0].date == dates[0]
+    assert [fill.date for fill in fills] == list(dates)
+    assert fills.as_pd_df().index.equals(dates)
+    assert fills[1:].as_pd_df().index.equals(dates[1:])
+    assert (fills + fills[:1]).date_index.tz == dates.tz
+
+    naive_fills = ListOfFills([Fill(datetime.datetime(2020, 1, 2), 1.0, 100.0)])
+    with pytest.raises(Exception):
+        fills + naive_fills
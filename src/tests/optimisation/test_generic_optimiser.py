@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantlib_st.config.configdata import Config
+from quantlib_st.optimisation.generic_optimiser import (
+    genericOptimiser,
+    optimise_max_sharpe_ratio,
+)
+from quantlib_st.optimisation.pre_processing import returnsPreProcessor
+from quantlib_st.optimisation.returns import (
+    dictOfReturnsForOptimisationWithCosts,
+    returnsForOptimisationWithCosts,
+)
+from quantlib_st.sysdata.sim.csv_futures_sim_test_data import CsvFuturesSimTestData
+from quantlib_st.systems.accounts.account_forecast import pandl_for_instrument_forecast
+from quantlib_st.systems.accounts.curves.account_curve_group import accountCurveGroup
+from quantlib_st.systems.accounts.curves.dict_of_account_curves import (
+    dictOfAccountCurves,
+)
+from quantlib_st.systems.provided.futures_chapter15.basesystem import futures_system
+
+RULE_NAMES = ["ewmac16", "ewmac8"]
+CAPITAL = 100000.0
+
+
+def _returns_for_instrument(system, instrument_code):
+    # what accounts.pandl_for_instrument_rules_unweighted gives ForecastCombine
+    account_curves = dictOfAccountCurves(
+        [
+            (
+                rule_name,
+                pandl_for_instrument_forecast(
+                    forecast=system.forecastScaleCap.get_capped_forecast(
+                        instrument_code, rule_name
+                    ),
+                    price=system.rawdata.get_daily_prices(instrument_code),
+                    daily_returns_volatility=system.rawdata.daily_returns_volatility(
+                        instrument_code
+                    ),
+                    capital=CAPITAL,
+                    risk_target=0.16,
+                    SR_cost=0.01,
+                ),
+            )
+            for rule_name in RULE_NAMES
+        ]
+    )
+
+    return returnsForOptimisationWithCosts(
+        accountCurveGroup(account_curves, capital=CAPITAL)
+    )
+
+
+@pytest.fixture(scope="module")
+def dict_of_returns():
+    system = futures_system(
+        data=CsvFuturesSimTestData(),
+        config=Config("systems.provided.config.test_forecast_config.yaml"),
+    )
+
+    return dictOfReturnsForOptimisationWithCosts(
+        [
+            (instrument_code, _returns_for_instrument(system, instrument_code))
+            for instrument_code in ["EDOLLAR", "US10"]
+        ]
+    )
+
+
+def _optimiser(dict_of_returns, **kwargs):
+    config = Config()
+    config.fill_with_defaults()
+    weighting_params = {**config.forecast_weight_estimate, **kwargs}
+    weighting_params.pop("func")
+
+    returns_pre_processor = returnsPreProcessor(dict_of_returns, **weighting_params)
+
+    return genericOptimiser(
+        returns_pre_processor, asset_name="EDOLLAR", **weighting_params
+    )
+
+
+@pytest.mark.parametrize("method", ["one_period", "shrinkage", "bootstrap"])
+def test_estimated_weights_are_long_only_and_sum_to_one(dict_of_returns, method):
+    optimiser = _optimiser(dict_of_returns, method=method, monte_runs=20, seed=1)
+    weights = optimiser.weights()
+
+    assert list(weights.columns) == RULE_NAMES
+    assert len(weights) == len(optimiser.fit_dates)
+    assert (weights.values >= 0).all()
+    np.testing.assert_allclose(weights.sum(axis=1), 1.0)
+
+    # no data in the first period, so equal weights
+    np.testing.assert_allclose(weights.iloc[0], 0.5)
+
+
+def test_bootstrap_is_repeatable_with_a_seed_and_in_a_pool(dict_of_returns):
+    weights = _optimiser(
+        dict_of_returns, method="bootstrap", monte_runs=20, seed=1
+    ).weights()
+    weights_from_pool = _optimiser(
+        dict_of_returns,
+        method="bootstrap",
+        monte_runs=20,
+        seed=1,
+        bootstrap_max_workers=2,
+    ).weights()
+
+    pd.testing.assert_frame_equal(weights, weights_from_pool)
+
+
+def test_unsupported_method_raises(dict_of_returns):
+    with pytest.raises(Exception):
+        _optimiser(dict_of_returns, method="handcraft")
+
+
+def test_optimise_max_sharpe_ratio_prefers_higher_sharpe_ratio():
+    weights = optimise_max_sharpe_ratio(
+        mean=np.array([0.2, 0.1]),
+        stdev=np.array([0.2, 0.2]),
+        corr=np.array([[1.0, 0.5], [0.5, 1.0]]),
+    )
+
+    assert weights[0] > weights[1]
+    assert weights.sum() == pytest.approx(1.0)
+
+
+def test_pooled_gross_returns_are_shared_by_the_group(dict_of_returns):
+    returns_pre_processor = returnsPreProcessor(
+        dict_of_returns, pool_gross_returns=True
+    )
+
+    assert returns_pre_processor.get_gross_returns(
+        "EDOLLAR"
+    ) is returns_pre_processor.get_gross_returns("US10")
@@ -91,3 +91,28 @@ def test_pandl_for_instrument_forecast_scaling():
     np.testing.assert_allclose(res_20.values, (res_10 * 2.0).values)  # type: ignore
     assert isinstance(res_10, accountCurve)
     assert isinstance(res_20, accountCurve)
+
+
+def test_quant_ratio_leaves_curve_alone():
+    dates = pd.date_range("2023-01-01", periods=60, freq="B")
+    np.random.seed(3)
+    price = pd.Series(100.0 + np.random.randn(60).cumsum(), index=dates)
+    forecast = pd.Series([10.0] * 30 + [0.0] * 30, index=dates)
+    daily_returns_volatility = pd.Series([1.0] * 60, index=dates)
+
+    result = pandl_for_instrument_forecast(
+        forecast=forecast,
+        price=price,
+        capital=100000.0,
+        risk_target=0.16,
+        daily_returns_volatility=daily_returns_volatility,
+        target_abs_forecast=10.0,
+        value_per_point=1.0,
+    )
+    zero_count = (result.as_ts == 0).sum()
+    assert zero_count > 0
+
+    result.quant_ratio_lower()
+    result.quant_ratio_upper()
+
+    assert (result.as_ts == 0).sum() == zero_count